@@ -0,0 +1,220 @@
+"""
+Benchmark del procesamiento de columnas de ExcelProcessor
+
+Compara la version anterior (apply fila por fila: un pd.Series y un
+re.match por nomenclatura; _parsear_valor, _normalizar_moneda y
+_detectar_region por celda) con la vectorizada, y verifica que las
+columnas resultantes sean identicas (valores, dtype y None/NaN).
+
+Uso:
+    python benchmark_excel.py                          # 100.000 filas sinteticas
+    python benchmark_excel.py --filas 20000 --repeticiones 5
+    python benchmark_excel.py ../data/input/export_seace.xlsx
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import REGIONES
+from excel_processor import ExcelProcessor
+from regiones import ClasificadorRegion
+
+
+# ============== IMPLEMENTACION ANTERIOR ==============
+
+def componentes_legado(df: pd.DataFrame) -> pd.DataFrame:
+    """_extraer_componentes_nomenclatura anterior: un pd.Series por fila"""
+    def extraer(nom):
+        if pd.isna(nom):
+            return pd.Series({
+                'tipo_proceso': None,
+                'modalidad': None,
+                'numero_proceso': None,
+                'anio_proceso': None,
+                'sigla_entidad': None,
+                'version': None
+            })
+
+        partes = str(nom).split('-')
+
+        anio = None
+        for p in partes:
+            if re.match(r'^20\d{2}$', p):
+                anio = p
+                break
+
+        return pd.Series({
+            'tipo_proceso': partes[0] if len(partes) > 0 else None,
+            'modalidad': partes[1] if len(partes) > 1 else None,
+            'numero_proceso': partes[2] if len(partes) > 2 else None,
+            'anio_proceso': anio,
+            'sigla_entidad': partes[4] if len(partes) > 4 else None,
+            'version': partes[5] if len(partes) > 5 else '1'
+        })
+
+    componentes = df['nomenclatura'].apply(extraer)
+    return pd.concat([df, componentes], axis=1)
+
+
+def region_legado(entidad) -> str:
+    """_detectar_region anterior: arma el dict de regiones y recorre subcadenas en cada llamada"""
+    if pd.isna(entidad):
+        return 'LIMA'
+
+    entidad_upper = str(entidad).upper()
+
+    regiones = {region: list(patrones) for region, patrones in REGIONES.items()}
+
+    for region, patrones in regiones.items():
+        for patron in patrones:
+            if patron in entidad_upper:
+                return region
+
+    return 'LIMA'
+
+
+# ============== DATOS ==============
+
+def generar(filas: int, semilla: int = 1) -> pd.DataFrame:
+    """Columnas nomenclatura, valor, moneda y entidad con la variedad de los exports SEACE"""
+    rnd = random.Random(semilla)
+    tipos = ["AS", "LP", "CP", "SIE", "CP SER", "AS-SM", "ADS"]
+    siglas = ["ELSE", "ELECTROSUR", "SEAL", "HIDRANDINA", "MINSA", "ENOSA"]
+    monedas = ["Soles", "Dolares", "EURO", "USD", "Nuevos Soles", None, ""]
+    prefijos = ["MUNICIPALIDAD DISTRITAL DE", "MUNICIPALIDAD PROVINCIAL DE", "GOBIERNO REGIONAL DE",
+                "UNIDAD EJECUTORA", "EMPRESA REGIONAL DE SERVICIO PUBLICO DE ELECTRICIDAD"]
+    lugares = [p for patrones in REGIONES.values() for p in patrones] + [
+        "SANTA ROSA", "SAN JUAN", "LOS OLIVOS", "VILLA RICA", "HUANCAVELICA-ICA", "PUNO ILO"]
+    # Exports reales: unas miles de entidades distintas que se repiten
+    entidades = [f"{rnd.choice(prefijos)} {rnd.choice(lugares)} {i}" for i in range(max(filas // 30, 1))]
+
+    nomenclaturas, valores = [], []
+    for _ in range(filas):
+        r = rnd.random()
+        if r < 0.02:
+            nomenclaturas.append(None)
+        elif r < 0.04:
+            nomenclaturas.append(rnd.choice(["SIN-NOMENCLATURA", "X", "", "AS-SM-12"]))
+        else:
+            partes = [rnd.choice(tipos), "SM", str(rnd.randint(1, 400)),
+                      str(rnd.randint(2012, 2026)), rnd.choice(siglas)]
+            if rnd.random() < 0.8:
+                partes.append(str(rnd.randint(1, 3)))
+            if rnd.random() < 0.05:
+                partes.append("OEC")
+            nomenclaturas.append("-".join(partes))
+
+        r = rnd.random()
+        if r < 0.03:
+            valores.append(None)
+        elif r < 0.06:
+            valores.append(rnd.choice(["---", "Reservado", "nan", "1_000", " 12 345.5 ", "1e3"]))
+        else:
+            monto = rnd.randint(0, 50_000_000) / 100
+            valores.append(f"{monto:,.2f}" if rnd.random() < 0.9 else monto)
+
+    return pd.DataFrame({
+        "nomenclatura": nomenclaturas,
+        "valor": pd.Series(valores, dtype=object),
+        "moneda": [rnd.choice(monedas) for _ in range(filas)],
+        "entidad": [rnd.choice(entidades) if rnd.random() > 0.01 else None for _ in range(filas)],
+    })
+
+
+# ============== MEDICION ==============
+
+def _identicas(a, b) -> bool:
+    """Mismos valores, dtypes y mismos None/NaN"""
+    a, b = pd.DataFrame(a), pd.DataFrame(b)
+    return (
+        list(a.columns) == list(b.columns)
+        and a.dtypes.equals(b.dtypes)
+        and a.equals(b)
+        and a.astype(object).map(type).equals(b.astype(object).map(type))
+    )
+
+
+def _medir(fn: Callable, repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de repeticiones corridas"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def benchmark(df: pd.DataFrame, repeticiones: int = 3) -> List[Dict]:
+    """
+    Returns:
+        Lista de dicts con paso, segundos (legado / vectorizado) y si coinciden
+    """
+    p = ExcelProcessor()
+    pasos = []
+    if "nomenclatura" in df.columns:
+        nom = df[["nomenclatura"]]
+        pasos.append(("nomenclatura",
+                      lambda: componentes_legado(nom),
+                      lambda: p._extraer_componentes_nomenclatura(nom)))
+    if "valor" in df.columns:
+        pasos.append(("valor",
+                      lambda: df["valor"].apply(p._parsear_valor),
+                      lambda: p._parsear_valores(df["valor"])))
+    if "moneda" in df.columns:
+        pasos.append(("moneda",
+                      lambda: df["moneda"].apply(p._normalizar_moneda),
+                      lambda: p._normalizar_monedas(df["moneda"])))
+    if "entidad" in df.columns:
+        # Clasificador nuevo en cada corrida: incluye compilar el patron y memo vacio
+        pasos.append(("region",
+                      lambda: df["entidad"].apply(region_legado),
+                      lambda: ClasificadorRegion().clasificar(df["entidad"])))
+
+    resultados = []
+    for paso, legado, vectorizado in pasos:
+        resultados.append({
+            "paso": paso,
+            "legado": _medir(legado, repeticiones),
+            "vectorizado": _medir(vectorizado, repeticiones),
+            "coincide": _identicas(legado(), vectorizado()),
+        })
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del procesamiento de columnas de ExcelProcessor")
+    parser.add_argument("archivo", nargs="?", help="Excel/CSV exportado de SEACE (default: datos sinteticos)")
+    parser.add_argument("--filas", type=int, default=100_000, help="Filas sinteticas")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.archivo:
+        ruta = Path(args.archivo)
+        df = pd.read_csv(ruta, encoding='utf-8') if ruta.suffix == '.csv' else pd.read_excel(ruta)
+        df = df.rename(columns=ExcelProcessor.COLUMN_MAPPING)
+        if 'nomenclatura' in df.columns:
+            df['nomenclatura'] = df['nomenclatura'].str.strip()
+        origen = ruta.name
+    else:
+        df = generar(args.filas)
+        origen = "sinteticas"
+
+    print("=" * 60)
+    print(f"BENCHMARK EXCEL PROCESSOR - {len(df):,} filas ({origen}), {args.repeticiones} repeticiones")
+    print("=" * 60)
+    print(f"{'PASO':<14} {'LEGADO (s)':>11} {'VECTOR (s)':>11} {'MEJORA':>8}  IGUAL")
+
+    for r in benchmark(df, args.repeticiones):
+        print(f"{r['paso']:<14} {r['legado']:>11.3f} {r['vectorizado']:>11.3f} "
+              f"{r['legado'] / r['vectorizado']:>7.1f}x  {'si' if r['coincide'] else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark de backends JSON sobre un archivo mensual OCDS
+
+Mide, para cada backend instalado (orjson, msgspec, json), el tiempo de
+parseo del archivo del mes y el de serializarlo compacto e indentado.
+Si msgspec esta instalado, mide tambien la decodificacion tipada de
+ocds_schema (solo los campos que usan los normalizadores).
+
+Uso:
+    python benchmark_json.py                                  # Ultimo mes en cache
+    python benchmark_json.py ../data/cache/mes/ab/abcd....json
+    python benchmark_json.py --sintetico 5000                 # Mes sintetico de 5000 records
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import BASE_DIR
+from cache_store import get_store
+import json_backend
+import ocds_schema
+
+
+def _mes_sintetico(n: int) -> bytes:
+    """Genera un mes sintetico repitiendo el record de 'json descargado.json'"""
+    ejemplo = BASE_DIR / "json descargado.json"
+    data = json_backend.load(ejemplo)
+    record = data["records"][0]
+    data["records"] = [record] * n
+    return json_backend.dumpb(data)
+
+
+def _medir(fn, repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de varias repeticiones"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def benchmark(contenido: bytes, repeticiones: int = 3) -> list:
+    """
+    Mide parseo y serializacion con cada backend disponible
+
+    Returns:
+        Lista de dicts con backend, parse, dump y dump_pretty (segundos)
+    """
+    resultados = []
+    for backend in json_backend.backends_disponibles():
+        json_backend.set_backend(backend)
+        data = json_backend.loads(contenido)
+        resultados.append({
+            "backend": backend,
+            "parse": _medir(lambda: json_backend.loads(contenido), repeticiones),
+            "dump": _medir(lambda: json_backend.dumpb(data, pretty=False), repeticiones),
+            "dump_pretty": _medir(lambda: json_backend.dumpb(data, pretty=True), repeticiones),
+        })
+        del data
+    return resultados
+
+
+def benchmark_esquema(contenido: bytes, repeticiones: int = 3) -> float:
+    """Tiempo de decodificar los records con el esquema tipado (None sin msgspec)"""
+    if not ocds_schema.DISPONIBLE:
+        return None
+    return _medir(lambda: ocds_schema.decodificar_records(contenido), repeticiones)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de backends JSON")
+    parser.add_argument("archivo", nargs="?", help="Archivo mensual OCDS (default: el mas reciente en cache)")
+    parser.add_argument("--sintetico", type=int, help="Generar un mes sintetico con N records")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.sintetico:
+        contenido = _mes_sintetico(args.sintetico)
+        origen = f"sintetico ({args.sintetico} records)"
+    else:
+        if args.archivo:
+            archivo = Path(args.archivo)
+        else:
+            meses = [e for e in get_store().entradas("mes") if e["clave"].endswith("_seace_v3")]
+            if not meses:
+                print("No hay meses en cache. Usa --sintetico N o indica un archivo.")
+                return
+            archivo = meses[-1]["ruta"]
+        contenido = archivo.read_bytes()
+        origen = archivo.name
+
+    print("=" * 60)
+    print(f"BENCHMARK JSON - {origen} ({len(contenido) / (1024 * 1024):.1f} MB)")
+    print("=" * 60)
+    print(f"{'BACKEND':<10} {'PARSE (s)':>12} {'DUMP (s)':>12} {'PRETTY (s)':>12}")
+
+    for r in benchmark(contenido, args.repeticiones):
+        print(f"{r['backend']:<10} {r['parse']:>12.3f} {r['dump']:>12.3f} {r['dump_pretty']:>12.3f}")
+
+    esquema = benchmark_esquema(contenido, args.repeticiones)
+    if esquema is not None:
+        print(f"{'esquema':<10} {esquema:>12.3f} {'-':>12} {'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark del parser de fichas sobre paginas guardadas
+
+Compara el parseo anterior (BeautifulSoup, un find_all de titulos por
+seccion) con parser_ficha en cada backend instalado, y verifica que todos
+entreguen el mismo resultado.
+
+Uso:
+    python benchmark_parser.py                       # fixtures/*.html
+    python benchmark_parser.py fichas_guardadas/ --repeticiones 20
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import ETAPAS_MAPPING
+import parser_ficha
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _panel_por_titulo(soup: BeautifulSoup, texto: str):
+    for div in soup.find_all('div', class_='ui-panel-title'):
+        if texto in div.get_text():
+            return div.find_parent('div', class_='ui-panel')
+    return None
+
+
+def _pares_legado(panel) -> Dict[str, str]:
+    info = {}
+    if panel:
+        for row in panel.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                label = cells[0].get_text(strip=True).replace(':', '')
+                value = cells[1].get_text(strip=True)
+                if label and value:
+                    info[label] = value
+    return info
+
+
+def parsear_legado(html: str) -> Dict:
+    """Parseo anterior de SeaceScraper: cada seccion vuelve a barrer los titulos"""
+    soup = BeautifulSoup(html, 'lxml')
+    datos = {
+        "info_general": _pares_legado(_panel_por_titulo(soup, 'Informacion General')),
+        "info_entidad": _pares_legado(_panel_por_titulo(soup, 'Informacion general de la Entidad')),
+        "info_procedimiento": _pares_legado(_panel_por_titulo(soup, 'Informacion general del procedimiento')),
+        "cronograma": [],
+        "documentos": [],
+    }
+
+    panel = _panel_por_titulo(soup, 'Cronograma')
+    tabla = panel.find('table') if panel else None
+    for row in (tabla.find_all('tr')[1:] if tabla else []):
+        cells = row.find_all('td')
+        if len(cells) >= 3:
+            etapa_raw = cells[0].get_text(strip=True)
+            datos["cronograma"].append({
+                "etapa": ETAPAS_MAPPING.get(etapa_raw, etapa_raw),
+                "etapa_original": etapa_raw,
+                "fecha_inicio": cells[1].get_text(strip=True),
+                "fecha_fin": cells[2].get_text(strip=True)
+            })
+
+    panel = _panel_por_titulo(soup, 'Lista de Documentos')
+    tabla = panel.find('table') if panel else None
+    for row in (tabla.find_all('tr')[1:] if tabla else []):
+        cells = row.find_all('td')
+        if len(cells) >= 5:
+            doc = {
+                "numero": cells[0].get_text(strip=True),
+                "etapa": cells[1].get_text(strip=True),
+                "documento": cells[2].get_text(strip=True),
+                "fecha": cells[4].get_text(strip=True)
+            }
+            link = cells[3].find('a')
+            if link:
+                doc["url"] = link.get('href', '')
+            datos["documentos"].append(doc)
+
+    return datos
+
+
+def _medir(fn, paginas: List[str], repeticiones: int) -> float:
+    """Mejor tiempo (segundos) de parsear todas las paginas"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for html in paginas:
+            fn(html)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def benchmark(paginas: List[str], repeticiones: int = 5) -> List[Dict]:
+    """
+    Returns:
+        Lista de dicts con parser, segundos y si coincide con el parseo anterior
+    """
+    referencia = [parsear_legado(html) for html in paginas]
+    resultados = [{
+        "parser": "legado",
+        "segundos": _medir(parsear_legado, paginas, repeticiones),
+        "coincide": True,
+    }]
+    for backend in parser_ficha.backends_disponibles():
+        fn = lambda html, b=backend: parser_ficha.parsear_ficha(html, b)
+        resultados.append({
+            "parser": backend,
+            "segundos": _medir(fn, paginas, repeticiones),
+            "coincide": [fn(html) for html in paginas] == referencia,
+        })
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del parser de fichas")
+    parser.add_argument("rutas", nargs="*", help="Archivos .html o directorios (default: fixtures/)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    archivos = []
+    for ruta in map(Path, args.rutas or [FIXTURES]):
+        archivos += sorted(ruta.glob("*.html")) if ruta.is_dir() else [ruta]
+    if not archivos:
+        print("No hay paginas de ficha guardadas.")
+        return
+    paginas = [a.read_text(encoding='utf-8') for a in archivos]
+
+    print("=" * 60)
+    print(f"BENCHMARK PARSER FICHA - {len(paginas)} paginas "
+          f"({sum(map(len, paginas)) / 1024:.0f} KB), {args.repeticiones} repeticiones")
+    print("=" * 60)
+    print(f"{'PARSER':<12} {'TOTAL (s)':>10} {'MS/PAGINA':>10} {'VS LEGADO':>10}  IGUAL")
+
+    resultados = benchmark(paginas, args.repeticiones)
+    base = resultados[0]["segundos"]
+    for r in resultados:
+        print(f"{r['parser']:<12} {r['segundos']:>10.3f} {r['segundos'] / len(paginas) * 1000:>10.2f} "
+              f"{base / r['segundos']:>9.1f}x  {'si' if r['coincide'] else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,615 @@
+"""
+Cache en disco particionado, con indice de metadatos y presupuesto LRU
+
+Cada entrada se guarda en CACHE_DIR/<tipo>/<hh>/<sha1(clave)>.json, donde
+<hh> son los dos primeros caracteres del hash: ningun directorio crece sin
+limite. Un indice SQLite (cache_index.sqlite) guarda por entrada su tipo,
+clave, tamano, creacion y ultimo acceso, asi las estadisticas y el
+desalojo no necesitan recorrer el arbol ni abrir archivos.
+
+Tipos usados:
+    mes          Archivos mensuales OCDS (bulk o cache paginado de la API)
+    ocds_api     ocds_api.OCDSClient (nom_*, ocid_*)
+    ocds_client  ocds_client.OCDSClient (nom_*, ocid_*)
+    ficha        SeaceScraper (fichas por nomenclatura)
+    entidades    regiones.py (indice entidad -> departamento de los meses OCDS)
+
+Cada tipo tiene un presupuesto de disco (CACHE_CONFIG["PRESUPUESTO_MB"]);
+al superarlo se borran las entradas con acceso mas antiguo (LRU).
+
+La vigencia (TTL) se decide con el mtime del archivo: las escrituras son
+atomicas, asi que el mtime es la hora de guardado y una entrada vencida se
+descarta con un stat, sin leer ni parsear el JSON. Los TTL por endpoint
+estan en CACHE_CONFIG["TTL_SEGUNDOS"].
+
+Las busquedas sin resultado confirmadas por la API se guardan como
+entradas negativas (neg_<clave>) con su propio TTL, mas corto; dejan de
+valer apenas se ingiere un archivo mensual mas nuevo que ellas, porque el
+proceso pudo haber aparecido en ese mes.
+
+Delante del disco hay una memoria LRU en proceso (MemoLRU) para los tipos
+de CACHE_CONFIG["MEMO"]["TIPOS"], acotada por cantidad de entradas y bytes
+aproximados (tamano del JSON). Una consulta repetida de un proceso caliente
+no toca el disco ni el indice.
+
+SingleFlight agrupa consultas concurrentes de la misma clave: la primera
+hace la consulta (y la unica escritura al cache) y las demas esperan y
+reciben su resultado.
+
+Uso:
+    python cache_store.py stats
+    python cache_store.py prune                  # Aplicar presupuestos
+    python cache_store.py prune --tipo ficha --mb 100
+    python cache_store.py migrate                # Mover cache plano antiguo
+    python cache_store.py reindex                # Reconstruir indice
+    python cache_store.py warm procesos.xlsx     # Precargar (ver cache_warmer.py)
+"""
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import CACHE_DIR, CACHE_CONFIG
+import json_backend
+
+INDEX_FILE = "cache_index.sqlite"
+
+# Archivos mensuales del esquema plano anterior: 2024-12_seace_v3.json
+_MES_LEGADO = re.compile(r"^(\d{4}-\d{2}_[a-z0-9_]+)\.json$")
+
+
+class MemoLRU:
+    """LRU en memoria acotado por cantidad de entradas y bytes aproximados"""
+
+    def __init__(self, max_entradas: int, max_bytes: int):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._datos: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Valor en memoria (None si no esta o vencio segun su hora de guardado)"""
+        with self._lock:
+            item = self._datos.get(clave)
+            if item is None or (ttl is not None and time.time() - item[2] >= ttl):
+                self.misses += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.hits += 1
+        valor = item[0]
+        # Copia superficial: quien la modifique no altera la memoria
+        return dict(valor) if isinstance(valor, dict) else valor
+
+    def put(self, clave: str, valor: Any, tamano: int, guardado: float = None):
+        """Guarda un valor; desaloja los menos usados si se excede algun limite"""
+        if tamano > self.max_bytes:
+            self.pop(clave)
+            return
+        with self._lock:
+            previo = self._datos.pop(clave, None)
+            if previo is not None:
+                self.bytes -= previo[1]
+            self._datos[clave] = (valor, tamano, guardado or time.time())
+            self.bytes += tamano
+            while len(self._datos) > self.max_entradas or self.bytes > self.max_bytes:
+                _, (_, t, _) = self._datos.popitem(last=False)
+                self.bytes -= t
+
+    def pop(self, clave: str):
+        with self._lock:
+            item = self._datos.pop(clave, None)
+            if item is not None:
+                self.bytes -= item[1]
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Aciertos, fallos, entradas y bytes en memoria"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entradas": len(self._datos),
+                "bytes": self.bytes,
+            }
+
+
+class _Vuelo:
+    """Consulta en curso compartida por los hilos que piden la misma clave"""
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class SingleFlight:
+    """Ejecuta una sola vez las consultas concurrentes de una misma clave"""
+
+    def __init__(self):
+        self.ejecutados = 0
+        self.coalescidos = 0
+        self._vuelos: Dict[str, _Vuelo] = {}
+        self._lock = threading.Lock()
+
+    def hacer(self, clave: str, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta fn() o, si ya hay una ejecucion en curso para la clave,
+        espera y retorna su resultado (o re-lanza su excepcion)
+        """
+        with self._lock:
+            vuelo = self._vuelos.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._vuelos[clave] = _Vuelo()
+                self.ejecutados += 1
+            else:
+                self.coalescidos += 1
+
+        if not lider:
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            resultado = vuelo.resultado
+            return dict(resultado) if isinstance(resultado, dict) else resultado
+
+        try:
+            vuelo.resultado = fn()
+            return vuelo.resultado
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._vuelos[clave]
+            vuelo.listo.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Consultas ejecutadas, coalescidas y en curso"""
+        with self._lock:
+            return {
+                "ejecutados": self.ejecutados,
+                "coalescidos": self.coalescidos,
+                "en_curso": len(self._vuelos),
+            }
+
+
+class CacheStore:
+    """Cache clave -> JSON particionado por tipo y hash, con indice LRU"""
+
+    def __init__(self, root: Union[str, Path] = None, presupuestos: Dict[str, int] = None):
+        """
+        Args:
+            root: Directorio raiz del cache (default: CACHE_DIR)
+            presupuestos: MB por tipo (default: CACHE_CONFIG["PRESUPUESTO_MB"])
+        """
+        self.root = Path(root or CACHE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.presupuestos = dict(CACHE_CONFIG["PRESUPUESTO_MB"])
+        if presupuestos:
+            self.presupuestos.update(presupuestos)
+        self._lock = threading.Lock()
+        memo = CACHE_CONFIG["MEMO"]
+        self.memos = {
+            tipo: MemoLRU(memo["MAX_ENTRADAS"], int(memo["MAX_MB"] * 1024 * 1024))
+            for tipo in memo["TIPOS"]
+        }
+        self._db = sqlite3.connect(
+            str(self.root / INDEX_FILE), timeout=30, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entradas (
+                ruta TEXT PRIMARY KEY,
+                tipo TEXT NOT NULL,
+                clave TEXT,
+                tamano INTEGER NOT NULL,
+                creado REAL NOT NULL,
+                acceso REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_tipo_acceso ON entradas (tipo, acceso)")
+        self._db.commit()
+
+    # ============== RUTAS ==============
+
+    def ruta(self, tipo: str, clave: str) -> Path:
+        """Ruta de una entrada: <root>/<tipo>/<hh>/<sha1>.json"""
+        h = hashlib.sha1(clave.encode("utf-8")).hexdigest()
+        return self.root / tipo / h[:2] / f"{h}.json"
+
+    def _relativa(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def presupuesto_bytes(self, tipo: str) -> int:
+        mb = self.presupuestos.get(tipo, CACHE_CONFIG["PRESUPUESTO_DEFAULT_MB"])
+        return int(mb * 1024 * 1024)
+
+    # ============== LECTURA / ESCRITURA ==============
+
+    def edad(self, tipo: str, clave: str) -> Optional[float]:
+        """Segundos desde que se guardo la entrada (None si no existe)"""
+        try:
+            return time.time() - self.ruta(tipo, clave).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def vigente(self, tipo: str, clave: str, ttl: Optional[float]) -> bool:
+        """True si la entrada existe y no vencio (ttl None = no expira)"""
+        edad = self.edad(tipo, clave)
+        return edad is not None and (ttl is None or edad < ttl)
+
+    def leer(self, tipo: str, clave: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """
+        Carga una entrada (primero de memoria, luego de disco)
+
+        Args:
+            ttl: Segundos de vigencia; si la entrada es mas antigua no se abre
+
+        Returns:
+            Datos guardados, o None si no existe o vencio
+        """
+        memo = self.memos.get(tipo)
+        if memo is not None:
+            data = memo.get(clave, ttl)
+            if data is not None:
+                return data
+
+        path = self.ruta(tipo, clave)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._olvidar(path)
+            return None
+        if ttl is not None and time.time() - st.st_mtime >= ttl:
+            return None
+        try:
+            data = json_backend.load(path)
+        except FileNotFoundError:
+            # Desalojada entre el stat y la lectura
+            self._olvidar(path)
+            return None
+        self.tocar(tipo, clave)
+        if memo is not None:
+            memo.put(clave, data, st.st_size, guardado=st.st_mtime)
+            # El llamador recibe su propia copia, igual que en un acierto
+            return dict(data) if isinstance(data, dict) else data
+        return data
+
+    def guardar(self, tipo: str, clave: str, data: Any, default=None) -> Path:
+        """Guarda una entrada, la registra en el indice y aplica el presupuesto del tipo"""
+        contenido = json_backend.dumpb(data, default=default)
+        path = self.guardar_bytes(tipo, clave, contenido)
+        memo = self.memos.get(tipo)
+        if memo is not None:
+            memo.put(clave, data, len(contenido))
+        return path
+
+    def guardar_bytes(self, tipo: str, clave: str, contenido: bytes) -> Path:
+        """Guarda contenido JSON ya serializado (ej: el JSON mensual extraido del ZIP)"""
+        if tipo in self.memos:
+            self.memos[tipo].pop(clave)
+        path = self.ruta(tipo, clave)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atomica: un lector nunca ve un JSON a medias
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(contenido)
+        os.replace(tmp, path)
+        self.registrar(tipo, clave)
+        return path
+
+    def registrar(self, tipo: str, clave: str):
+        """Registra (o actualiza) en el indice una entrada ya escrita en self.ruta(tipo, clave)"""
+        path = self.ruta(tipo, clave)
+        st = path.stat()
+        with self._lock:
+            self._db.execute(
+                """INSERT INTO entradas (ruta, tipo, clave, tamano, creado, acceso)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(ruta) DO UPDATE SET
+                       tamano = excluded.tamano, creado = excluded.creado, acceso = excluded.acceso""",
+                (self._relativa(path), tipo, clave, st.st_size, st.st_mtime, time.time())
+            )
+            self._db.commit()
+        self._aplicar_presupuesto(tipo, conservar=self._relativa(path))
+
+    def tocar(self, tipo: str, clave: str):
+        """Marca una entrada como recien usada (la registra si faltaba en el indice)"""
+        path = self.ruta(tipo, clave)
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE entradas SET acceso = ? WHERE ruta = ?",
+                (time.time(), self._relativa(path))
+            )
+            self._db.commit()
+        if cur.rowcount == 0 and path.exists():
+            self.registrar(tipo, clave)
+
+    def borrar(self, tipo: str, clave: str) -> bool:
+        """Elimina una entrada; retorna True si existia"""
+        if tipo in self.memos:
+            self.memos[tipo].pop(clave)
+        path = self.ruta(tipo, clave)
+        existia = path.exists()
+        if existia:
+            path.unlink()
+        self._olvidar(path)
+        return existia
+
+    # ============== CACHE NEGATIVO ==============
+
+    def guardar_negativo(self, tipo: str, clave: str, motivo: str = "no_encontrado"):
+        """Registra que la fuente confirmo que la clave no existe (no usar para errores transitorios)"""
+        self.guardar(tipo, f"neg_{clave}", {"motivo": motivo})
+
+    def es_negativo(self, tipo: str, clave: str) -> bool:
+        """
+        True si hay un "no encontrado" vigente para la clave
+
+        Vigente = mas reciente que CACHE_CONFIG["TTL_SEGUNDOS"]["negativo"] y
+        que el ultimo archivo mensual ingerido. Solo hace un stat (y una
+        consulta al indice), no abre el archivo.
+        """
+        try:
+            guardado = self.ruta(tipo, f"neg_{clave}").stat().st_mtime
+        except FileNotFoundError:
+            return False
+        vigencia = ttl("negativo")
+        if vigencia is not None and time.time() - guardado >= vigencia:
+            return False
+        return guardado > self.ultima_ingesta()
+
+    def borrar_negativo(self, tipo: str, clave: str):
+        """Descarta el "no encontrado" de una clave (ej: al encontrarla)"""
+        if self.ruta(tipo, f"neg_{clave}").exists():
+            self.borrar(tipo, f"neg_{clave}")
+
+    def ultima_ingesta(self, tipo: str = "mes") -> float:
+        """Hora (epoch) en que se guardo el archivo mensual mas reciente; 0 si no hay"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COALESCE(MAX(creado), 0) FROM entradas WHERE tipo = ?", (tipo,)
+            ).fetchone()[0]
+
+    def _olvidar(self, path: Path):
+        with self._lock:
+            self._db.execute("DELETE FROM entradas WHERE ruta = ?", (self._relativa(path),))
+            self._db.commit()
+
+    # ============== PRESUPUESTO / LRU ==============
+
+    def _aplicar_presupuesto(self, tipo: str, limite: int = None, conservar: str = None) -> Dict:
+        """Borra entradas del tipo, de la menos a la mas recientemente usada, hasta entrar en el limite"""
+        if limite is None:
+            limite = self.presupuesto_bytes(tipo)
+
+        with self._lock:
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(tamano), 0) FROM entradas WHERE tipo = ?", (tipo,)
+            ).fetchone()[0]
+            if total <= limite:
+                return {"borradas": 0, "bytes": 0}
+            candidatas = self._db.execute(
+                "SELECT ruta, tamano FROM entradas WHERE tipo = ? ORDER BY acceso", (tipo,)
+            ).fetchall()
+
+        borradas, liberados = [], 0
+        for ruta, tamano in candidatas:
+            if total - liberados <= limite:
+                break
+            if ruta == conservar:
+                continue
+            try:
+                (self.root / ruta).unlink()
+            except FileNotFoundError:
+                pass
+            borradas.append(ruta)
+            liberados += tamano
+
+        with self._lock:
+            self._db.executemany("DELETE FROM entradas WHERE ruta = ?", [(r,) for r in borradas])
+            self._db.commit()
+
+        if borradas:
+            print(f"[CACHE] {tipo}: {len(borradas)} entradas desalojadas ({liberados / (1024 * 1024):.1f} MB)")
+        return {"borradas": len(borradas), "bytes": liberados}
+
+    def prune(self, tipo: str = None, mb: float = None) -> Dict[str, Dict]:
+        """
+        Aplica el presupuesto LRU a un tipo o a todos
+
+        Args:
+            tipo: Tipo a podar (default: todos los del indice)
+            mb: Limite en MB (default: presupuesto configurado del tipo)
+
+        Returns:
+            {tipo: {"borradas": n, "bytes": b}}
+        """
+        tipos = [tipo] if tipo else [t for t in self.stats()]
+        limite = int(mb * 1024 * 1024) if mb is not None else None
+        return {t: self._aplicar_presupuesto(t, limite) for t in tipos}
+
+    # ============== ESTADISTICAS ==============
+
+    def stats(self) -> Dict[str, Dict]:
+        """Entradas, bytes, presupuesto y rango de accesos por tipo"""
+        with self._lock:
+            filas = self._db.execute(
+                """SELECT tipo, COUNT(*), SUM(tamano), MIN(acceso), MAX(acceso)
+                   FROM entradas GROUP BY tipo ORDER BY tipo"""
+            ).fetchall()
+        return {
+            tipo: {
+                "entradas": n,
+                "bytes": total,
+                "presupuesto": self.presupuesto_bytes(tipo),
+                "acceso_min": acceso_min,
+                "acceso_max": acceso_max,
+            }
+            for tipo, n, total, acceso_min, acceso_max in filas
+        }
+
+    def memo_stats(self) -> Dict[str, Dict[str, int]]:
+        """Aciertos/fallos y ocupacion de la memoria en proceso por tipo"""
+        return {tipo: memo.stats() for tipo, memo in self.memos.items()}
+
+    def entradas(self, tipo: str) -> List[Dict]:
+        """Entradas de un tipo ordenadas por clave"""
+        with self._lock:
+            filas = self._db.execute(
+                "SELECT clave, ruta, tamano, acceso FROM entradas WHERE tipo = ? ORDER BY clave",
+                (tipo,)
+            ).fetchall()
+        return [
+            {"clave": clave, "ruta": self.root / ruta, "tamano": tamano, "acceso": acceso}
+            for clave, ruta, tamano, acceso in filas
+        ]
+
+    # ============== MANTENIMIENTO ==============
+
+    def reindexar(self) -> int:
+        """
+        Reconstruye el indice recorriendo <root>/<tipo>/<hh>/*.json
+
+        Las claves no se pueden recuperar del hash; se conservan las del
+        indice anterior cuando existen.
+        """
+        with self._lock:
+            claves = dict(self._db.execute("SELECT ruta, clave FROM entradas"))
+        filas = []
+        for tipo_dir in self.root.iterdir():
+            if not tipo_dir.is_dir():
+                continue
+            for path in tipo_dir.glob("??/*.json"):
+                st = path.stat()
+                ruta = self._relativa(path)
+                filas.append((ruta, tipo_dir.name, claves.get(ruta), st.st_size, st.st_mtime, st.st_atime))
+        with self._lock:
+            self._db.execute("DELETE FROM entradas")
+            self._db.executemany("INSERT INTO entradas VALUES (?, ?, ?, ?, ?, ?)", filas)
+            self._db.commit()
+        return len(filas)
+
+    def migrar_legado(self) -> Dict[str, int]:
+        """
+        Ordena el cache plano anterior (todo en <root>/*.json)
+
+        Los archivos mensuales se mueven al tipo "mes"; los demas (ocds_*,
+        fichas del scraper) se borran porque su clave original no se puede
+        reconstruir del nombre y se vuelven a obtener bajo demanda.
+        """
+        movidos = borrados = 0
+        for path in sorted(self.root.glob("*.json")):
+            m = _MES_LEGADO.match(path.name)
+            if m:
+                destino = self.ruta("mes", m.group(1))
+                destino.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, destino)
+                self.registrar("mes", m.group(1))
+                movidos += 1
+            else:
+                path.unlink()
+                borrados += 1
+        return {"movidos": movidos, "borrados": borrados}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def clave_mes(year: int, month: int, source: str = "seace_v3") -> str:
+    """Clave de un archivo mensual en el tipo "mes" (ej: 2024-12_seace_v3)"""
+    return f"{year}-{month:02d}_{source}"
+
+
+def ttl(endpoint: str) -> Optional[float]:
+    """TTL en segundos de un endpoint ("nom", "ocid", "ficha", "mes"); None = no expira"""
+    return CACHE_CONFIG["TTL_SEGUNDOS"].get(endpoint)
+
+
+def ttl_clave(clave: str) -> Optional[float]:
+    """TTL segun el prefijo de una clave de cliente OCDS (nom_..., ocid_...)"""
+    return ttl(clave.split("_", 1)[0])
+
+
+# ============== INSTANCIA COMPARTIDA ==============
+
+_STORES: Dict[Path, CacheStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(root: Union[str, Path] = None) -> CacheStore:
+    """CacheStore compartido por directorio raiz (uno por proceso)"""
+    root = Path(root or CACHE_DIR).resolve()
+    with _STORES_LOCK:
+        if root not in _STORES:
+            _STORES[root] = CacheStore(root)
+        return _STORES[root]
+
+
+_VUELOS: Dict[str, SingleFlight] = {}
+
+
+def get_vuelos(nombre: str) -> SingleFlight:
+    """SingleFlight compartido por nombre (ej: tipo de cache del cliente)"""
+    with _STORES_LOCK:
+        if nombre not in _VUELOS:
+            _VUELOS[nombre] = SingleFlight()
+        return _VUELOS[nombre]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento del cache SEACE")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("stats", help="Entradas y uso de disco por tipo")
+    p_prune = sub.add_parser("prune", help="Desalojar entradas LRU hasta el presupuesto")
+    p_prune.add_argument("--tipo", help="Solo este tipo (mes, ocds_api, ocds_client, ficha)")
+    p_prune.add_argument("--mb", type=float, help="Limite en MB (default: CACHE_CONFIG)")
+    sub.add_parser("migrate", help="Mover/borrar archivos del cache plano anterior")
+    sub.add_parser("reindex", help="Reconstruir el indice desde el disco")
+    p_warm = sub.add_parser("warm", help="Precargar cache OCDS desde un Excel o --watchlist")
+    p_warm.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.comando == "warm":
+        from cache_warmer import main as warm
+        return warm(args.args)
+
+    store = get_store()
+
+    if args.comando == "prune":
+        for tipo, r in store.prune(args.tipo, args.mb).items():
+            print(f"  {tipo:<12} {r['borradas']:>6} borradas  {r['bytes'] / (1024 * 1024):>10.1f} MB")
+    elif args.comando == "migrate":
+        r = store.migrar_legado()
+        print(f"[OK] {r['movidos']} meses movidos, {r['borrados']} archivos planos borrados")
+    elif args.comando == "reindex":
+        print(f"[OK] {store.reindexar()} entradas indexadas")
+
+    print("=" * 60)
+    print(f"CACHE - {store.root}")
+    print("=" * 60)
+    print(f"{'TIPO':<12} {'ENTRADAS':>9} {'MB':>10} {'PRESUP. MB':>11}  ULTIMO ACCESO")
+    for tipo, s in store.stats().items():
+        ultimo = time.strftime("%Y-%m-%d %H:%M", time.localtime(s["acceso_max"]))
+        print(f"{tipo:<12} {s['entradas']:>9} {s['bytes'] / (1024 * 1024):>10.1f} "
+              f"{s['presupuesto'] / (1024 * 1024):>11.0f}  {ultimo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Precarga (warm) del cache OCDS a partir de un Excel SEACE o una watchlist
+
+Antes de una corrida interactiva, consulta en segundo plano la API OCDS
+para cada nomenclatura y deja los resultados en el cache (ocds_api), asi
+la corrida siguiente solo encuentra aciertos. Las consultas vigentes en
+cache se saltan sin tocar la red.
+
+Uso:
+    python cache_warmer.py ../data/input/procesos.xlsx
+    python cache_warmer.py --watchlist vigilados.txt --workers 4
+
+    calentador = calentar_cache(nomenclaturas, en_segundo_plano=True)
+    ...
+    calentador.esperar()
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+from cache_store import get_store, ttl
+from ocds_api import OCDSClient
+
+
+def leer_watchlist(path: str) -> List[str]:
+    """Nomenclaturas de un archivo de texto (una por linea, # para comentarios)"""
+    nomenclaturas = []
+    with open(path, encoding='utf-8') as f:
+        for linea in f:
+            linea = linea.split('#', 1)[0].strip()
+            if linea:
+                nomenclaturas.append(linea)
+    return nomenclaturas
+
+
+def nomenclaturas_excel(path: str) -> List[str]:
+    """Nomenclaturas unicas de un Excel/CSV exportado de SEACE"""
+    from excel_processor import ExcelProcessor
+
+    # Por bloques: solo se acumulan las nomenclaturas, no el DataFrame
+    nomenclaturas = {}
+    for bloque in ExcelProcessor().iterar_bloques(path):
+        nomenclaturas.update(dict.fromkeys(bloque['nomenclatura'].dropna().unique()))
+    return list(nomenclaturas)
+
+
+class CalentadorCache:
+    """Precarga nomenclaturas en el cache OCDS con concurrencia acotada"""
+
+    def __init__(self, nomenclaturas: Iterable[str], max_workers: int = 4, intervalo_progreso: int = 25):
+        """
+        Args:
+            nomenclaturas: Nomenclaturas a precargar (se ignoran repetidas)
+            max_workers: Consultas simultaneas a la API
+            intervalo_progreso: Imprimir progreso cada N nomenclaturas
+        """
+        self.nomenclaturas = list(dict.fromkeys(n for n in nomenclaturas if n))
+        self.max_workers = max_workers
+        self.intervalo_progreso = intervalo_progreso
+        self.progreso = {
+            "total": len(self.nomenclaturas),
+            "hechos": 0,
+            "en_cache": 0,
+            "descargados": 0,
+            "sin_resultado": 0,
+        }
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cancelado = threading.Event()
+        self._hilo = None
+        self._inicio = None
+
+    def _cliente(self) -> OCDSClient:
+        # requests.Session no es thread-safe: un cliente por hilo
+        if not hasattr(self._local, "cliente"):
+            self._local.cliente = OCDSClient(use_cache=True)
+        return self._local.cliente
+
+    def _calentar(self, nomenclatura: str):
+        if self._cancelado.is_set():
+            return
+
+        store = get_store()
+        if store.vigente(OCDSClient.CACHE_TIPO, f"nom_{nomenclatura}", ttl("nom")):
+            resultado = "en_cache"
+        elif self._cliente().buscar_por_nomenclatura(nomenclatura):
+            resultado = "descargados"
+        else:
+            resultado = "sin_resultado"
+
+        with self._lock:
+            self.progreso[resultado] += 1
+            self.progreso["hechos"] += 1
+            hechos = self.progreso["hechos"]
+        if hechos % self.intervalo_progreso == 0 or hechos == self.progreso["total"]:
+            self._imprimir_progreso()
+
+    def _imprimir_progreso(self):
+        p = dict(self.progreso)
+        ritmo = p["hechos"] / max(time.perf_counter() - self._inicio, 1e-9)
+        print(f"[WARM] {p['hechos']}/{p['total']} "
+              f"(cache {p['en_cache']}, descargados {p['descargados']}, "
+              f"sin resultado {p['sin_resultado']}) {ritmo:.1f}/s")
+
+    def ejecutar(self) -> Dict[str, int]:
+        """Precarga todas las nomenclaturas (bloqueante)"""
+        self._inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for _ in pool.map(self._calentar, self.nomenclaturas):
+                pass
+        return dict(self.progreso)
+
+    def iniciar(self) -> "CalentadorCache":
+        """Precarga en un hilo de fondo; consultar self.progreso o llamar esperar()"""
+        self._hilo = threading.Thread(target=self.ejecutar, name="cache-warm", daemon=True)
+        self._hilo.start()
+        return self
+
+    def esperar(self, timeout: float = None) -> Dict[str, int]:
+        """Espera a que termine la precarga de fondo y retorna el progreso"""
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+        return dict(self.progreso)
+
+    def cancelar(self):
+        """Detiene la precarga (las consultas en curso terminan)"""
+        self._cancelado.set()
+
+    @property
+    def activo(self) -> bool:
+        return self._hilo is not None and self._hilo.is_alive()
+
+
+def calentar_cache(
+    nomenclaturas: Iterable[str],
+    max_workers: int = 4,
+    en_segundo_plano: bool = False
+):
+    """
+    Precarga el cache OCDS para una lista de nomenclaturas
+
+    Args:
+        nomenclaturas: Ej: ExcelProcessor.get_nomenclaturas() o leer_watchlist()
+        max_workers: Consultas simultaneas a la API
+        en_segundo_plano: Retornar de inmediato con el CalentadorCache en marcha
+
+    Returns:
+        CalentadorCache (en segundo plano) o dict con el progreso final
+    """
+    calentador = CalentadorCache(nomenclaturas, max_workers=max_workers)
+    if en_segundo_plano:
+        return calentador.iniciar()
+    return calentador.ejecutar()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Precargar cache OCDS")
+    parser.add_argument("excel", nargs="?", help="Excel/CSV exportado de SEACE")
+    parser.add_argument("--watchlist", help="Archivo de texto con una nomenclatura por linea")
+    parser.add_argument("--workers", type=int, default=4, help="Consultas simultaneas (default: 4)")
+    args = parser.parse_args(argv)
+
+    if not args.excel and not args.watchlist:
+        parser.error("indicar un Excel o --watchlist")
+
+    nomenclaturas = []
+    if args.excel:
+        nomenclaturas += nomenclaturas_excel(args.excel)
+    if args.watchlist:
+        nomenclaturas += leer_watchlist(args.watchlist)
+
+    print("=" * 60)
+    print(f"WARM CACHE OCDS - {len(set(nomenclaturas))} nomenclaturas, {args.workers} workers")
+    print("=" * 60)
+
+    inicio = time.time()
+    r = calentar_cache(nomenclaturas, max_workers=args.workers)
+    print(f"\n[OK] {r['hechos']} en {time.time() - inicio:.1f}s "
+          f"(cache {r['en_cache']}, descargados {r['descargados']}, sin resultado {r['sin_resultado']})")
+
+
+if __name__ == "__main__":
+    main()
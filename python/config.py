@@ -29,6 +29,114 @@ SEACE_CONFIG = {
     # Timeouts
     "PAGE_LOAD_TIMEOUT": 30,
     "REQUEST_TIMEOUT": 15,
+
+    # Descargar la ficha por HTTP (ficha_http.py) y usar Selenium solo si
+    # la respuesta no trae los paneles renderizados
+    "FICHA_HTTP": True,
+
+    # Parser de paneles de la ficha (ver parser_ficha.py):
+    # auto = selectolax > lxml > bs4, segun lo que este instalado
+    "PARSER_FICHA": os.environ.get("SEACE_PARSER_FICHA", "auto"),
+
+    # Topes (segundos) de las esperas por condicion del scraper; si la
+    # pagina esta lista antes, se sigue de inmediato
+    "ESPERAS": {
+        "AJAX": 10,          # Cola AJAX de PrimeFaces/jQuery vacia
+        "BUSCADOR": 15,      # Formulario de busqueda visible
+        "RESULTADOS": 15,    # Tabla de resultados (con filas o vacia)
+        "PANEL": 15,         # Paneles de la ficha renderizados
+        "POSTORES": 10,      # Tabla de ofertas tras "Ver Ofertas Presentadas"
+    },
+}
+
+# Serializacion JSON (ver json_backend.py)
+JSON_CONFIG = {
+    # auto = orjson > msgspec > json (stdlib), segun lo que este instalado
+    "BACKEND": os.environ.get("SEACE_JSON_BACKEND", "auto"),
+    # Salida compacta por defecto; SEACE_JSON_PRETTY=1 para indentar
+    "PRETTY": os.environ.get("SEACE_JSON_PRETTY", "0") == "1",
+}
+
+# Carga de exports SEACE (ver excel_processor.py)
+EXCEL_CONFIG = {
+    # Filas por bloque al leer (CSV con chunksize, xlsx con openpyxl en
+    # modo read_only); cada bloque se procesa antes de leer el siguiente.
+    # 0 = leer el archivo completo de una vez con dtypes inferidos
+    "BLOQUE_FILAS": int(os.environ.get("SEACE_BLOQUE_FILAS", "50000")),
+}
+
+# Planificador de enriquecimiento (ver planificador.py)
+PLANIFICADOR_CONFIG = {
+    # Un proceso en OCDS sin buena pro y publicado hace menos de estos dias
+    # se scrapea igual: el mes en cache puede no tener sus ultimas etapas
+    "DIAS_EN_CURSO": 120,
+}
+
+# Region de la entidad (ver regiones.py)
+REGION_CONFIG = {
+    # Usar el department del buyer en los meses OCDS del cache cuando la
+    # entidad aparece ahi; si no, se deduce del nombre con REGIONES
+    "DEPARTAMENTO_OCDS": True,
+    # Region cuando el nombre no coincide con ningun patron
+    "DEFAULT": "LIMA",
+}
+
+# Patrones (subcadenas del nombre de la entidad en mayusculas) por region.
+# El orden es la prioridad: gana la primera region con algun patron presente
+REGIONES = {
+    'AMAZONAS': ['AMAZONAS', 'CHACHAPOYAS', 'BAGUA'],
+    'ANCASH': ['ANCASH', 'HUARAZ', 'CHIMBOTE'],
+    'APURIMAC': ['APURIMAC', 'ABANCAY', 'ANDAHUAYLAS'],
+    'AREQUIPA': ['AREQUIPA', 'ELECTROSUR', 'SEAL'],
+    'AYACUCHO': ['AYACUCHO', 'HUAMANGA'],
+    'CAJAMARCA': ['CAJAMARCA', 'JAEN'],
+    'CALLAO': ['CALLAO'],
+    'CUSCO': ['CUSCO', 'ELECTRO SUR ESTE'],
+    'HUANCAVELICA': ['HUANCAVELICA'],
+    'HUANUCO': ['HUANUCO'],
+    'ICA': ['ICA', 'NAZCA', 'PISCO'],
+    'JUNIN': ['JUNIN', 'HUANCAYO'],
+    'LA LIBERTAD': ['LA LIBERTAD', 'TRUJILLO', 'HIDRANDINA'],
+    'LAMBAYEQUE': ['LAMBAYEQUE', 'CHICLAYO'],
+    'LIMA': ['LIMA', 'MINISTERIO', 'SEDAPAL'],
+    'LORETO': ['LORETO', 'IQUITOS'],
+    'MADRE DE DIOS': ['MADRE DE DIOS', 'PUERTO MALDONADO'],
+    'MOQUEGUA': ['MOQUEGUA', 'ILO'],
+    'PASCO': ['PASCO'],
+    'PIURA': ['PIURA', 'ENOSA', 'SULLANA'],
+    'PUNO': ['PUNO', 'JULIACA'],
+    'SAN MARTIN': ['SAN MARTIN', 'TARAPOTO'],
+    'TACNA': ['TACNA'],
+    'TUMBES': ['TUMBES'],
+    'UCAYALI': ['UCAYALI', 'PUCALLPA']
+}
+
+# Cache en disco (ver cache_store.py)
+CACHE_CONFIG = {
+    # Presupuesto de disco por tipo de entrada; al superarlo se desalojan
+    # las entradas usadas hace mas tiempo (LRU)
+    "PRESUPUESTO_MB": {
+        "mes": 20 * 1024,      # Archivos mensuales OCDS (cientos de MB c/u)
+        "ocds_api": 256,
+        "ocds_client": 256,
+        "ficha": 512,
+    },
+    "PRESUPUESTO_DEFAULT_MB": 256,
+    # Memoria LRU en proceso delante del disco (no aplica a archivos mensuales)
+    "MEMO": {
+        "TIPOS": ["ocds_api", "ocds_client", "ficha"],
+        "MAX_ENTRADAS": 2048,
+        "MAX_MB": 64,
+    },
+    # Vigencia por endpoint en segundos (None = no expira); se compara contra
+    # el mtime del archivo, sin abrirlo. Igual para todos los clientes.
+    "TTL_SEGUNDOS": {
+        "nom": 3600,           # Busqueda por nomenclatura (ocds_api, ocds_client)
+        "ocid": 3600,          # Record por OCID (ocds_api, ocds_client)
+        "ficha": 24 * 3600,    # Ficha scrapeada (SeaceScraper)
+        "mes": None,           # Archivos mensuales (se refrescan explicitamente)
+        "negativo": 1800,      # "No encontrado" confirmado por la API (mas corto)
+    },
 }
 
 # Google Sheets
@@ -1,13 +1,18 @@
 """
 Procesador de archivos Excel exportados desde SEACE
 """
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
-import re
 
-from config import INPUT_DIR, OUTPUT_DIR
+from openpyxl import load_workbook
+
+from config import INPUT_DIR, OUTPUT_DIR, EXCEL_CONFIG, REGION_CONFIG
+import json_backend
+from jsonl_io import JsonlWriter, extension, resolver_formato
+from regiones import departamentos_ocds, detectar_regiones, get_clasificador
 
 
 class ExcelProcessor:
@@ -27,15 +32,46 @@ class ExcelProcessor:
         'Version SEACE': 'version_seace'
     }
 
+    # Filas por bloque al exportar en JSONL
+    EXPORT_CHUNK = 10_000
+
+    # Tipos explicitos al leer por bloques (nombres internos). Las columnas
+    # que se repiten mucho van como category: un codigo por fila
+    DTYPES = {
+        'entidad': 'category',
+        'fecha_publicacion': str,
+        'nomenclatura': str,
+        'reiniciado_desde': str,
+        'objeto': 'category',
+        'descripcion': str,
+        'valor': str,
+        'moneda': 'category',
+        'version_seace': 'category',
+    }
+
+    # Textos que read_excel/read_csv leen como NaN (na_values por defecto);
+    # openpyxl los entrega tal cual
+    TEXTOS_NA = frozenset([
+        '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+        '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+    ])
+
+    # Columnas que conserva cargar_indice: nomenclaturas, fechas para el
+    # planificador y lo que usa resumen()
+    COLUMNAS_INDICE = ['nomenclatura', 'anio', 'mes', 'tipo_proceso', 'region', 'valor_numerico', 'entidad']
+
     def __init__(self):
         self.df = None
+        self._departamentos = None
 
-    def cargar_excel(self, filepath: str) -> pd.DataFrame:
+    def cargar_excel(self, filepath: str, bloque_filas: int = None) -> pd.DataFrame:
         """
         Carga un archivo Excel exportado de SEACE
 
         Args:
             filepath: Ruta al archivo Excel
+            bloque_filas: Filas por bloque (default: EXCEL_CONFIG["BLOQUE_FILAS"];
+                0 = archivo completo de una vez)
 
         Returns:
             DataFrame con los datos procesados
@@ -45,6 +81,12 @@ class ExcelProcessor:
         if not filepath.exists():
             raise FileNotFoundError(f"Archivo no encontrado: {filepath}")
 
+        if bloque_filas is None:
+            bloque_filas = EXCEL_CONFIG["BLOQUE_FILAS"]
+        if bloque_filas:
+            self.df = self._unir_bloques(list(self.iterar_bloques(filepath, bloque_filas)))
+            return self.df
+
         # Cargar Excel
         if filepath.suffix == '.csv':
             self.df = pd.read_csv(filepath, encoding='utf-8')
@@ -59,41 +101,154 @@ class ExcelProcessor:
 
         return self.df
 
+    def cargar_indice(self, filepath: str, bloque_filas: int = None) -> pd.DataFrame:
+        """
+        Carga por bloques solo COLUMNAS_INDICE (sin descripcion ni textos largos)
+
+        Para recorrer exports grandes sin tenerlos completos en memoria: con
+        el indice alcanzan get_nomenclaturas() y resumen(); las filas
+        completas se vuelven a leer con iterar_bloques.
+
+        Returns:
+            DataFrame con las COLUMNAS_INDICE presentes en el archivo
+        """
+        filepath = Path(filepath)
+
+        if not filepath.exists():
+            raise FileNotFoundError(f"Archivo no encontrado: {filepath}")
+
+        bloques = []
+        for bloque in self.iterar_bloques(filepath, bloque_filas):
+            bloques.append(bloque[[c for c in self.COLUMNAS_INDICE if c in bloque.columns]])
+        self.df = self._unir_bloques(bloques)
+        return self.df
+
+    def iterar_bloques(self, filepath: str, bloque_filas: int = None) -> Iterator[pd.DataFrame]:
+        """
+        Lee y procesa el archivo de a bloques, sin cargarlo entero
+
+        CSV con read_csv(chunksize=...) y xlsx con openpyxl en modo
+        read_only (streaming de filas); otros formatos (.xls) se leen
+        completos y se parten. En CSV se leen como str las columnas str de
+        DTYPES; en xlsx las celdas conservan su tipo. En ambos las columnas
+        category de DTYPES se convierten despues de leer cada bloque.
+
+        Yields:
+            DataFrame procesado de hasta bloque_filas filas
+        """
+        filepath = Path(filepath)
+        bloque_filas = bloque_filas or EXCEL_CONFIG["BLOQUE_FILAS"] or self.EXPORT_CHUNK
+
+        if filepath.suffix == '.csv':
+            originales = {v: k for k, v in self.COLUMN_MAPPING.items()}
+            # Las category se convierten despues de inferir (como en xlsx): con
+            # dtype='category' read_csv deja los numeros como texto (3 -> '3')
+            dtypes = {originales[c]: t for c, t in self.DTYPES.items() if t != 'category'}
+            bloques = pd.read_csv(filepath, encoding='utf-8', dtype=dtypes, chunksize=bloque_filas)
+        elif filepath.suffix in ('.xlsx', '.xlsm'):
+            bloques = self._bloques_xlsx(filepath, bloque_filas)
+        else:
+            df = pd.read_excel(filepath)
+            bloques = (df.iloc[i:i + bloque_filas].copy() for i in range(0, len(df), bloque_filas))
+
+        for bloque in bloques:
+            bloque = bloque.rename(columns=self.COLUMN_MAPPING)
+            categorias = [c for c, t in self.DTYPES.items() if t == 'category' and c in bloque.columns]
+            bloque = bloque.astype({c: 'category' for c in categorias})
+            yield self._procesar(bloque)
+
+    @classmethod
+    def _bloques_xlsx(cls, filepath: Path, bloque_filas: int) -> Iterator[pd.DataFrame]:
+        """Filas de la primera hoja en DataFrames de bloque_filas (openpyxl read_only)"""
+        libro = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            filas = libro.active.iter_rows(values_only=True)
+            encabezado = next(filas, None)
+            if encabezado is None:
+                return
+            columnas = [c if c is not None else f"Unnamed: {i}" for i, c in enumerate(encabezado)]
+            bloque = []
+            for fila in filas:
+                if all(v is None for v in fila):
+                    continue  # Como read_excel: sin filas en blanco
+                bloque.append(fila)
+                if len(bloque) == bloque_filas:
+                    yield cls._marcar_na(pd.DataFrame(bloque, columns=columnas))
+                    bloque = []
+            if bloque:
+                yield cls._marcar_na(pd.DataFrame(bloque, columns=columnas))
+        finally:
+            libro.close()
+
+    @classmethod
+    def _marcar_na(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Celdas de texto en TEXTOS_NA -> NaN, como read_excel"""
+        for col in df.select_dtypes(include='object').columns:
+            df[col] = df[col].mask(df[col].isin(cls.TEXTOS_NA))
+        return df
+
+    @staticmethod
+    def _unir_bloques(bloques: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatena bloques procesados conservando las columnas category"""
+        if not bloques:
+            return pd.DataFrame()
+        # Cada bloque trae sus propias categorias: igualarlas para que concat no pase a object
+        for col in bloques[0].select_dtypes('category').columns:
+            categorias = pd.unique(np.concatenate([
+                b[col].cat.categories.to_numpy(dtype=object) for b in bloques
+            ]))
+            for b in bloques:
+                b[col] = b[col].cat.set_categories(categorias)
+        return pd.concat(bloques, ignore_index=True)
+
     def _procesar_datos(self):
         """Procesa y limpia los datos del DataFrame"""
         if self.df is None:
             return
+        self.df = self._procesar(self.df)
 
+    def _procesar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Columnas derivadas de un DataFrame (o bloque) con nombres internos"""
         # Limpiar nomenclatura
-        if 'nomenclatura' in self.df.columns:
-            self.df['nomenclatura'] = self.df['nomenclatura'].str.strip()
+        if 'nomenclatura' in df.columns:
+            df['nomenclatura'] = df['nomenclatura'].str.strip()
 
         # Procesar fecha
-        if 'fecha_publicacion' in self.df.columns:
-            self.df['fecha_publicacion_dt'] = pd.to_datetime(
-                self.df['fecha_publicacion'],
+        if 'fecha_publicacion' in df.columns:
+            df['fecha_publicacion_dt'] = pd.to_datetime(
+                df['fecha_publicacion'],
                 format='%d/%m/%Y %H:%M',
                 errors='coerce'
             )
-            self.df['fecha_publicacion_iso'] = self.df['fecha_publicacion_dt'].dt.strftime('%Y-%m-%d')
-            self.df['anio'] = self.df['fecha_publicacion_dt'].dt.year
-            self.df['mes'] = self.df['fecha_publicacion_dt'].dt.month
+            df['fecha_publicacion_iso'] = df['fecha_publicacion_dt'].dt.strftime('%Y-%m-%d')
+            df['anio'] = df['fecha_publicacion_dt'].dt.year
+            df['mes'] = df['fecha_publicacion_dt'].dt.month
 
         # Procesar valor
-        if 'valor' in self.df.columns:
-            self.df['valor_numerico'] = self.df['valor'].apply(self._parsear_valor)
+        if 'valor' in df.columns:
+            df['valor_numerico'] = self._parsear_valores(df['valor'])
 
         # Procesar moneda
-        if 'moneda' in self.df.columns:
-            self.df['moneda_codigo'] = self.df['moneda'].apply(self._normalizar_moneda)
+        if 'moneda' in df.columns:
+            df['moneda_codigo'] = self._normalizar_monedas(df['moneda'])
 
         # Extraer componentes de nomenclatura
-        if 'nomenclatura' in self.df.columns:
-            self.df = self._extraer_componentes_nomenclatura(self.df)
+        if 'nomenclatura' in df.columns:
+            df = self._extraer_componentes_nomenclatura(df)
 
-        # Detectar region
-        if 'entidad' in self.df.columns:
-            self.df['region'] = self.df['entidad'].apply(self._detectar_region)
+        # Detectar region (department OCDS si la entidad esta en el cache)
+        if 'entidad' in df.columns:
+            df['region'] = detectar_regiones(df['entidad'], self._get_departamentos())
+
+        return df
+
+    def _get_departamentos(self) -> Optional[Dict[str, str]]:
+        """Indice OCDS entidad -> region, leido una vez por procesador"""
+        if not REGION_CONFIG["DEPARTAMENTO_OCDS"]:
+            return None
+        if self._departamentos is None:
+            self._departamentos = departamentos_ocds()
+        return self._departamentos
 
     def _parsear_valor(self, valor) -> float:
         """Convierte string de valor a numero"""
@@ -108,6 +263,34 @@ class ExcelProcessor:
         except:
             return 0.0
 
+    def _parsear_valores(self, valores: pd.Series) -> pd.Series:
+        """
+        _parsear_valor sobre toda la columna
+
+        Una sola pasada de to_numeric sobre los textos sin separadores; solo
+        las celdas que quedan NaN sin serlo en el origen ("---", "1_000",
+        fechas del Excel) pasan por _parsear_valor. Los textos de mas de 15
+        caracteres tambien: con mantisas largas to_numeric puede diferir de
+        float() en el ultimo bit (los montos SEACE, con 2 decimales, no llegan).
+        """
+        if pd.api.types.is_numeric_dtype(valores):
+            return valores.astype(float).fillna(0.0)
+
+        def limpiar(valor):
+            # Quitar separadores de miles; los textos largos quedan NaN
+            if not isinstance(valor, str):
+                return valor
+            texto = valor.replace(',', '').replace(' ', '')
+            return texto if len(texto) <= 15 else None
+
+        objetos = valores.to_numpy(dtype=object)
+        numeros = pd.to_numeric(pd.Series([limpiar(v) for v in objetos], dtype=object), errors='coerce')
+        revisar = (numeros.isna() & pd.notna(objetos)).to_numpy()
+        resultado = numeros.fillna(0.0).to_numpy(dtype=float, copy=True)
+        if revisar.any():
+            resultado[revisar] = [self._parsear_valor(v) for v in objetos[revisar]]
+        return pd.Series(resultado, index=valores.index, name=valores.name)
+
     def _normalizar_moneda(self, moneda) -> str:
         """Normaliza codigo de moneda"""
         if pd.isna(moneda):
@@ -119,81 +302,48 @@ class ExcelProcessor:
             return 'EUR'
         return 'PEN'
 
+    def _normalizar_monedas(self, monedas: pd.Series) -> pd.Series:
+        """_normalizar_moneda una vez por cada moneda distinta y map sobre la columna"""
+        codigos, distintas = pd.factorize(monedas)  # NaN -> -1 (el 'PEN' agregado al final)
+        normalizadas = np.array([self._normalizar_moneda(m) for m in distintas] + ['PEN'], dtype=object)
+        return pd.Series(normalizadas[codigos], index=monedas.index, name=monedas.name)
+
     def _extraer_componentes_nomenclatura(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Extrae componentes de la nomenclatura"""
-        def extraer(nom):
-            if pd.isna(nom):
-                return pd.Series({
-                    'tipo_proceso': None,
-                    'modalidad': None,
-                    'numero_proceso': None,
-                    'anio_proceso': None,
-                    'sigla_entidad': None,
-                    'version': None
-                })
-
-            partes = str(nom).split('-')
-
-            # Buscar anio (4 digitos que empiezan con 20)
-            anio = None
-            for p in partes:
-                if re.match(r'^20\d{2}$', p):
-                    anio = p
-                    break
-
-            return pd.Series({
-                'tipo_proceso': partes[0] if len(partes) > 0 else None,
-                'modalidad': partes[1] if len(partes) > 1 else None,
-                'numero_proceso': partes[2] if len(partes) > 2 else None,
-                'anio_proceso': anio,
-                'sigla_entidad': partes[4] if len(partes) > 4 else None,
-                'version': partes[5] if len(partes) > 5 else '1'
-            })
-
-        componentes = df['nomenclatura'].apply(extraer)
+        """Extrae componentes de la nomenclatura (TIPO-MODALIDAD-NUMERO-ANIO-SIGLA-VERSION)"""
+        nomenclaturas = df['nomenclatura']
+        validas = nomenclaturas.notna()
+
+        # Object explicito: str.split/str.match con el re de Python en pandas 2 y 3
+        partes = (nomenclaturas[validas].astype(str).astype(object)
+                  .reset_index(drop=True).str.split('-', expand=True))
+        partes = partes.reindex(columns=range(max(6, partes.shape[1])))
+        partes = partes.astype(object).where(partes.notna(), None)
+
+        # Anio: la primera parte de 4 digitos que empieza con 20
+        anio = pd.Series(None, index=partes.index, dtype=object)
+        for col in reversed(partes.columns):
+            es_anio = partes[col].str.match(r'^20\d{2}$').fillna(False).astype(bool)
+            anio = anio.where(~es_anio, partes[col])
+
+        # Filas sin nomenclatura: None en todas las columnas (tambien en version)
+        def columna(serie: pd.Series) -> pd.Series:
+            valores = np.full(len(df), None, dtype=object)
+            valores[validas.to_numpy()] = serie.to_numpy(dtype=object)
+            return pd.Series(valores, index=df.index)
+
+        componentes = pd.DataFrame({
+            'tipo_proceso': columna(partes[0]),
+            'modalidad': columna(partes[1]),
+            'numero_proceso': columna(partes[2]),
+            'anio_proceso': columna(anio),
+            'sigla_entidad': columna(partes[4]),
+            'version': columna(partes[5].where(partes[5].notna(), '1')),
+        })
         return pd.concat([df, componentes], axis=1)
 
     def _detectar_region(self, entidad) -> str:
         """Detecta la region basandose en el nombre de la entidad"""
-        if pd.isna(entidad):
-            return 'LIMA'
-
-        entidad_upper = str(entidad).upper()
-
-        regiones = {
-            'AMAZONAS': ['AMAZONAS', 'CHACHAPOYAS', 'BAGUA'],
-            'ANCASH': ['ANCASH', 'HUARAZ', 'CHIMBOTE'],
-            'APURIMAC': ['APURIMAC', 'ABANCAY', 'ANDAHUAYLAS'],
-            'AREQUIPA': ['AREQUIPA', 'ELECTROSUR', 'SEAL'],
-            'AYACUCHO': ['AYACUCHO', 'HUAMANGA'],
-            'CAJAMARCA': ['CAJAMARCA', 'JAEN'],
-            'CALLAO': ['CALLAO'],
-            'CUSCO': ['CUSCO', 'ELECTRO SUR ESTE'],
-            'HUANCAVELICA': ['HUANCAVELICA'],
-            'HUANUCO': ['HUANUCO'],
-            'ICA': ['ICA', 'NAZCA', 'PISCO'],
-            'JUNIN': ['JUNIN', 'HUANCAYO'],
-            'LA LIBERTAD': ['LA LIBERTAD', 'TRUJILLO', 'HIDRANDINA'],
-            'LAMBAYEQUE': ['LAMBAYEQUE', 'CHICLAYO'],
-            'LIMA': ['LIMA', 'MINISTERIO', 'SEDAPAL'],
-            'LORETO': ['LORETO', 'IQUITOS'],
-            'MADRE DE DIOS': ['MADRE DE DIOS', 'PUERTO MALDONADO'],
-            'MOQUEGUA': ['MOQUEGUA', 'ILO'],
-            'PASCO': ['PASCO'],
-            'PIURA': ['PIURA', 'ENOSA', 'SULLANA'],
-            'PUNO': ['PUNO', 'JULIACA'],
-            'SAN MARTIN': ['SAN MARTIN', 'TARAPOTO'],
-            'TACNA': ['TACNA'],
-            'TUMBES': ['TUMBES'],
-            'UCAYALI': ['UCAYALI', 'PUCALLPA']
-        }
-
-        for region, patrones in regiones.items():
-            for patron in patrones:
-                if patron in entidad_upper:
-                    return region
-
-        return 'LIMA'
+        return get_clasificador().region(entidad)
 
     def get_nomenclaturas(self) -> List[str]:
         """Retorna lista de nomenclaturas unicas"""
@@ -234,22 +384,39 @@ class ExcelProcessor:
 
         return df_filtrado
 
-    def exportar_json(self, filepath: str = None) -> str:
-        """Exporta los datos a JSON"""
+    def exportar_json(self, filepath: str = None, formato: str = None, append: bool = False) -> str:
+        """
+        Exporta los datos a JSON o JSONL
+
+        Args:
+            filepath: Archivo de salida
+            formato: "json" o "jsonl" (None = inferir por extension)
+            append: Solo jsonl - agregar al archivo existente
+        """
         if self.df is None:
             return "{}"
 
+        formato = resolver_formato(formato, filepath)
         if filepath:
             filepath = Path(filepath)
         else:
-            filepath = OUTPUT_DIR / f"procesos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filepath = OUTPUT_DIR / f"procesos_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension(formato)}"
+
+        if formato == "jsonl":
+            # Convertir por bloques para no duplicar todo el DataFrame en memoria
+            with JsonlWriter(filepath, append=append, default=str) as writer:
+                for inicio in range(0, len(self.df), self.EXPORT_CHUNK):
+                    bloque = self.df.iloc[inicio:inicio + self.EXPORT_CHUNK]
+                    writer.write_many(bloque.to_dict(orient='records'))
+            return str(filepath)
+
+        if append:
+            raise ValueError("append solo esta disponible en formato jsonl")
 
         # Convertir a lista de diccionarios
         records = self.df.to_dict(orient='records')
 
-        import json
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(records, f, ensure_ascii=False, indent=2, default=str)
+        json_backend.dump(records, filepath, default=str)
 
         return str(filepath)
 
@@ -6,181 +6,324 @@ Genera multiples CSVs:
 - cronograma.csv: Fechas del cronograma
 - postores.csv: Lista de postores por proceso
 - documentos.csv: Documentos disponibles
+- items.csv: Items del proceso
+
+La entrada puede ser un JSON (lista de procesos) o un JSONL (un proceso por
+linea); los JSONL se leen en streaming y las cinco tablas se escriben en una
+sola pasada con todos los archivos abiertos a la vez.
+
+Modo delta (--delta): guarda un hash por fila de la exportacion anterior y
+solo escribe filas nuevas, modificadas y eliminadas por tabla
+({prefijo}_{tabla}_delta.csv) mas un manifiesto ({prefijo}_manifest.json).
 """
 import csv
+import hashlib
 import json
 import sys
+from contextlib import ExitStack
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Iterable, List
 
 sys.path.insert(0, str(Path(__file__).parent))
 from config import OUTPUT_DIR
+import json_backend
+from jsonl_io import iterar_registros
 
 
-def export_to_sheets(json_file: str, output_prefix: str = None):
-    """
-    Exporta JSON de procesos a CSVs para Google Sheets
+# ============== FILAS POR TABLA ==============
 
-    Args:
-        json_file: Archivo JSON con procesos
-        output_prefix: Prefijo para archivos de salida
-    """
-    # Cargar datos
-    with open(json_file, 'r', encoding='utf-8') as f:
-        procesos = json.load(f)
+def _filas_procesos(p: Dict) -> List[list]:
+    entidad = p.get('entidad', {}) or {}
+    ganador = p.get('ganador', {}) or {}
+    contrato = p.get('contrato', {}) or {}
 
-    if output_prefix is None:
-        output_prefix = OUTPUT_DIR / "sheets"
+    return [[
+        p.get('ocid'),
+        p.get('nomenclatura'),
+        p.get('descripcion'),
+        p.get('tipo_procedimiento'),
+        p.get('categoria'),
+        entidad.get('nombre'),
+        entidad.get('ruc'),
+        entidad.get('departamento'),
+        p.get('valor_referencial'),
+        p.get('moneda'),
+        p.get('fecha_publicacion'),
+        p.get('num_postores'),
+        ganador.get('nombre') if ganador else '',
+        ganador.get('ruc') if ganador else '',
+        p.get('monto_adjudicado'),
+        contrato.get('numero') if contrato else '',
+        contrato.get('monto') if contrato else '',
+        contrato.get('inicio') if contrato else '',
+        contrato.get('fin') if contrato else '',
+        p.get('num_documentos'),
+        p.get('periodo')
+    ]]
 
-    output_prefix = Path(output_prefix)
-    output_prefix.parent.mkdir(parents=True, exist_ok=True)
 
-    # 1. PROCESOS (BD_PROCESOS)
-    procesos_file = f"{output_prefix}_procesos.csv"
-    with open(procesos_file, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerow([
+def _filas_cronograma(p: Dict) -> List[list]:
+    crono = p.get('cronograma', {}) or {}
+    return [[
+        p.get('nomenclatura'),
+        crono.get('convocatoria_inicio'),
+        crono.get('convocatoria_fin'),
+        crono.get('consultas_inicio'),
+        crono.get('consultas_fin'),
+        crono.get('buena_pro')
+    ]]
+
+
+def _filas_postores(p: Dict) -> List[list]:
+    ganador_ruc = (p.get('ganador') or {}).get('ruc', '')
+    filas = []
+    for postor in p.get('postores', []):
+        es_ganador = 'SI' if postor.get('ruc') == ganador_ruc else 'NO'
+        filas.append([
+            p.get('nomenclatura'),
+            postor.get('ruc'),
+            postor.get('nombre'),
+            es_ganador
+        ])
+    return filas
+
+
+def _filas_documentos(p: Dict) -> List[list]:
+    return [
+        [
+            p.get('nomenclatura'),
+            doc.get('titulo'),
+            doc.get('tipo'),
+            doc.get('formato'),
+            doc.get('url'),
+            doc.get('fecha')
+        ]
+        for doc in p.get('documentos', [])
+    ]
+
+
+def _filas_items(p: Dict) -> List[list]:
+    return [
+        [
+            p.get('nomenclatura'),
+            item.get('descripcion'),
+            item.get('cantidad'),
+            item.get('unidad'),
+            item.get('clasificacion')
+        ]
+        for item in p.get('items', [])
+    ]
+
+
+# Definicion de tablas: headers, generador de filas y columnas clave (modo delta)
+TABLAS = {
+    'procesos': {
+        'headers': [
             'OCID', 'NOMENCLATURA', 'DESCRIPCION', 'TIPO_PROCEDIMIENTO',
             'CATEGORIA', 'ENTIDAD', 'RUC_ENTIDAD', 'DEPARTAMENTO',
             'VALOR_REFERENCIAL', 'MONEDA', 'FECHA_PUBLICACION',
             'NUM_POSTORES', 'GANADOR', 'RUC_GANADOR', 'MONTO_ADJUDICADO',
             'CONTRATO_NUM', 'CONTRATO_MONTO', 'CONTRATO_INICIO', 'CONTRATO_FIN',
             'NUM_DOCUMENTOS', 'PERIODO'
-        ])
-
-        for p in procesos:
-            entidad = p.get('entidad', {}) or {}
-            ganador = p.get('ganador', {}) or {}
-            contrato = p.get('contrato', {}) or {}
-
-            writer.writerow([
-                p.get('ocid'),
-                p.get('nomenclatura'),
-                p.get('descripcion'),
-                p.get('tipo_procedimiento'),
-                p.get('categoria'),
-                entidad.get('nombre'),
-                entidad.get('ruc'),
-                entidad.get('departamento'),
-                p.get('valor_referencial'),
-                p.get('moneda'),
-                p.get('fecha_publicacion'),
-                p.get('num_postores'),
-                ganador.get('nombre') if ganador else '',
-                ganador.get('ruc') if ganador else '',
-                p.get('monto_adjudicado'),
-                contrato.get('numero') if contrato else '',
-                contrato.get('monto') if contrato else '',
-                contrato.get('inicio') if contrato else '',
-                contrato.get('fin') if contrato else '',
-                p.get('num_documentos'),
-                p.get('periodo')
-            ])
-
-    print(f"[OK] {procesos_file} ({len(procesos)} filas)")
-
-    # 2. CRONOGRAMA
-    cronograma_file = f"{output_prefix}_cronograma.csv"
-    with open(cronograma_file, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerow([
+        ],
+        'filas': _filas_procesos,
+        'clave': ['OCID', 'NOMENCLATURA'],
+    },
+    'cronograma': {
+        'headers': [
             'NOMENCLATURA', 'CONVOCATORIA_INICIO', 'CONVOCATORIA_FIN',
             'CONSULTAS_INICIO', 'CONSULTAS_FIN', 'BUENA_PRO'
-        ])
+        ],
+        'filas': _filas_cronograma,
+        'clave': ['NOMENCLATURA'],
+    },
+    'postores': {
+        'headers': ['NOMENCLATURA', 'RUC', 'NOMBRE', 'ES_GANADOR'],
+        'filas': _filas_postores,
+        'clave': ['NOMENCLATURA', 'RUC'],
+    },
+    'documentos': {
+        'headers': ['NOMENCLATURA', 'TITULO', 'TIPO', 'FORMATO', 'URL', 'FECHA'],
+        'filas': _filas_documentos,
+        'clave': ['NOMENCLATURA', 'URL', 'TITULO'],
+    },
+    'items': {
+        'headers': ['NOMENCLATURA', 'DESCRIPCION', 'CANTIDAD', 'UNIDAD', 'CLASIFICACION'],
+        'filas': _filas_items,
+        'clave': ['NOMENCLATURA', 'DESCRIPCION'],
+    },
+}
 
-        for p in procesos:
-            crono = p.get('cronograma', {}) or {}
-            writer.writerow([
-                p.get('nomenclatura'),
-                crono.get('convocatoria_inicio'),
-                crono.get('convocatoria_fin'),
-                crono.get('consultas_inicio'),
-                crono.get('consultas_fin'),
-                crono.get('buena_pro')
-            ])
-
-    print(f"[OK] {cronograma_file}")
-
-    # 3. POSTORES
-    postores_file = f"{output_prefix}_postores.csv"
-    with open(postores_file, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerow(['NOMENCLATURA', 'RUC', 'NOMBRE', 'ES_GANADOR'])
 
-        for p in procesos:
-            ganador_ruc = (p.get('ganador') or {}).get('ruc', '')
-            for postor in p.get('postores', []):
-                es_ganador = 'SI' if postor.get('ruc') == ganador_ruc else 'NO'
-                writer.writerow([
-                    p.get('nomenclatura'),
-                    postor.get('ruc'),
-                    postor.get('nombre'),
-                    es_ganador
-                ])
-
-    total_postores = sum(len(p.get('postores', [])) for p in procesos)
-    print(f"[OK] {postores_file} ({total_postores} filas)")
-
-    # 4. DOCUMENTOS
-    documentos_file = f"{output_prefix}_documentos.csv"
-    with open(documentos_file, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerow(['NOMENCLATURA', 'TITULO', 'TIPO', 'FORMATO', 'URL', 'FECHA'])
+# ============== MODO DELTA ==============
+
+SEP_CLAVE = '\x1f'
+
+
+def _hash_fila(fila: list) -> str:
+    """Hash del contenido de una fila"""
+    # json stdlib a proposito: el hash no debe depender del backend instalado
+    contenido = json.dumps(fila, ensure_ascii=False, default=str)
+    return hashlib.md5(contenido.encode('utf-8')).hexdigest()
+
+
+def _clave_fila(fila: list, indices: List[int], vistas: Dict[str, int]) -> str:
+    """Clave estable de una fila; las claves repetidas se numeran por orden de aparicion"""
+    clave = SEP_CLAVE.join('' if fila[i] is None else str(fila[i]) for i in indices)
+    n = vistas.get(clave, 0)
+    vistas[clave] = n + 1
+    return clave if n == 0 else f"{clave}{SEP_CLAVE}#{n}"
+
+
+def _exportar_delta(procesos: Iterable[Dict], output_prefix: Path) -> Dict:
+    """
+    Escribe solo las filas nuevas, modificadas y eliminadas de cada tabla
+
+    Recorre los procesos una sola vez con los cinco archivos delta abiertos.
+
+    Returns:
+        Manifiesto con conteos y archivos por tabla
+    """
+    hashes_file = Path(f"{output_prefix}_hashes.json")
+    manifest_file = Path(f"{output_prefix}_manifest.json")
+
+    previos = {}
+    if hashes_file.exists():
+        previos = json_backend.load(hashes_file)
+
+    estado = {}
+    with ExitStack() as stack:
+        for nombre, tabla in TABLAS.items():
+            headers = tabla['headers']
+            delta_file = f"{output_prefix}_{nombre}_delta.csv"
+            f = stack.enter_context(open(delta_file, 'w', newline='', encoding='utf-8-sig'))
+            writer = csv.writer(f)
+            writer.writerow(['CAMBIO'] + headers)
+            estado[nombre] = {
+                'archivo': delta_file,
+                'writer': writer,
+                'indices': [headers.index(c) for c in tabla['clave']],
+                'previo': previos.get(nombre, {}),
+                'actual': {},
+                'vistas': {},
+                'conteo': {'nuevos': 0, 'modificados': 0, 'eliminados': 0, 'sin_cambios': 0},
+            }
 
         for p in procesos:
-            for doc in p.get('documentos', []):
-                writer.writerow([
-                    p.get('nomenclatura'),
-                    doc.get('titulo'),
-                    doc.get('tipo'),
-                    doc.get('formato'),
-                    doc.get('url'),
-                    doc.get('fecha')
-                ])
-
-    total_docs = sum(len(p.get('documentos', [])) for p in procesos)
-    print(f"[OK] {documentos_file} ({total_docs} filas)")
-
-    # 5. ITEMS
-    items_file = f"{output_prefix}_items.csv"
-    with open(items_file, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerow(['NOMENCLATURA', 'DESCRIPCION', 'CANTIDAD', 'UNIDAD', 'CLASIFICACION'])
+            for nombre, tabla in TABLAS.items():
+                e = estado[nombre]
+                conteo = e['conteo']
+                for fila in tabla['filas'](p):
+                    clave = _clave_fila(fila, e['indices'], e['vistas'])
+                    h = _hash_fila(fila)
+                    e['actual'][clave] = h
+
+                    previo = e['previo'].get(clave)
+                    if previo is None:
+                        e['writer'].writerow(['NUEVO'] + fila)
+                        conteo['nuevos'] += 1
+                    elif previo != h:
+                        e['writer'].writerow(['MODIFICADO'] + fila)
+                        conteo['modificados'] += 1
+                    else:
+                        conteo['sin_cambios'] += 1
+
+        # Filas eliminadas: solo se conocen las columnas clave
+        for nombre, tabla in TABLAS.items():
+            e = estado[nombre]
+            for clave in e['previo']:
+                if clave in e['actual']:
+                    continue
+                fila = [''] * len(tabla['headers'])
+                for i, valor in zip(e['indices'], clave.split(SEP_CLAVE)):
+                    fila[i] = valor
+                e['writer'].writerow(['ELIMINADO'] + fila)
+                e['conteo']['eliminados'] += 1
+
+    manifest = {
+        'fecha': datetime.now().isoformat(),
+        'base': str(hashes_file) if previos else None,
+        'tablas': {}
+    }
+    for nombre, e in estado.items():
+        conteo = e['conteo']
+        conteo['total'] = len(e['actual'])
+        manifest['tablas'][nombre] = {'archivo': e['archivo'], **conteo}
+        print(f"[DELTA] {e['archivo']} (+{conteo['nuevos']} ~{conteo['modificados']} -{conteo['eliminados']})")
+
+    json_backend.dump({nombre: e['actual'] for nombre, e in estado.items()}, hashes_file)
+    json_backend.dump(manifest, manifest_file, pretty=True)
+
+    print(f"[OK] {manifest_file}")
+    return manifest
+
+
+# ============== EXPORTACION ==============
+
+def export_to_sheets(json_file: str, output_prefix: str = None, delta: bool = False):
+    """
+    Exporta JSON/JSONL de procesos a CSVs para Google Sheets
+
+    Lee la entrada una sola vez y escribe las cinco tablas en la misma pasada.
+
+    Args:
+        json_file: Archivo JSON (lista) o JSONL (un proceso por linea)
+        output_prefix: Prefijo para archivos de salida
+        delta: Solo filas nuevas/modificadas/eliminadas respecto a la exportacion anterior
+    """
+    procesos = iterar_registros(json_file)
+
+    if output_prefix is None:
+        output_prefix = OUTPUT_DIR / "sheets"
+
+    output_prefix = Path(output_prefix)
+    output_prefix.parent.mkdir(parents=True, exist_ok=True)
+
+    if delta:
+        return _exportar_delta(procesos, output_prefix)
+
+    archivos = {nombre: f"{output_prefix}_{nombre}.csv" for nombre in TABLAS}
+    totales = {nombre: 0 for nombre in TABLAS}
+
+    with ExitStack() as stack:
+        writers = {}
+        for nombre, tabla in TABLAS.items():
+            f = stack.enter_context(open(archivos[nombre], 'w', newline='', encoding='utf-8-sig'))
+            writers[nombre] = csv.writer(f)
+            writers[nombre].writerow(tabla['headers'])
 
         for p in procesos:
-            for item in p.get('items', []):
-                writer.writerow([
-                    p.get('nomenclatura'),
-                    item.get('descripcion'),
-                    item.get('cantidad'),
-                    item.get('unidad'),
-                    item.get('clasificacion')
-                ])
-
-    total_items = sum(len(p.get('items', [])) for p in procesos)
-    print(f"[OK] {items_file} ({total_items} filas)")
+            for nombre, tabla in TABLAS.items():
+                filas = tabla['filas'](p)
+                writers[nombre].writerows(filas)
+                totales[nombre] += len(filas)
+
+    for nombre, archivo in archivos.items():
+        print(f"[OK] {archivo} ({totales[nombre]} filas)")
 
     print(f"\n{'='*50}")
     print("ARCHIVOS GENERADOS:")
-    print(f"  - {procesos_file}")
-    print(f"  - {cronograma_file}")
-    print(f"  - {postores_file}")
-    print(f"  - {documentos_file}")
-    print(f"  - {items_file}")
+    for archivo in archivos.values():
+        print(f"  - {archivo}")
     print("\nPuedes importar estos CSVs directamente a Google Sheets")
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Uso: python export_sheets.py <archivo.json> [prefijo_salida]")
+    args = [a for a in sys.argv[1:] if a != '--delta']
+    delta = '--delta' in sys.argv[1:]
+
+    if len(args) < 1:
+        print("Uso: python export_sheets.py <archivo.json|archivo.jsonl> [prefijo_salida] [--delta]")
         print("\nEjemplo:")
         print("  python export_sheets.py ../data/output/ocds_2024_ELSE.json")
+        print("  python export_sheets.py ../data/output/ocds_2024_ELSE.json --delta")
         return
 
-    json_file = sys.argv[1]
-    output_prefix = sys.argv[2] if len(sys.argv) > 2 else None
+    json_file = args[0]
+    output_prefix = args[1] if len(args) > 1 else None
 
-    export_to_sheets(json_file, output_prefix)
+    export_to_sheets(json_file, output_prefix, delta=delta)
 
 
 if __name__ == "__main__":
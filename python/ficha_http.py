@@ -0,0 +1,215 @@
+"""
+Descarga de fichas SEACE por HTTP, sin navegador
+
+La ficha de seleccion (fichaSeleccion.xhtml) es una vista JSF/PrimeFaces que
+el servidor entrega ya renderizada: basta un GET con la sesion de requests
+para obtener los mismos paneles que ve Selenium. Las acciones de la ficha
+("Ver Ofertas Presentadas") son postbacks JSF: se reconstruye el formulario
+(inputs + javax.faces.ViewState) y se envia como request parcial de
+PrimeFaces (Faces-Request: partial/ajax) o como POST normal, segun el boton.
+
+El HTML resultante se pasa a los parsers _extraer_* de SeaceScraper. Si la
+pagina no trae los paneles (vista expirada, contenido generado por JS,
+error del servidor) se lanza FichaNoDisponible y el scraper usa Selenium.
+
+Uso:
+    http = FichaHTTP()
+    html = http.obtener_ficha(ficha_id)
+    html_ofertas = http.postback(html, "Ver Ofertas Presentadas")
+"""
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from config import SEACE_CONFIG
+
+VIEWSTATE = "javax.faces.ViewState"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "es-PE,es;q=0.9",
+}
+
+HEADERS_PARCIAL = {
+    "Faces-Request": "partial/ajax",
+    "X-Requested-With": "XMLHttpRequest",
+    "Accept": "application/xml, text/xml, */*; q=0.01",
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+}
+
+# Parametros de PrimeFaces.ab({s:'...', u:'...', p:'...'}) en el onclick
+_PF_PARAM = re.compile(r"""\b([spu])\s*:\s*['"]([^'"]*)['"]""")
+
+
+class FichaNoDisponible(Exception):
+    """La respuesta HTTP no trae la ficha renderizada (usar Selenium)"""
+
+
+def extraer_viewstate(html: str) -> Optional[str]:
+    """Valor de javax.faces.ViewState en una pagina JSF"""
+    m = re.search(
+        r'name="javax\.faces\.ViewState"[^>]*value="([^"]*)"|value="([^"]*)"[^>]*name="javax\.faces\.ViewState"',
+        html
+    )
+    if not m:
+        return None
+    return m.group(1) if m.group(1) is not None else m.group(2)
+
+
+def parsear_partial_response(xml: str) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Parsea un <partial-response> de JSF
+
+    Returns:
+        ({id: html} de cada <update>, url de <redirect> o None). El update
+        del ViewState queda en la clave javax.faces.ViewState.
+    """
+    try:
+        raiz = ET.fromstring(xml.encode("utf-8") if isinstance(xml, str) else xml)
+    except ET.ParseError as e:
+        raise FichaNoDisponible(f"Respuesta parcial invalida: {e}")
+    if raiz.tag != "partial-response":
+        raise FichaNoDisponible(f"Respuesta parcial inesperada: <{raiz.tag}>")
+
+    redirect = raiz.find("redirect")
+    if redirect is not None:
+        return {}, redirect.get("url")
+
+    error = raiz.find("error")
+    if error is not None:
+        mensaje = error.findtext("error-message") or error.findtext("error-name") or "error JSF"
+        raise FichaNoDisponible(mensaje.strip())
+
+    updates = {}
+    for update in raiz.iter("update"):
+        uid = update.get("id", "")
+        # Mojarra/MyFaces nombran el ViewState "<vista>:javax.faces.ViewState:0"
+        if VIEWSTATE in uid:
+            uid = VIEWSTATE
+        updates[uid] = update.text or ""
+    return updates, None
+
+
+def _datos_formulario(form) -> Dict[str, str]:
+    """Campos que el navegador enviaria al hacer submit del formulario"""
+    datos = {}
+    for campo in form.find_all(["input", "select", "textarea"]):
+        nombre = campo.get("name")
+        if not nombre:
+            continue
+        tipo = (campo.get("type") or "text").lower()
+        if tipo in ("submit", "button", "image", "reset", "file"):
+            continue
+        if tipo in ("checkbox", "radio") and not campo.has_attr("checked"):
+            continue
+        if campo.name == "select":
+            opcion = campo.find("option", selected=True) or campo.find("option")
+            datos[nombre] = opcion.get("value", opcion.get_text()) if opcion else ""
+        elif campo.name == "textarea":
+            datos[nombre] = campo.get_text()
+        else:
+            datos[nombre] = campo.get("value", "")
+    return datos
+
+
+class FichaHTTP:
+    """Cliente HTTP para fichas de seleccion (GET + postbacks JSF)"""
+
+    def __init__(self, session: requests.Session = None, timeout: float = None):
+        self.session = session or requests.Session()
+        self.session.headers.update(HEADERS)
+        self.timeout = timeout or SEACE_CONFIG["REQUEST_TIMEOUT"]
+        self.url_actual = None
+
+    def obtener_ficha(self, ficha_id: str) -> str:
+        """
+        HTML de la ficha de seleccion
+
+        Raises:
+            FichaNoDisponible: si la respuesta no trae los paneles de la ficha
+        """
+        url = f"{SEACE_CONFIG['FICHA_URL']}?id={ficha_id}&ptoRetorno=LOCAL"
+        response = self.session.get(url, timeout=self.timeout)
+        if response.status_code != 200:
+            raise FichaNoDisponible(f"HTTP {response.status_code}")
+
+        html = response.text
+        if "ui-panel-title" not in html:
+            raise FichaNoDisponible("La ficha no trae paneles renderizados")
+
+        self.url_actual = response.url
+        return html
+
+    def postback(self, html: str, texto_boton: str) -> Optional[str]:
+        """
+        Ejecuta la accion JSF de un boton de la pagina, como el click en el navegador
+
+        Args:
+            html: Pagina actual (con su formulario y ViewState)
+            texto_boton: Texto visible del boton o link (ej: "Ver Ofertas Presentadas")
+
+        Returns:
+            HTML resultante (pagina nueva, o los fragmentos actualizados si el
+            boton es AJAX), o None si la pagina no tiene ese boton
+        """
+        soup = BeautifulSoup(html, "lxml")
+        etiqueta = soup.find(string=lambda t: t and texto_boton in t)
+        if etiqueta is None:
+            return None
+        boton = etiqueta.find_parent(["button", "a"])
+        form = boton.find_parent("form") if boton else None
+        if boton is None or form is None or not boton.get("id"):
+            return None
+
+        datos = _datos_formulario(form)
+        if VIEWSTATE not in datos:
+            viewstate = extraer_viewstate(html)
+            if viewstate is None:
+                raise FichaNoDisponible("Pagina sin javax.faces.ViewState")
+            datos[VIEWSTATE] = viewstate
+
+        action = urljoin(self.url_actual or SEACE_CONFIG["FICHA_URL"], form.get("action") or "")
+        fuente = boton["id"]
+        onclick = boton.get("onclick", "")
+
+        if "PrimeFaces.ab" in onclick or "mojarra.ab" in onclick:
+            params = dict(_PF_PARAM.findall(onclick))
+            fuente = params.get("s", fuente)
+            datos.update({
+                "javax.faces.partial.ajax": "true",
+                "javax.faces.source": fuente,
+                "javax.faces.partial.execute": params.get("p", "@all"),
+                "javax.faces.partial.render": params.get("u", "@all"),
+                fuente: fuente,
+            })
+            return self._postback_parcial(action, datos)
+
+        # commandButton/commandLink sin AJAX: submit normal con el boton como parametro
+        datos[boton.get("name") or fuente] = boton.get("value") or fuente
+        response = self.session.post(action, data=datos, timeout=self.timeout)
+        if response.status_code != 200:
+            raise FichaNoDisponible(f"HTTP {response.status_code}")
+        self.url_actual = response.url
+        return response.text
+
+    def _postback_parcial(self, action: str, datos: Dict[str, str]) -> str:
+        """Request parcial de PrimeFaces; retorna el HTML de los <update>"""
+        response = self.session.post(action, data=datos, headers=HEADERS_PARCIAL, timeout=self.timeout)
+        if response.status_code != 200:
+            raise FichaNoDisponible(f"HTTP {response.status_code}")
+
+        updates, redirect = parsear_partial_response(response.content)
+        if redirect:
+            # La accion navego a otra vista (p.ej. la pagina de ofertas)
+            response = self.session.get(urljoin(action, redirect), timeout=self.timeout)
+            if response.status_code != 200:
+                raise FichaNoDisponible(f"HTTP {response.status_code}")
+            self.url_actual = response.url
+            return response.text
+
+        return "".join(html for uid, html in updates.items() if uid != VIEWSTATE)
@@ -6,28 +6,62 @@ Uso:
     python generar_indice.py --all              # TODOS los procesos 2021-2024
     python generar_indice.py --year 2023        # Todos los de 2023
     python generar_indice.py --else --all       # Solo ELSE 2021-2024
+    python generar_indice.py --all --stream     # Memoria acotada (runs en disco + merge)
+    python generar_indice.py --all --incremental  # Solo meses nuevos/cambiados + OCDS_INDEX_DELTA.csv
 
 El archivo se genera en data/output/OCDS_INDEX.csv
 Luego copia el contenido a la hoja OCDS_INDEX de tu Google Sheets
+
+En modo --incremental tambien se genera OCDS_INDEX_DELTA.csv con las filas
+insertadas o actualizadas desde la corrida anterior (mismas columnas), para
+pegar solo esas filas en lugar de las 124K.
 """
 import csv
-import json
+import heapq
+import os
+import sys
 import requests
+import tempfile
 import time
 import argparse
 from datetime import datetime
+from itertools import groupby
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+import json_backend
+import ocds_schema
+from cache_store import clave_mes, get_store, ttl
 
 # Rutas
 BASE_DIR = Path(__file__).parent.parent  # c:\PROGRAMACION\SEACE
 CACHE_DIR = BASE_DIR / "data" / "cache"
 OUTPUT_DIR = BASE_DIR / "data" / "output"
 OUTPUT_FILE = OUTPUT_DIR / "OCDS_INDEX.csv"
+DELTA_FILE = OUTPUT_DIR / "OCDS_INDEX_DELTA.csv"
+STATE_FILE = OUTPUT_DIR / "OCDS_INDEX_STATE.csv"   # Estado previo (run ordenado)
+STATE_META_FILE = OUTPUT_DIR / "OCDS_INDEX_STATE.json"  # Firmas de meses procesados
 
 # API Config
 BASE_URL = "https://contratacionesabiertas.oece.gob.pe/api/v1"
 RATE_LIMIT = 0.5  # segundos entre requests
 
+# Modo streaming
+MAX_FILAS_RUN = 50_000   # filas en memoria antes de volcar un run ordenado a disco
+MAX_RUNS_ABIERTOS = 64   # archivos abiertos a la vez durante el merge
+
+INDEX_HEADERS = ['NOMENCLATURA', 'TENDER_ID', 'OCID', 'ENTIDAD', 'DESCRIPCION', 'FECHA_ACTUALIZACION']
+RUN_FIELDS = [
+    'nomenclatura', 'tender_id', 'ocid', 'entidad', 'descripcion',
+    'year', 'month', 'prioridad', 'orden', 'fecha_actualizacion'
+]
+CAMPOS_CONTENIDO = ['tender_id', 'ocid', 'entidad', 'descripcion']
+
+# Prioridad en el merge para un mismo año y mes: datos frescos antes que el estado previo
+PRIORIDAD_NUEVO = 0
+PRIORIDAD_ESTADO = 1
+
 def get_available_months(year: int) -> list:
     """Obtiene los meses disponibles para un año"""
     url = f"{BASE_URL}/files?year={year}&source=seace_v3"
@@ -40,20 +74,20 @@ def get_available_months(year: int) -> list:
         print(f"  [WARN] Error obteniendo meses de {year}: {e}")
     return []
 
-def download_month(year: int, month: int, filter_text: str = None) -> list:
-    """Descarga todos los procesos de un mes"""
-    cache_file = CACHE_DIR / f"{year}-{month:02d}_seace_v3.json"
+def _month_cache_file(year: int, month: int) -> Path:
+    """Archivo de cache de un mes"""
+    return get_store().ruta("mes", clave_mes(year, month))
 
-    # Usar cache si existe
-    if cache_file.exists():
+def download_month(year: int, month: int, filter_text: str = None, refresh: bool = False) -> list:
+    """Descarga todos los procesos de un mes (refresh=True ignora el cache)"""
+    cache_file = _month_cache_file(year, month)
+
+    # Usar cache si existe y esta vigente
+    if not refresh and get_store().vigente("mes", clave_mes(year, month), ttl("mes")):
         print(f"  [CACHE] {year}-{month:02d}", end='', flush=True)
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        # Manejar ambos formatos de cache
-        if isinstance(data, dict) and 'records' in data:
-            records = data['records']
-        else:
-            records = data
+        get_store().tocar("mes", clave_mes(year, month))
+        # Ambos formatos de cache ({"records": [...]} o lista); solo campos usados
+        records = ocds_schema.cargar_records(cache_file)
         print(f" ({len(records):,} registros)")
     else:
         print(f"  [API] {year}-{month:02d}...", end='', flush=True)
@@ -84,9 +118,7 @@ def download_month(year: int, month: int, filter_text: str = None) -> list:
         print(f" TOTAL: {len(records)} records")
 
         # Guardar en cache
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(records, f)
+        get_store().guardar("mes", clave_mes(year, month), records)
 
     # Extraer datos relevantes
     procesos = []
@@ -117,12 +149,283 @@ def download_month(year: int, month: int, filter_text: str = None) -> list:
 
     return procesos
 
+def _fila_indice(p: dict, fecha_actual: str) -> list:
+    """Fila del CSV OCDS_INDEX para un proceso"""
+    return [
+        p['nomenclatura'],
+        p['tender_id'],
+        p['ocid'],
+        p['entidad'],
+        p['descripcion'][:200] if p['descripcion'] else '',  # Limitar descripción
+        fecha_actual
+    ]
+
+def _iterar_meses(years: list) -> Iterator[tuple]:
+    """Recorre (año, mes) disponibles en orden cronológico"""
+    for year in years:
+        print(f"\n[{year}] Obteniendo meses disponibles...")
+        months = get_available_months(year)
+
+        if not months:
+            print(f"  [WARN] No hay datos para {year}")
+            continue
+
+        print(f"  Meses disponibles: {months}")
+
+        for month in sorted(months):
+            yield year, month
+
+# ============== MODO STREAMING (memoria acotada) ==============
+
+def _clave_run(row: dict) -> tuple:
+    """
+    Orden de merge: nomenclatura, año más reciente primero, luego mes,
+    prioridad (fresco antes que estado previo) y orden de llegada
+    """
+    return (
+        row['nomenclatura'],
+        -int(row['year']),
+        int(row['month']),
+        int(row['prioridad']),
+        int(row['orden'])
+    )
+
+def _volcar_run(buffer: list, run_dir: Path, runs: list):
+    """Ordena el buffer y lo escribe en disco como un run"""
+    if not buffer:
+        return
+    buffer.sort(key=_clave_run)
+    run_path = run_dir / f"run_{len(runs):05d}.csv"
+    with open(run_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RUN_FIELDS)
+        writer.writerows(buffer)
+    runs.append(run_path)
+    buffer.clear()
+
+def _agregar_mes(procesos: list, year: int, month: int, orden: int,
+                 run_dir: Path, runs: list, max_filas: int) -> int:
+    """
+    Vuelca los procesos de un mes como uno o mas runs ordenados
+
+    Returns:
+        Siguiente valor del contador de orden
+    """
+    buffer = []
+    for p in procesos:
+        if not p['nomenclatura']:
+            continue
+        buffer.append({
+            'nomenclatura': p['nomenclatura'],
+            'tender_id': p['tender_id'],
+            'ocid': p['ocid'],
+            'entidad': p['entidad'],
+            'descripcion': p['descripcion'][:200] if p['descripcion'] else '',
+            'year': year,
+            'month': month,
+            'prioridad': PRIORIDAD_NUEVO,
+            'orden': orden,
+            'fecha_actualizacion': ''
+        })
+        orden += 1
+        if len(buffer) >= max_filas:
+            _volcar_run(buffer, run_dir, runs)
+
+    _volcar_run(buffer, run_dir, runs)
+    return orden
+
+def _leer_run(run_path: Path) -> Iterator[dict]:
+    """Lee un run ordenado fila por fila"""
+    with open(run_path, 'r', newline='', encoding='utf-8') as f:
+        yield from csv.DictReader(f, fieldnames=RUN_FIELDS)
+
+def _merge_runs(runs: List[Path]) -> Iterator[dict]:
+    """Merge k-way de runs ordenados"""
+    return heapq.merge(*[_leer_run(r) for r in runs], key=_clave_run)
+
+def _reducir_runs(runs: List[Path], run_dir: Path, max_abiertos: int = MAX_RUNS_ABIERTOS) -> List[Path]:
+    """Fusiona runs por lotes hasta que quepan en un solo merge"""
+    nivel = 0
+    while len(runs) > max_abiertos:
+        reducidos = []
+        for i in range(0, len(runs), max_abiertos):
+            lote = runs[i:i + max_abiertos]
+            destino = run_dir / f"merge_{nivel}_{len(reducidos):05d}.csv"
+            with open(destino, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=RUN_FIELDS)
+                writer.writerows(_merge_runs(lote))
+            for r in lote:
+                if r != STATE_FILE:
+                    r.unlink()
+            reducidos.append(destino)
+        runs = reducidos
+        nivel += 1
+    return runs
+
+def _dedupe_ordenado(filas: Iterator[dict]) -> Iterator[dict]:
+    """Se queda con la primera fila de cada nomenclatura (la más reciente)"""
+    for _, grupo in groupby(filas, key=lambda r: r['nomenclatura']):
+        yield next(grupo)
+
+def generar_indice_streaming(years: list, filter_text: str = None, max_filas: int = MAX_FILAS_RUN) -> int:
+    """
+    Genera OCDS_INDEX.csv con memoria acotada
+
+    Cada mes se vuelca a disco como runs ordenados de a lo sumo `max_filas`
+    filas; luego un merge k-way deduplica (mantiene el año más reciente)
+    mientras escribe el CSV final.
+
+    Returns:
+        Cantidad de registros escritos
+    """
+    fecha_actual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    orden = 0
+    total = 0
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='indice_runs_', dir=CACHE_DIR) as tmp:
+        run_dir = Path(tmp)
+        runs = []
+
+        for year, month in _iterar_meses(years):
+            procesos = download_month(year, month, filter_text)
+            print(f"    -> {len(procesos)} procesos{' (filtrados)' if filter_text else ''}")
+            orden = _agregar_mes(procesos, year, month, orden, run_dir, runs, max_filas)
+            del procesos
+
+        print(f"\n[MERGE] {len(runs)} runs ordenados")
+        runs = _reducir_runs(runs, run_dir)
+
+        with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(INDEX_HEADERS)
+            for row in _dedupe_ordenado(_merge_runs(runs)):
+                writer.writerow(_fila_indice(row, fecha_actual))
+                total += 1
+
+    return total
+
+# ============== MODO INCREMENTAL ==============
+
+def _firma_mes(year: int, month: int) -> Optional[str]:
+    """Firma del cache de un mes (tamaño + mtime), None si no existe"""
+    cache_file = _month_cache_file(year, month)
+    if not cache_file.exists():
+        return None
+    st = cache_file.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def _cargar_estado(filter_text: Optional[str]) -> dict:
+    """Carga las firmas de la corrida anterior (vacio si no aplica)"""
+    if not STATE_FILE.exists() or not STATE_META_FILE.exists():
+        return {}
+    meta = json_backend.load(STATE_META_FILE)
+    if meta.get('filtro') != filter_text:
+        print("  [WARN] El filtro cambio desde la ultima corrida: se regenera todo")
+        return {}
+    return meta.get('meses', {})
+
+def generar_indice_incremental(years: list, filter_text: str = None, max_filas: int = MAX_FILAS_RUN) -> Dict[str, int]:
+    """
+    Actualiza OCDS_INDEX.csv procesando solo meses nuevos o cambiados
+
+    El estado previo (OCDS_INDEX_STATE.csv) es un run ordenado que entra al
+    mismo merge k-way que los meses reprocesados. Un mes se reprocesa si su
+    cache no tiene la firma registrada; el mes mas reciente siempre se vuelve
+    a descargar. Las filas nuevas o con contenido distinto se escriben
+    tambien en OCDS_INDEX_DELTA.csv.
+
+    Returns:
+        Conteos: total, insertados, actualizados, meses_procesados
+    """
+    fecha_actual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    meses_previos = _cargar_estado(filter_text)
+    meses_nuevos = dict(meses_previos)
+    stats = {'total': 0, 'insertados': 0, 'actualizados': 0, 'meses_procesados': 0}
+    orden = 0
+
+    meses = list(_iterar_meses(years))
+    ultimo = max(meses) if meses else None
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='indice_runs_', dir=CACHE_DIR) as tmp:
+        run_dir = Path(tmp)
+        runs = []
+
+        for year, month in meses:
+            periodo = f"{year}-{month:02d}"
+            refresh = (year, month) == ultimo
+            if not refresh and meses_previos and _firma_mes(year, month) == meses_previos.get(periodo):
+                print(f"  [SIN CAMBIOS] {periodo}")
+                continue
+
+            procesos = download_month(year, month, filter_text, refresh=refresh)
+            print(f"    -> {len(procesos)} procesos{' (filtrados)' if filter_text else ''}")
+            orden = _agregar_mes(procesos, year, month, orden, run_dir, runs, max_filas)
+            meses_nuevos[periodo] = _firma_mes(year, month)
+            stats['meses_procesados'] += 1
+            del procesos
+
+        if meses_previos:
+            runs.append(STATE_FILE)
+
+        print(f"\n[MERGE] {len(runs)} runs ordenados")
+        runs = _reducir_runs(runs, run_dir)
+
+        state_tmp = STATE_FILE.with_suffix('.tmp')
+        with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8-sig') as f_full, \
+             open(DELTA_FILE, 'w', newline='', encoding='utf-8-sig') as f_delta, \
+             open(state_tmp, 'w', newline='', encoding='utf-8') as f_state:
+            full_writer = csv.writer(f_full)
+            delta_writer = csv.writer(f_delta)
+            state_writer = csv.DictWriter(f_state, fieldnames=RUN_FIELDS)
+            full_writer.writerow(INDEX_HEADERS)
+            delta_writer.writerow(INDEX_HEADERS)
+
+            for _, grupo in groupby(_merge_runs(runs), key=lambda r: r['nomenclatura']):
+                filas = list(grupo)
+                row = filas[0]
+                previo = next((r for r in filas if int(r['prioridad']) == PRIORIDAD_ESTADO), None)
+
+                cambio = True
+                if previo is None:
+                    stats['insertados'] += 1
+                elif any(row[c] != previo[c] for c in CAMPOS_CONTENIDO):
+                    stats['actualizados'] += 1
+                else:
+                    cambio = False
+
+                fecha = fecha_actual if cambio else (previo['fecha_actualizacion'] or fecha_actual)
+                fila = _fila_indice(row, fecha)
+                full_writer.writerow(fila)
+                if cambio:
+                    delta_writer.writerow(fila)
+
+                state_writer.writerow({
+                    **row,
+                    'prioridad': PRIORIDAD_ESTADO,
+                    'orden': 0,
+                    'fecha_actualizacion': fecha
+                })
+                stats['total'] += 1
+
+    os.replace(state_tmp, STATE_FILE)
+    json_backend.dump({
+        'filtro': filter_text,
+        'fecha': fecha_actual,
+        'meses': meses_nuevos
+    }, STATE_META_FILE, pretty=True)
+
+    return stats
+
 def main():
     parser = argparse.ArgumentParser(description='Generar indice OCDS')
     parser.add_argument('--all', action='store_true', help='Descargar todos los años (2021-2024)')
     parser.add_argument('--year', type=int, help='Año específico')
     parser.add_argument('--else', dest='else_mode', action='store_true', help='Solo ELSE')
     parser.add_argument('--filter', type=str, help='Filtro de texto')
+    parser.add_argument('--stream', action='store_true', help='Memoria acotada: runs ordenados en disco + merge k-way')
+    parser.add_argument('--incremental', action='store_true', help='Solo meses nuevos/cambiados; genera OCDS_INDEX_DELTA.csv')
+    parser.add_argument('--max-filas', type=int, default=MAX_FILAS_RUN, help='Filas en memoria por run (modos --stream/--incremental)')
     args = parser.parse_args()
 
     # Determinar años a procesar
@@ -145,55 +448,67 @@ def main():
     print(f"{'='*60}")
     print(f"Años: {years}")
     print(f"Filtro: {filter_text or 'NINGUNO (todos los procesos)'}")
+    if args.incremental:
+        modo = 'INCREMENTAL'
+    elif args.stream:
+        modo = 'STREAMING'
+    else:
+        modo = 'EN MEMORIA'
+    print(f"Modo: {modo}")
     print(f"{'='*60}\n")
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    all_procesos = []
-
-    for year in years:
-        print(f"\n[{year}] Obteniendo meses disponibles...")
-        months = get_available_months(year)
 
-        if not months:
-            print(f"  [WARN] No hay datos para {year}")
-            continue
-
-        print(f"  Meses disponibles: {months}")
+    stats = None
+    if args.incremental:
+        stats = generar_indice_incremental(years, filter_text, args.max_filas)
+        total = stats['total']
+    elif args.stream:
+        total = generar_indice_streaming(years, filter_text, args.max_filas)
+    else:
+        all_procesos = []
 
-        for month in sorted(months):
+        for year, month in _iterar_meses(years):
             procesos = download_month(year, month, filter_text)
             all_procesos.extend(procesos)
             print(f"    -> {len(procesos)} procesos{' (filtrados)' if filter_text else ''}")
 
-    # Eliminar duplicados por nomenclatura (mantener el más reciente)
-    seen = {}
-    for p in all_procesos:
-        key = p['nomenclatura']
-        if key and (key not in seen or p['year'] > seen[key]['year']):
-            seen[key] = p
+        # Eliminar duplicados por nomenclatura (mantener el más reciente)
+        seen = {}
+        for p in all_procesos:
+            key = p['nomenclatura']
+            if key and (key not in seen or p['year'] > seen[key]['year']):
+                seen[key] = p
 
-    unique_procesos = list(seen.values())
+        unique_procesos = list(seen.values())
 
-    # Generar CSV
-    fecha_actual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Generar CSV
+        fecha_actual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(INDEX_HEADERS)
 
-    with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        writer.writerow(['NOMENCLATURA', 'TENDER_ID', 'OCID', 'ENTIDAD', 'DESCRIPCION', 'FECHA_ACTUALIZACION'])
+            for p in sorted(unique_procesos, key=lambda x: x['nomenclatura']):
+                writer.writerow(_fila_indice(p, fecha_actual))
 
-        for p in sorted(unique_procesos, key=lambda x: x['nomenclatura']):
-            writer.writerow([
-                p['nomenclatura'],
-                p['tender_id'],
-                p['ocid'],
-                p['entidad'],
-                p['descripcion'][:200] if p['descripcion'] else '',  # Limitar descripción
-                fecha_actual
-            ])
+        total = len(unique_procesos)
 
     print(f"\n{'='*60}")
     print(f"ARCHIVO GENERADO: {OUTPUT_FILE}")
-    print(f"TOTAL REGISTROS: {len(unique_procesos)}")
+    print(f"TOTAL REGISTROS: {total}")
+    if stats is not None:
+        print(f"MESES PROCESADOS: {stats['meses_procesados']}")
+        print(f"DELTA: {DELTA_FILE}")
+        print(f"  Insertados: {stats['insertados']}")
+        print(f"  Actualizados: {stats['actualizados']}")
+        print(f"{'='*60}")
+        print("\nSIGUIENTES PASOS:")
+        print("1. Abre el archivo OCDS_INDEX_DELTA.csv")
+        print("2. Aplica esas filas a la hoja OCDS_INDEX por NOMENCLATURA")
+        print("   (actualiza las existentes y agrega las nuevas, como OCDS_INDEX._upsertRows)")
+        print(f"{'='*60}\n")
+        return
     print(f"{'='*60}")
     print("\nSIGUIENTES PASOS:")
     print("1. Abre el archivo OCDS_INDEX.csv")
@@ -0,0 +1,116 @@
+"""
+Capa unica de serializacion JSON para caches y salidas
+
+Usa orjson o msgspec si estan instalados y cae a json (stdlib) si no.
+La salida es compacta por defecto; la indentacion es opcional (pretty=True
+o SEACE_JSON_PRETTY=1).
+
+Seleccion del backend (SEACE_JSON_BACKEND):
+    auto    - orjson > msgspec > json (default)
+    orjson / msgspec / json - forzar uno en particular
+"""
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from config import JSON_CONFIG
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def backends_disponibles() -> list:
+    """Backends instalados, en orden de preferencia"""
+    disponibles = []
+    if orjson is not None:
+        disponibles.append("orjson")
+    if msgspec is not None:
+        disponibles.append("msgspec")
+    disponibles.append("json")
+    return disponibles
+
+
+def _resolver_backend(nombre: str) -> str:
+    if nombre == "auto":
+        return backends_disponibles()[0]
+    if nombre not in backends_disponibles():
+        raise ValueError(f"Backend JSON no disponible: {nombre} (instalados: {backends_disponibles()})")
+    return nombre
+
+
+BACKEND = _resolver_backend(JSON_CONFIG["BACKEND"])
+
+# Errores de decodificacion de cualquier backend
+DecodeError = (json.JSONDecodeError,) + ((msgspec.DecodeError,) if msgspec is not None else ())
+
+
+def set_backend(nombre: str) -> str:
+    """Cambia el backend en tiempo de ejecucion (benchmarks, pruebas)"""
+    global BACKEND
+    BACKEND = _resolver_backend(nombre)
+    return BACKEND
+
+
+def _pretty(pretty: Optional[bool]) -> bool:
+    return JSON_CONFIG["PRETTY"] if pretty is None else pretty
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decodifica JSON desde str o bytes"""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    if BACKEND == "msgspec":
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def dumpb(obj: Any, pretty: bool = None, default: Callable = None) -> bytes:
+    """
+    Serializa a bytes UTF-8
+
+    Args:
+        obj: Objeto a serializar
+        pretty: Indentar (None = segun JSON_CONFIG)
+        default: Conversor para tipos no JSON (ej: str para Timestamps)
+    """
+    pretty = _pretty(pretty)
+
+    if BACKEND == "orjson":
+        opts = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            opts |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=opts)
+
+    if BACKEND == "msgspec":
+        data = msgspec.json.encode(obj, enc_hook=default)
+        return msgspec.json.format(data, indent=2) if pretty else data
+
+    if pretty:
+        texto = json.dumps(obj, ensure_ascii=False, indent=2, default=default)
+    else:
+        texto = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default)
+    return texto.encode('utf-8')
+
+
+def dumps(obj: Any, pretty: bool = None, default: Callable = None) -> str:
+    """Serializa a str"""
+    return dumpb(obj, pretty=pretty, default=default).decode('utf-8')
+
+
+def load(path: Union[str, Path]) -> Any:
+    """Lee y decodifica un archivo JSON"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump(obj: Any, path: Union[str, Path], pretty: bool = None, default: Callable = None):
+    """Serializa y escribe un archivo JSON"""
+    with open(path, 'wb') as f:
+        f.write(dumpb(obj, pretty=pretty, default=default))
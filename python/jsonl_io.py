@@ -0,0 +1,319 @@
+"""
+Lectura y escritura de resultados en JSONL (un registro JSON por linea)
+
+A diferencia de un JSON con la lista completa, JSONL permite escribir cada
+registro apenas se produce, agregar (append) resultados entre corridas y
+leer el archivo de forma perezosa sin cargarlo completo en memoria.
+
+Journal es una bitacora append-only de resultados por clave: cada
+resultado se escribe (y se vuelca a disco) apenas termina, y una corrida
+interrumpida se reanuda saltando las claves ya completas.
+
+Uso:
+    with JsonlWriter("salida.jsonl", append=True) as w:
+        for proceso in procesos:
+            w.write(proceso)
+
+    for proceso in leer_jsonl("salida.jsonl"):
+        ...
+
+    journal = Journal("corrida.journal.jsonl").abrir(reanudar=True)
+    pendientes = [n for n in nomenclaturas if n not in journal.completas()]
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+import json_backend
+
+FORMATOS = ("json", "jsonl")
+
+
+def resolver_formato(formato: Optional[str], path: Union[str, Path] = None) -> str:
+    """
+    Formato de salida explicito o inferido por la extension
+
+    Args:
+        formato: "json", "jsonl" o None (inferir)
+        path: Archivo de salida (.jsonl => jsonl)
+    """
+    if formato:
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato no soportado: {formato} (usar {' o '.join(FORMATOS)})")
+        return formato
+    if path is not None and Path(path).suffix == '.jsonl':
+        return "jsonl"
+    return "json"
+
+
+def extension(formato: str) -> str:
+    """Extension de archivo para un formato"""
+    return ".jsonl" if formato == "jsonl" else ".json"
+
+
+class JsonlWriter:
+    """Escribe registros JSONL de a uno (usar como context manager)"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        append: bool = False,
+        default: Callable = None,
+        flush: bool = False
+    ):
+        """
+        Args:
+            path: Archivo de salida
+            append: Agregar al final en lugar de sobrescribir
+            default: Serializador para tipos no JSON (ej: str para Timestamps)
+            flush: Forzar escritura a disco despues de cada registro
+        """
+        self.path = Path(path)
+        self.append = append
+        self.default = default
+        self.flush = flush
+        self.count = 0
+        self._file = None
+
+    def open(self) -> "JsonlWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'ab' if self.append else 'wb')
+        return self
+
+    def write(self, registro: Any):
+        """Escribe un registro como una linea"""
+        self._file.write(json_backend.dumpb(registro, pretty=False, default=self.default))
+        self._file.write(b'\n')
+        if self.flush:
+            self._file.flush()
+        self.count += 1
+
+    def write_many(self, registros: Iterable[Any]) -> int:
+        """Escribe varios registros; retorna cuantos se escribieron"""
+        n = 0
+        for registro in registros:
+            self.write(registro)
+            n += 1
+        return n
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def leer_jsonl(path: Union[str, Path]) -> Iterator[Dict]:
+    """
+    Itera los registros de un JSONL de forma perezosa
+
+    Ignora lineas vacias y una ultima linea incompleta (corrida interrumpida
+    mientras escribia).
+    """
+    with open(path, 'rb') as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            try:
+                yield json_backend.loads(linea)
+            except json_backend.DecodeError:
+                if linea.endswith(b'\n'):
+                    raise
+                print(f"[WARN] Ultima linea incompleta en {path}, se ignora")
+
+
+def iterar_registros(path: Union[str, Path]) -> Iterator[Any]:
+    """Itera registros de un JSONL (perezoso) o de un JSON con una lista"""
+    path = Path(path)
+    if path.suffix == '.jsonl':
+        yield from leer_jsonl(path)
+        return
+
+    data = json_backend.load(path)
+    if isinstance(data, list):
+        yield from data
+    else:
+        yield data
+
+
+class RegistrosJsonl:
+    """
+    Vista perezosa y re-iterable de un archivo JSONL
+
+    Se puede recorrer varias veces (cada recorrido relee el archivo), contar
+    con len() y evaluar como booleano, igual que una lista de resultados.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not self.path.exists():
+            return iter(())
+        return leer_jsonl(self.path)
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+        # Cada registro completo termina en salto de linea (ver JsonlWriter)
+        with open(self.path, 'rb') as f:
+            return sum(1 for linea in f if linea.strip() and linea.endswith(b'\n'))
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return f"RegistrosJsonl('{self.path}')"
+
+
+def guardar_registros(
+    registros: Iterable[Any],
+    path: Union[str, Path],
+    formato: str = None,
+    append: bool = False,
+    default: Callable = None
+) -> int:
+    """
+    Guarda registros como JSON (lista completa) o JSONL (streaming)
+
+    Args:
+        registros: Iterable de registros (en JSONL se consume de a uno)
+        path: Archivo de salida
+        formato: "json", "jsonl" o None (inferir por extension)
+        append: Solo JSONL - agregar al archivo existente
+        default: Serializador para tipos no JSON
+
+    Returns:
+        Cantidad de registros escritos
+    """
+    formato = resolver_formato(formato, path)
+
+    if formato == "jsonl":
+        with JsonlWriter(path, append=append, default=default) as writer:
+            return writer.write_many(registros)
+
+    if append:
+        raise ValueError("append solo esta disponible en formato jsonl")
+
+    registros = list(registros)
+    json_backend.dump(registros, path, default=default)
+    return len(registros)
+
+
+class Journal:
+    """
+    Bitacora JSONL append-only de resultados por clave, para reanudar corridas
+
+    Si una clave aparece varias veces (reintento de un fallo), vale la
+    ultima. El indice guarda solo el offset de cada registro en el archivo:
+    los registros se leen de a uno al combinar, sin cargar el journal.
+    """
+
+    # Bytes por lectura al buscar hacia atras el ultimo '\n'
+    BLOQUE_COLA = 64 * 1024
+
+    def __init__(self, path: Union[str, Path], campo: str = "nomenclatura", default: Callable = str):
+        """
+        Args:
+            path: Archivo del journal
+            campo: Campo de cada registro que lo identifica
+            default: Serializador para tipos no JSON
+        """
+        self.path = Path(path)
+        self.campo = campo
+        self.default = default
+        self._writer = None
+        self._lector = None
+        self._lock = threading.Lock()
+
+    def abrir(self, reanudar: bool = False) -> "Journal":
+        """
+        Abre el journal para escribir
+
+        Args:
+            reanudar: Conservar lo registrado; si no, se empieza vacio
+        """
+        if reanudar and self.path.exists():
+            self._descartar_linea_incompleta()
+        self._writer = JsonlWriter(self.path, append=reanudar, default=self.default, flush=True).open()
+        return self
+
+    def _descartar_linea_incompleta(self):
+        # Una corrida cortada a mitad de escritura deja una linea sin '\n':
+        # se trunca para que el siguiente registro no quede pegado a ella
+        # Solo se lee desde el final, de a BLOQUE_COLA bytes
+        with open(self.path, 'rb+') as f:
+            fin = f.seek(0, os.SEEK_END)
+            if fin == 0:
+                return
+            f.seek(fin - 1)
+            if f.read(1) == b'\n':
+                return
+            corte = 0
+            pos = fin
+            while pos > 0:
+                inicio = max(0, pos - self.BLOQUE_COLA)
+                f.seek(inicio)
+                bloque = f.read(pos - inicio)
+                i = bloque.rfind(b'\n')
+                if i >= 0:
+                    corte = inicio + i + 1
+                    break
+                pos = inicio
+            f.truncate(corte)
+            print(f"[WARN] Ultima linea incompleta en {self.path}, se descarta")
+
+    def registrar(self, registro: Dict):
+        """Agrega un resultado (seguro entre hilos)"""
+        with self._lock:
+            self._writer.write(registro)
+
+    def indexar(self) -> Dict[Any, Tuple[int, bool]]:
+        """
+        Recorre el journal una vez
+
+        Returns:
+            {clave: (offset, success)} del ultimo registro de cada clave
+        """
+        indice = {}
+        if not self.path.exists():
+            return indice
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for linea in f:
+                if linea.endswith(b'\n') and linea.strip():
+                    registro = json_backend.loads(linea)
+                    indice[registro.get(self.campo)] = (offset, bool(registro.get("success")))
+                offset += len(linea)
+        return indice
+
+    def completas(self) -> Set[Any]:
+        """Claves cuyo ultimo resultado fue exitoso (no se repiten al reanudar)"""
+        return {clave for clave, (_, ok) in self.indexar().items() if ok}
+
+    def leer(self, offset: int) -> Dict:
+        """Registro en un offset de indexar()"""
+        if self._lector is None:
+            self._lector = open(self.path, 'rb')
+        self._lector.seek(offset)
+        return json_backend.loads(self._lector.readline())
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._lector:
+            self._lector.close()
+            self._lector = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -3,14 +3,19 @@ SEACE Intelligence - Script Principal
 Procesa Excel de SEACE y enriquece con datos de fichas
 """
 import argparse
-import json
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 from tqdm import tqdm
 
 from excel_processor import ExcelProcessor
 from seace_scraper import scrape_proceso, SeaceScraper
+from scraper_pool import PoolScrapers
+from planificador import planificar
 from config import INPUT_DIR, OUTPUT_DIR
+import json_backend
+from jsonl_io import Journal, JsonlWriter, RegistrosJsonl, extension, resolver_formato
 
 
 def procesar_excel_completo(
@@ -18,7 +23,13 @@ def procesar_excel_completo(
     output_path: str = None,
     scrape: bool = True,
     max_procesos: int = None,
-    use_cache: bool = True
+    use_cache: bool = True,
+    formato: str = None,
+    append: bool = False,
+    workers: int = 1,
+    resume: bool = False,
+    journal_path: str = None,
+    ocds_primero: bool = True
 ):
     """
     Procesa un archivo Excel de SEACE y opcionalmente enriquece con scraping
@@ -29,15 +40,31 @@ def procesar_excel_completo(
         scrape: Si hacer scraping de fichas
         max_procesos: Maximo de procesos a scrapear (None = todos)
         use_cache: Si usar cache de scraping
+        formato: "json" o "jsonl" (None = inferir por extension de output_path)
+        append: Solo jsonl - agregar al archivo existente
+        workers: Navegadores en paralelo para el scraping (ver scraper_pool.py)
+        resume: Reanudar desde el journal, sin repetir los procesos ya exitosos
+        journal_path: Journal de resultados (default: OUTPUT_DIR/journal_<excel>.jsonl)
+        ocds_primero: Resolver primero con los meses OCDS en cache y scrapear
+            solo el resto (ver planificador.py)
+
+    Returns:
+        Lista de resultados; en formato jsonl cada resultado se escribe al
+        combinarse y se retorna una vista perezosa del archivo (RegistrosJsonl)
     """
+    formato = resolver_formato(formato, output_path)
+    if append and formato != "jsonl":
+        raise ValueError("append solo esta disponible en formato jsonl")
+
     print("=" * 60)
     print("SEACE Intelligence - Procesador")
     print("=" * 60)
 
-    # 1. Procesar Excel
+    # 1. Procesar Excel por bloques: en memoria solo el indice (nomenclatura,
+    # fechas, columnas del resumen); las filas completas se releen al combinar
     print(f"\n[1] Cargando: {excel_path}")
     processor = ExcelProcessor()
-    df = processor.cargar_excel(excel_path)
+    df = processor.cargar_indice(excel_path)
 
     print(f"    {len(df)} procesos cargados")
     print(f"\n    Resumen:")
@@ -57,76 +84,119 @@ def procesar_excel_completo(
 
     print(f"\n[2] {len(nomenclaturas)} procesos para procesar")
 
-    # 3. Scraping (si esta habilitado)
-    datos_enriquecidos = []
+    # 3. Scraping (si esta habilitado); cada resultado va al journal al terminar
+    journal = None
+    indice_fichas = {}
 
     if scrape:
-        print(f"\n[3] Iniciando scraping de fichas...")
-
-        with SeaceScraper(use_cache=use_cache, headless=True) as scraper:
-            for nom in tqdm(nomenclaturas, desc="Scrapeando"):
-                try:
-                    # Buscar ficha
-                    ficha_id = scraper.buscar_proceso(nom)
-
-                    if ficha_id:
-                        datos = scraper.extraer_ficha(ficha_id, nom)
-                        datos["success"] = datos.get("error") is None
-                    else:
-                        datos = {
-                            "nomenclatura": nom,
-                            "error": "No encontrado",
-                            "success": False
-                        }
-
-                    datos_enriquecidos.append(datos)
-
-                except Exception as e:
-                    datos_enriquecidos.append({
-                        "nomenclatura": nom,
-                        "error": str(e),
-                        "success": False
-                    })
-
-    # 4. Combinar datos
+        if journal_path is None:
+            journal_path = OUTPUT_DIR / f"journal_{Path(excel_path).stem}.jsonl"
+        journal = Journal(journal_path).abrir(reanudar=resume)
+
+        fuentes = {"journal": 0, "ocds": 0, "scraper": 0, "ocds_respaldo": 0}
+        pendientes = nomenclaturas
+        if resume:
+            completas = journal.completas()
+            pendientes = [n for n in nomenclaturas if n not in completas]
+            fuentes["journal"] = len(nomenclaturas) - len(pendientes)
+            print(f"\n    Reanudando: {fuentes['journal']} ya completos en {journal.path}")
+
+        respaldo = {}
+        if ocds_primero and pendientes:
+            print(f"\n[3a] Resolviendo {len(pendientes)} procesos con OCDS local...")
+            plan = planificar(pendientes, df)
+            print(f"    {plan.resumen()}")
+            for registro in plan.ocds.values():
+                journal.registrar(registro)
+            fuentes["ocds"] = len(plan.ocds)
+            pendientes, respaldo = plan.scraper, plan.respaldo
+
+        print(f"\n[3] Iniciando scraping de fichas ({len(pendientes)} procesos, {workers} workers)...")
+
+        lock_fuentes = threading.Lock()
+
+        def registrar(datos):
+            # Lo llaman los hilos del pool: los contadores van bajo lock
+            # En curso segun OCDS pero el scraper fallo: queda el registro OCDS
+            if not datos.get("success") and datos.get("nomenclatura") in respaldo:
+                datos = respaldo[datos["nomenclatura"]]
+                fuente = "ocds_respaldo"
+            else:
+                fuente = "scraper"
+            with lock_fuentes:
+                fuentes[fuente] += 1
+            journal.registrar(datos)
+            barra.update(1)
+
+        # Cada worker tiene su propio Chrome; un proceso que falla no detiene al resto
+        pool = PoolScrapers(workers, use_cache=use_cache, headless=True)
+        try:
+            if pendientes:
+                with tqdm(total=len(pendientes), desc="Scrapeando") as barra:
+                    pool.scrape(pendientes, progreso=registrar)
+        finally:
+            journal.close()  # Lo registrado queda en disco aunque la corrida se corte
+
+        # Solo offsets en memoria: cada ficha se lee del journal al combinar
+        alcance = set(nomenclaturas)
+        indice_fichas = {k: v for k, v in journal.indexar().items() if k in alcance}
+
+    # 4. Combinar datos (en jsonl se escribe cada resultado al combinarlo)
     print("\n[4] Combinando datos...")
 
-    resultados = []
-    for _, row in df.iterrows():
-        nom = row.get('nomenclatura')
-
-        # Datos base del Excel
-        resultado = row.to_dict()
+    if output_path is None:
+        output_path = OUTPUT_DIR / f"seace_completo_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension(formato)}"
+    else:
+        output_path = Path(output_path)
 
-        # Agregar datos scrapeados si existen
-        if scrape:
-            datos_ficha = next(
-                (d for d in datos_enriquecidos if d.get('nomenclatura') == nom),
-                None
-            )
-            if datos_ficha:
-                resultado['ficha'] = datos_ficha
+    writer = JsonlWriter(output_path, append=append, default=str).open() if formato == "jsonl" else None
 
-        resultados.append(resultado)
+    # Join por nomenclatura contra el indice del journal; el Excel se vuelve a
+    # leer por bloques, con to_dict('records') en vez de una Series por fila
+    inicio = time.perf_counter()
+    resultados = []
+    try:
+        for bloque in processor.iterar_bloques(excel_path):
+            for resultado in bloque.to_dict(orient='records'):
+                # Agregar datos scrapeados si existen
+                ficha = indice_fichas.get(resultado.get('nomenclatura'))
+                if ficha:
+                    resultado['ficha'] = journal.leer(ficha[0])
+
+                if writer:
+                    writer.write(resultado)
+                else:
+                    resultados.append(resultado)
+    finally:
+        if writer:
+            writer.close()
+        if journal:
+            journal.close()
+
+    duracion = time.perf_counter() - inicio
+    print(f"    {len(df)} filas combinadas en {duracion:.2f}s ({len(df) / max(duracion, 1e-9):,.0f} filas/s)")
 
     # 5. Guardar resultados
-    if output_path is None:
-        output_path = OUTPUT_DIR / f"seace_completo_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    if writer:
+        resultados = RegistrosJsonl(output_path)
     else:
-        output_path = Path(output_path)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(resultados, f, ensure_ascii=False, indent=2, default=str)
+        json_backend.dump(resultados, output_path, default=str)
 
     print(f"\n[OK] Resultados guardados en: {output_path}")
 
     # 6. Estadisticas finales
     if scrape:
-        exitosos = sum(1 for d in datos_enriquecidos if d.get('success'))
-        fallidos = len(datos_enriquecidos) - exitosos
+        exitosos = sum(1 for _, ok in indice_fichas.values() if ok)
+        fallidos = len(indice_fichas) - exitosos
         print(f"\n    Estadisticas de scraping:")
         print(f"    - Exitosos: {exitosos}")
         print(f"    - Fallidos: {fallidos}")
+        print(f"\n    Procesos por fuente:")
+        print(f"    - Journal (corrida anterior): {fuentes['journal']}")
+        print(f"    - OCDS local: {fuentes['ocds']}")
+        print(f"    - Scraper: {fuentes['scraper']}")
+        if fuentes["ocds_respaldo"]:
+            print(f"    - OCDS local (scraper fallo): {fuentes['ocds_respaldo']}")
 
     return resultados
 
@@ -141,7 +211,7 @@ def main():
 
     parser.add_argument(
         '-o', '--output',
-        help='Ruta para guardar resultados JSON',
+        help='Ruta para guardar resultados JSON/JSONL',
         default=None
     )
 
@@ -164,6 +234,44 @@ def main():
         help='No usar cache de scraping'
     )
 
+    parser.add_argument(
+        '--formato',
+        choices=['json', 'jsonl'],
+        help='Formato de salida (default: segun extension de --output, json)',
+        default=None
+    )
+
+    parser.add_argument(
+        '--append',
+        action='store_true',
+        help='Agregar resultados al archivo existente (solo jsonl)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Navegadores en paralelo para el scraping (default: 1)',
+        default=1
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Reanudar una corrida interrumpida desde su journal'
+    )
+
+    parser.add_argument(
+        '--journal',
+        help='Journal JSONL de resultados (default: data/output/journal_<excel>.jsonl)',
+        default=None
+    )
+
+    parser.add_argument(
+        '--no-ocds',
+        action='store_true',
+        help='Scrapear todo, sin resolver primero con los meses OCDS en cache'
+    )
+
     args = parser.parse_args()
 
     procesar_excel_completo(
@@ -171,7 +279,13 @@ def main():
         output_path=args.output,
         scrape=not args.no_scrape,
         max_procesos=args.max,
-        use_cache=not args.no_cache
+        use_cache=not args.no_cache,
+        formato=args.formato,
+        append=args.append,
+        workers=args.workers,
+        resume=args.resume,
+        journal_path=args.journal,
+        ocds_primero=not args.no_ocds
     )
 
 
@@ -0,0 +1,228 @@
+"""
+Mapa persistente nomenclatura -> ficha (UUID de fichaSeleccion.xhtml)
+
+El UUID de una ficha no cambia, pero encontrarlo cuesta la busqueda completa
+en el buscador publico (cargar, expandir Busqueda Avanzada, escribir,
+buscar, esperar). SeaceScraper.buscar_proceso guarda aqui cada UUID
+encontrado y scrape() lo consulta antes de buscar: los procesos ya vistos
+van directo a extraer_ficha.
+
+El mapa vive en CACHE_DIR/fichas.sqlite, fuera del indice del cache: no
+tiene TTL ni entra en los presupuestos LRU de cache_store.
+
+Tambien se puede poblar con la salida de find-uuid.cjs / find-ficha.cjs
+(lineas "tender.title:", "Encontrado posible match:", URLs
+fichaSeleccion.xhtml?id=<uuid> y la lista "UUIDs encontrados").
+
+Uso:
+    python mapa_fichas.py stats
+    python mapa_fichas.py importar salida_find_uuid.txt
+    node ../find-ficha.cjs | python mapa_fichas.py importar -
+    python mapa_fichas.py agregar AS-SM-35-2024-ELSE-1 <uuid>
+    python mapa_fichas.py olvidar AS-SM-35-2024-ELSE-1
+"""
+import argparse
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import CACHE_DIR
+
+DB_FILE = "fichas.sqlite"
+
+UUID = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE)
+_URL_FICHA = re.compile(r"fichaSeleccion\.xhtml\?(?:[^\s\"']*&)?id=(" + UUID.pattern[2:-2] + r")", re.IGNORECASE)
+_TITULO = re.compile(r"(?:tender\.title:|Encontrado posible match:)\s*(.+)$")
+
+
+def normalizar_nomenclatura(nomenclatura: str) -> str:
+    """Clave del mapa: mayusculas y espacios simples"""
+    return re.sub(r"\s+", " ", nomenclatura.strip()).upper()
+
+
+def pares_de_salida(lineas: Iterable[str]) -> Dict[str, str]:
+    """
+    Pares nomenclatura -> UUID en la salida de find-uuid.cjs / find-ficha.cjs
+
+    Cada titulo de tender (la nomenclatura en SEACE v3) se asocia con la
+    URL de ficha que le siga; a falta de URL, con el primer UUID de la
+    seccion "UUIDs encontrados" del mismo release.
+    """
+    pares = {}
+    titulo = None
+    en_uuids = False
+    candidato = None
+
+    def cerrar():
+        if titulo and candidato and titulo not in pares:
+            pares[titulo] = candidato
+
+    for linea in lineas:
+        linea = linea.rstrip("\n")
+        m = _TITULO.search(linea)
+        if m:
+            cerrar()
+            titulo = normalizar_nomenclatura(m.group(1))
+            candidato = None
+            en_uuids = False
+            continue
+
+        if linea.startswith("==="):
+            en_uuids = "UUIDs encontrados" in linea
+            continue
+
+        m = _URL_FICHA.search(linea)
+        if m and titulo:
+            candidato = m.group(1).lower()
+            pares[titulo] = candidato  # La URL de ficha tiene prioridad
+            continue
+
+        if en_uuids and candidato is None:
+            m = UUID.search(linea)
+            if m:
+                candidato = m.group(0).lower()
+
+    cerrar()
+    return pares
+
+
+class MapaFichas:
+    """nomenclatura -> UUID de ficha en SQLite (seguro entre hilos)"""
+
+    def __init__(self, path: Union[str, Path] = None):
+        self.path = Path(path or CACHE_DIR / DB_FILE)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS fichas (
+                nomenclatura TEXT PRIMARY KEY,
+                ficha_id TEXT NOT NULL,
+                fuente TEXT NOT NULL,
+                actualizado REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, nomenclatura: str) -> Optional[str]:
+        """UUID de la ficha o None si nunca se encontro"""
+        with self._lock:
+            fila = self._db.execute(
+                "SELECT ficha_id FROM fichas WHERE nomenclatura = ?",
+                (normalizar_nomenclatura(nomenclatura),)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def guardar(self, nomenclatura: str, ficha_id: str, fuente: str = "busqueda"):
+        """
+        Registra (o actualiza) el UUID de una nomenclatura
+
+        Args:
+            fuente: Origen del dato (busqueda, importado, manual)
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fichas (nomenclatura, ficha_id, fuente, actualizado) VALUES (?, ?, ?, ?)",
+                (normalizar_nomenclatura(nomenclatura), ficha_id, fuente, time.time())
+            )
+            self._db.commit()
+
+    def olvidar(self, nomenclatura: str) -> bool:
+        """Borra la entrada (p.ej. si el UUID ya no abre la ficha)"""
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM fichas WHERE nomenclatura = ?", (normalizar_nomenclatura(nomenclatura),)
+            )
+            self._db.commit()
+        return cur.rowcount > 0
+
+    def importar(self, lineas: Iterable[str], fuente: str = "importado") -> Dict[str, int]:
+        """
+        Importa la salida de find-uuid.cjs / find-ficha.cjs
+
+        Returns:
+            Dict con encontrados, nuevos y actualizados
+        """
+        pares = pares_de_salida(lineas)
+        r = {"encontrados": len(pares), "nuevos": 0, "actualizados": 0}
+        for nomenclatura, ficha_id in pares.items():
+            actual = self.get(nomenclatura)
+            if actual == ficha_id:
+                continue
+            r["nuevos" if actual is None else "actualizados"] += 1
+            self.guardar(nomenclatura, ficha_id, fuente)
+        return r
+
+    def stats(self) -> Dict[str, int]:
+        """Cantidad de entradas por fuente"""
+        with self._lock:
+            filas = self._db.execute(
+                "SELECT fuente, COUNT(*) FROM fichas GROUP BY fuente ORDER BY fuente"
+            ).fetchall()
+        return dict(filas)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_MAPAS: Dict[Path, MapaFichas] = {}
+_MAPAS_LOCK = threading.Lock()
+
+
+def get_mapa(path: Union[str, Path] = None) -> MapaFichas:
+    """MapaFichas compartido por archivo (uno por proceso)"""
+    path = Path(path or CACHE_DIR / DB_FILE).resolve()
+    with _MAPAS_LOCK:
+        if path not in _MAPAS:
+            _MAPAS[path] = MapaFichas(path)
+        return _MAPAS[path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mapa nomenclatura -> UUID de ficha SEACE")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("stats", help="Entradas por fuente")
+    p_imp = sub.add_parser("importar", help="Importar salida de find-uuid.cjs / find-ficha.cjs")
+    p_imp.add_argument("archivo", help="Archivo de texto ('-' para stdin)")
+    p_add = sub.add_parser("agregar", help="Registrar un UUID a mano")
+    p_add.add_argument("nomenclatura")
+    p_add.add_argument("ficha_id")
+    p_del = sub.add_parser("olvidar", help="Borrar una nomenclatura")
+    p_del.add_argument("nomenclatura")
+    args = parser.parse_args()
+
+    mapa = get_mapa()
+
+    if args.comando == "importar":
+        if args.archivo == "-":
+            r = mapa.importar(sys.stdin)
+        else:
+            with open(args.archivo, encoding="utf-8") as f:
+                r = mapa.importar(f)
+        print(f"[OK] {r['encontrados']} pares ({r['nuevos']} nuevos, {r['actualizados']} actualizados)")
+    elif args.comando == "agregar":
+        if not UUID.fullmatch(args.ficha_id):
+            parser.error(f"UUID invalido: {args.ficha_id}")
+        mapa.guardar(args.nomenclatura, args.ficha_id.lower(), "manual")
+        print(f"[OK] {normalizar_nomenclatura(args.nomenclatura)} -> {args.ficha_id.lower()}")
+    elif args.comando == "olvidar":
+        print("[OK] Borrada" if mapa.olvidar(args.nomenclatura) else "[INFO] No estaba en el mapa")
+
+    print("=" * 60)
+    print(f"MAPA DE FICHAS - {mapa.path}")
+    print("=" * 60)
+    stats = mapa.stats()
+    for fuente, n in stats.items():
+        print(f"  {fuente:<12} {n:>8}")
+    print(f"  {'total':<12} {sum(stats.values()):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,26 @@ URL: https://contratacionesabiertas.oece.gob.pe
 ELSE SI ESTA en esta API!
 """
 import requests
-import json
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterable
 from urllib.parse import quote
 
-from config import OUTPUT_DIR, CACHE_DIR
+from config import OUTPUT_DIR
+from cache_store import get_store, get_vuelos, ttl_clave
+from jsonl_io import extension, guardar_registros, resolver_formato
 
 
 class OCDSClient:
     """Cliente para la API OCDS de Peru"""
 
     BASE_URL = "https://contratacionesabiertas.oece.gob.pe/api/v1"
+    CACHE_TIPO = "ocds_api"
 
     def __init__(self, use_cache: bool = True):
         self.use_cache = use_cache
+        self.cache = get_store()
+        self.vuelos = get_vuelos(self.CACHE_TIPO)
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -29,31 +33,34 @@ class OCDSClient:
 
     def _get_cache_path(self, key: str) -> Path:
         """Genera path de cache"""
-        safe_key = key.replace("/", "-").replace(":", "-")
-        return CACHE_DIR / f"ocds_{safe_key}.json"
+        return self.cache.ruta(self.CACHE_TIPO, key)
 
     def _load_cache(self, key: str) -> Optional[Dict]:
         """Carga desde cache"""
         if not self.use_cache:
             return None
-        cache_path = self._get_cache_path(key)
-        if cache_path.exists():
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Cache valido por 1 hora
-                cache_time = datetime.fromisoformat(data.get('_cache_time', '2000-01-01'))
-                if (datetime.now() - cache_time).total_seconds() < 3600:
-                    return data
-        return None
+        # Vigencia por endpoint (CACHE_CONFIG["TTL_SEGUNDOS"]), verificada con stat
+        return self.cache.leer(self.CACHE_TIPO, key, ttl=ttl_clave(key))
 
     def _save_cache(self, key: str, data: Dict):
         """Guarda en cache"""
         if not self.use_cache:
             return
-        data['_cache_time'] = datetime.now().isoformat()
-        cache_path = self._get_cache_path(key)
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self.cache.guardar(self.CACHE_TIPO, key, data)
+        self.cache.borrar_negativo(self.CACHE_TIPO, key)
+
+    def _es_negativo(self, key: str) -> bool:
+        """True si la API ya confirmo hace poco que la clave no existe"""
+        return self.use_cache and self.cache.es_negativo(self.CACHE_TIPO, key)
+
+    def _save_negativo(self, key: str):
+        """Cachea un "no encontrado" confirmado (no se usa para errores de red/servidor)"""
+        if self.use_cache:
+            self.cache.guardar_negativo(self.CACHE_TIPO, key)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Aciertos/fallos de la memoria LRU y consultas coalescidas (compartidos entre instancias)"""
+        return {**self.cache.memo_stats()[self.CACHE_TIPO], **self.vuelos.stats()}
 
     def buscar_por_nomenclatura(self, nomenclatura: str) -> Optional[Dict]:
         """
@@ -61,11 +68,18 @@ class OCDSClient:
 
         La nomenclatura esta en tender.title en la API OCDS
         """
+        # Llamadas concurrentes con la misma clave comparten una sola consulta
+        return self.vuelos.hacer(f"nom_{nomenclatura}", lambda: self._buscar_por_nomenclatura(nomenclatura))
+
+    def _buscar_por_nomenclatura(self, nomenclatura: str) -> Optional[Dict]:
         # Verificar cache
         cached = self._load_cache(f"nom_{nomenclatura}")
         if cached:
             print(f"[CACHE] {nomenclatura}")
             return cached
+        if self._es_negativo(f"nom_{nomenclatura}"):
+            print(f"[NO ENCONTRADO] {nomenclatura} (cache)")
+            return None
 
         # Buscar en API
         url = f"{self.BASE_URL}/records"
@@ -77,6 +91,10 @@ class OCDSClient:
 
         try:
             response = self.session.get(url, params=params, timeout=30)
+            if response.status_code == 404:
+                self._save_negativo(f"nom_{nomenclatura}")
+                print(f"[NO ENCONTRADO] {nomenclatura}")
+                return None
             response.raise_for_status()
             data = response.json()
 
@@ -98,6 +116,8 @@ class OCDSClient:
                 print(f"[OK] {nomenclatura} (aproximado)")
                 return resultado
 
+            # Respuesta valida sin resultados: ausente (no es un error transitorio)
+            self._save_negativo(f"nom_{nomenclatura}")
             print(f"[NO ENCONTRADO] {nomenclatura}")
             return None
 
@@ -110,15 +130,26 @@ class OCDSClient:
         Busca un proceso por su OCID
         Ej: ocds-dgv273-seacev3-2024-2407-110
         """
+        # Llamadas concurrentes con la misma clave comparten una sola consulta
+        return self.vuelos.hacer(f"ocid_{ocid}", lambda: self._buscar_por_ocid(ocid))
+
+    def _buscar_por_ocid(self, ocid: str) -> Optional[Dict]:
         cached = self._load_cache(f"ocid_{ocid}")
         if cached:
             print(f"[CACHE] {ocid}")
             return cached
+        if self._es_negativo(f"ocid_{ocid}"):
+            print(f"[NO ENCONTRADO] {ocid} (cache)")
+            return None
 
         url = f"{self.BASE_URL}/record/{ocid}"
 
         try:
             response = self.session.get(url, timeout=30)
+            if response.status_code == 404:
+                self._save_negativo(f"ocid_{ocid}")
+                print(f"[NO ENCONTRADO] {ocid}")
+                return None
             response.raise_for_status()
             data = response.json()
 
@@ -129,6 +160,8 @@ class OCDSClient:
                 print(f"[OK] {ocid}")
                 return resultado
 
+            self._save_negativo(f"ocid_{ocid}")
+            print(f"[NO ENCONTRADO] {ocid}")
             return None
 
         except Exception as e:
@@ -315,14 +348,27 @@ def obtener_procesos_else(anio: int = None, limite: int = 100) -> List[Dict]:
     return client.buscar_por_entidad("ELECTRO SUR ESTE", anio=anio, limite=limite)
 
 
-def guardar_resultados(procesos: List[Dict], filename: str = None) -> str:
-    """Guarda resultados en JSON"""
+def guardar_resultados(
+    procesos: Iterable[Dict],
+    filename: str = None,
+    formato: str = None,
+    append: bool = False
+) -> str:
+    """
+    Guarda resultados en JSON o JSONL
+
+    Args:
+        procesos: Procesos a guardar (en jsonl se escriben de a uno, puede ser un generador)
+        filename: Nombre del archivo en OUTPUT_DIR
+        formato: "json" o "jsonl" (None = inferir por extension)
+        append: Solo jsonl - agregar al archivo existente
+    """
+    formato = resolver_formato(formato, filename)
     if filename is None:
-        filename = f"procesos_ocds_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"procesos_ocds_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension(formato)}"
 
     filepath = OUTPUT_DIR / filename
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(procesos, f, ensure_ascii=False, indent=2)
+    guardar_registros(procesos, filepath, formato=formato, append=append)
 
     print(f"[OK] Guardado en: {filepath}")
     return str(filepath)
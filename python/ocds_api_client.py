@@ -13,7 +13,6 @@ Endpoint NO funcional:
 Estrategia: Usar dataSegmentationID para paginar y filtrar por entidad/nomenclatura
 """
 import requests
-import json
 import time
 from datetime import datetime
 from pathlib import Path
@@ -22,6 +21,7 @@ from typing import Optional, Dict, List, Any
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 from config import OUTPUT_DIR, CACHE_DIR
+import json_backend
 
 
 class OCDSApiClient:
@@ -380,8 +380,7 @@ def main():
     if procesos:
         # Guardar resultados
         output = OUTPUT_DIR / "api_else_dic2024.json"
-        with open(output, 'w', encoding='utf-8') as f:
-            json.dump(procesos, f, ensure_ascii=False, indent=2)
+        json_backend.dump(procesos, output)
         print(f"    Guardado en: {output}")
 
 
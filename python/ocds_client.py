@@ -7,7 +7,6 @@ Metodos de acceso:
 3. Procesar JSONs descargados manualmente
 """
 import requests
-import json
 import time
 from datetime import datetime
 from pathlib import Path
@@ -22,7 +21,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
-from config import OUTPUT_DIR, CACHE_DIR
+from config import OUTPUT_DIR
+import json_backend
+from cache_store import get_store, get_vuelos, ttl_clave
+from jsonl_io import JsonlWriter, extension, resolver_formato
 
 
 class OCDSClient:
@@ -30,9 +32,12 @@ class OCDSClient:
 
     BASE_URL = "https://contratacionesabiertas.oece.gob.pe"
     API_URL = f"{BASE_URL}/api/v1"
+    CACHE_TIPO = "ocds_client"
 
     def __init__(self, use_cache: bool = True):
         self.use_cache = use_cache
+        self.cache = get_store()
+        self.vuelos = get_vuelos(self.CACHE_TIPO)
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -42,26 +47,34 @@ class OCDSClient:
 
     def _get_cache_path(self, key: str) -> Path:
         """Genera path de cache"""
-        safe_key = "".join(c if c.isalnum() or c in "-_" else "_" for c in key)
-        return CACHE_DIR / f"ocds_{safe_key}.json"
+        return self.cache.ruta(self.CACHE_TIPO, key)
 
     def _load_cache(self, key: str) -> Optional[Dict]:
         """Carga desde cache"""
         if not self.use_cache:
             return None
-        cache_path = self._get_cache_path(key)
-        if cache_path.exists():
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        # Vigencia por endpoint (CACHE_CONFIG["TTL_SEGUNDOS"]), verificada con stat
+        return self.cache.leer(self.CACHE_TIPO, key, ttl=ttl_clave(key))
 
     def _save_cache(self, key: str, data: Dict):
         """Guarda en cache"""
         if not self.use_cache:
             return
-        cache_path = self._get_cache_path(key)
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self.cache.guardar(self.CACHE_TIPO, key, data)
+        self.cache.borrar_negativo(self.CACHE_TIPO, key)
+
+    def _es_negativo(self, key: str) -> bool:
+        """True si la API ya confirmo hace poco que la clave no existe"""
+        return self.use_cache and self.cache.es_negativo(self.CACHE_TIPO, key)
+
+    def _save_negativo(self, key: str):
+        """Cachea un "no encontrado" confirmado (no se usa para errores de red/servidor)"""
+        if self.use_cache:
+            self.cache.guardar_negativo(self.CACHE_TIPO, key)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Aciertos/fallos de la memoria LRU y consultas coalescidas (compartidos entre instancias)"""
+        return {**self.cache.memo_stats()[self.CACHE_TIPO], **self.vuelos.stats()}
 
     # ============== METODO 1: API DIRECTA ==============
 
@@ -75,10 +88,17 @@ class OCDSClient:
         Returns:
             Datos procesados del proceso
         """
+        # Llamadas concurrentes con la misma clave comparten una sola consulta
+        return self.vuelos.hacer(f"ocid_{ocid}", lambda: self._get_by_ocid(ocid))
+
+    def _get_by_ocid(self, ocid: str) -> Optional[Dict]:
         cached = self._load_cache(f"ocid_{ocid}")
         if cached:
             print(f"[CACHE] {ocid}")
             return cached
+        if self._es_negativo(f"ocid_{ocid}"):
+            print(f"[NO ENCONTRADO] {ocid} (cache)")
+            return None
 
         url = f"{self.API_URL}/record/{ocid}"
 
@@ -92,6 +112,11 @@ class OCDSClient:
                     self._save_cache(f"ocid_{ocid}", resultado)
                     print(f"[OK] {ocid}")
                     return resultado
+
+            # 200 sin records o 404: ausente. Otros codigos (5xx, 429) son transitorios
+            if response.status_code in (200, 404):
+                self._save_negativo(f"ocid_{ocid}")
+                print(f"[NO ENCONTRADO] {ocid}")
             return None
         except Exception as e:
             print(f"[ERROR] {ocid}: {e}")
@@ -164,6 +189,10 @@ class OCDSClient:
         Returns:
             Datos del proceso o None
         """
+        # Llamadas concurrentes con la misma clave comparten una sola consulta
+        return self.vuelos.hacer(f"nom_{nomenclatura}", lambda: self._buscar_nomenclatura(nomenclatura))
+
+    def _buscar_nomenclatura(self, nomenclatura: str) -> Optional[Dict]:
         # Verificar cache primero
         cached = self._load_cache(f"nom_{nomenclatura}")
         if cached:
@@ -224,8 +253,7 @@ class OCDSClient:
         Returns:
             Datos procesados
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_backend.load(filepath)
 
         records = data.get("records", [])
         if records:
@@ -406,13 +434,29 @@ def buscar_else(max_results: int = 50) -> List[Dict]:
         return client.buscar_entidad("ELECTRO SUR ESTE", max_results)
 
 
-def guardar_json(datos: Any, filename: str = None) -> str:
-    """Guarda datos en JSON"""
+def guardar_json(datos: Any, filename: str = None, formato: str = None, append: bool = False) -> str:
+    """
+    Guarda datos en JSON o JSONL
+
+    Args:
+        datos: Un proceso (dict) o un iterable de procesos
+        filename: Nombre del archivo en OUTPUT_DIR
+        formato: "json" o "jsonl" (None = inferir por extension)
+        append: Solo jsonl - agregar al archivo existente
+    """
+    formato = resolver_formato(formato, filename)
     if filename is None:
-        filename = f"ocds_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"ocds_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension(formato)}"
     filepath = OUTPUT_DIR / filename
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+    if formato == "jsonl":
+        with JsonlWriter(filepath, append=append) as writer:
+            writer.write_many([datos] if isinstance(datos, dict) else datos)
+        return str(filepath)
+
+    if append:
+        raise ValueError("append solo esta disponible en formato jsonl")
+    json_backend.dump(datos, filepath)
     return str(filepath)
 
 
@@ -11,10 +11,10 @@ API Endpoints:
 Uso:
     python ocds_downloader.py --year 2024 --entidad "ELECTRO SUR ESTE"
     python ocds_downloader.py --year 2024 --month 12 --entidad ELSE
+    python ocds_downloader.py --year 2024 --formato jsonl --append
 """
 import os
 import sys
-import json
 import zipfile
 import requests
 import argparse
@@ -26,6 +26,10 @@ from io import BytesIO
 # Agregar path para imports
 sys.path.insert(0, str(Path(__file__).parent))
 from config import OUTPUT_DIR, CACHE_DIR, INPUT_DIR
+import json_backend
+import ocds_schema
+from cache_store import clave_mes, get_store, ttl
+from jsonl_io import JsonlWriter, RegistrosJsonl, extension, resolver_formato
 
 
 class OCDSDownloader:
@@ -36,6 +40,7 @@ class OCDSDownloader:
     def __init__(self, cache_dir: Path = None):
         self.cache_dir = cache_dir or CACHE_DIR
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = get_store(self.cache_dir)
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 SEACE-Downloader/1.0"
@@ -71,9 +76,11 @@ class OCDSDownloader:
             Path al archivo JSON extraido
         """
         # Verificar cache
-        cache_file = self.cache_dir / f"{year}-{month:02d}_{source}.json"
-        if cache_file.exists():
-            print(f"[CACHE] {cache_file.name}")
+        clave = clave_mes(year, month, source)
+        cache_file = self.cache.ruta("mes", clave)
+        if self.cache.vigente("mes", clave, ttl("mes")):
+            print(f"[CACHE] {clave}")
+            self.cache.tocar("mes", clave)
             return cache_file
 
         # Descargar
@@ -93,17 +100,19 @@ class OCDSDownloader:
             # Extraer a cache
             json_name = json_files[0]
             with zf.open(json_name) as src:
-                with open(cache_file, 'wb') as dst:
-                    dst.write(src.read())
+                self.cache.guardar_bytes("mes", clave, src.read())
 
         size_mb = cache_file.stat().st_size / (1024 * 1024)
-        print(f"[OK] {cache_file.name} ({size_mb:.1f} MB)")
+        print(f"[OK] {clave} ({size_mb:.1f} MB)")
         return cache_file
 
     def load_json(self, filepath: Path) -> Dict:
         """Carga un archivo JSON"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json_backend.load(filepath)
+
+    def load_records(self, filepath: Path) -> List:
+        """Carga los records de un archivo mensual decodificando solo los campos usados"""
+        return ocds_schema.cargar_records(filepath)
 
     def filter_by_entity(self, records: List[Dict], entity_name: str) -> List[Dict]:
         """
@@ -259,7 +268,9 @@ def descargar_procesos(
     year: int,
     months: List[int] = None,
     entidad: str = None,
-    output_file: str = None
+    output_file: str = None,
+    formato: str = None,
+    append: bool = False
 ) -> List[Dict]:
     """
     Descarga y procesa procesos de OCDS
@@ -268,61 +279,82 @@ def descargar_procesos(
         year: Ano
         months: Lista de meses (None = todos los disponibles)
         entidad: Filtrar por entidad (ej: "ELECTRO SUR ESTE" o "ELSE")
-        output_file: Archivo de salida JSON
+        output_file: Archivo de salida
+        formato: "json" o "jsonl" (None = inferir por extension, default json)
+        append: Solo jsonl - agregar al archivo existente
 
     Returns:
-        Lista de procesos procesados
+        Lista de procesos procesados. En formato jsonl los procesos se
+        escriben a medida que se procesan y se retorna una vista perezosa
+        del archivo (RegistrosJsonl) en lugar de una lista en memoria.
     """
     downloader = OCDSDownloader()
-    all_processed = []
-
-    # Obtener meses disponibles si no se especifican
-    if months is None:
-        file_infos = downloader.get_file_urls(year)
-        months = [int(f["month"]) for f in file_infos]
-        print(f"Meses disponibles para {year}: {months}")
-
-    # Procesar cada mes
-    for month in months:
-        print(f"\n{'='*50}")
-        print(f"Procesando {year}-{month:02d}")
-        print("=" * 50)
-
-        try:
-            # Descargar JSON
-            json_path = downloader.download_json(year, month)
-
-            # Cargar datos
-            data = downloader.load_json(json_path)
-            records = data.get("records", [])
-            print(f"Total records en archivo: {len(records)}")
-
-            # Filtrar por entidad si se especifica
-            if entidad:
-                records = downloader.filter_by_entity(records, entidad)
-                print(f"Records de '{entidad}': {len(records)}")
+    formato = resolver_formato(formato, output_file)
+    if append and formato != "jsonl":
+        raise ValueError("append solo esta disponible en formato jsonl")
 
-            # Procesar records
-            for record in records:
-                processed = downloader.process_record(record)
-                processed["periodo"] = f"{year}-{month:02d}"
-                all_processed.append(processed)
+    # Archivo de salida
+    if output_file is None:
+        entity_suffix = f"_{entidad.replace(' ', '_')}" if entidad else ""
+        output_file = OUTPUT_DIR / f"ocds_{year}{entity_suffix}{extension(formato)}"
+    else:
+        output_file = Path(output_file)
 
-        except Exception as e:
-            print(f"[ERROR] {year}-{month:02d}: {e}")
+    all_processed = []
+    total = 0
+    writer = JsonlWriter(output_file, append=append).open() if formato == "jsonl" else None
+
+    try:
+        # Obtener meses disponibles si no se especifican
+        if months is None:
+            file_infos = downloader.get_file_urls(year)
+            months = [int(f["month"]) for f in file_infos]
+            print(f"Meses disponibles para {year}: {months}")
+
+        # Procesar cada mes
+        for month in months:
+            print(f"\n{'='*50}")
+            print(f"Procesando {year}-{month:02d}")
+            print("=" * 50)
+
+            try:
+                # Descargar JSON
+                json_path = downloader.download_json(year, month)
+
+                # Cargar datos
+                records = downloader.load_records(json_path)
+                print(f"Total records en archivo: {len(records)}")
+
+                # Filtrar por entidad si se especifica
+                if entidad:
+                    records = downloader.filter_by_entity(records, entidad)
+                    print(f"Records de '{entidad}': {len(records)}")
+
+                # Procesar records
+                for record in records:
+                    processed = downloader.process_record(record)
+                    processed["periodo"] = f"{year}-{month:02d}"
+                    if writer:
+                        writer.write(processed)
+                    else:
+                        all_processed.append(processed)
+                    total += 1
+
+            except Exception as e:
+                print(f"[ERROR] {year}-{month:02d}: {e}")
+    finally:
+        if writer:
+            writer.close()
 
     print(f"\n{'='*50}")
-    print(f"TOTAL PROCESOS: {len(all_processed)}")
+    print(f"TOTAL PROCESOS: {total}")
 
     # Guardar resultados
-    if output_file is None:
-        entity_suffix = f"_{entidad.replace(' ', '_')}" if entidad else ""
-        output_file = OUTPUT_DIR / f"ocds_{year}{entity_suffix}.json"
-    else:
-        output_file = Path(output_file)
+    if writer:
+        print(f"[OK] {'Agregado a' if append else 'Guardado en'}: {output_file}")
+        return RegistrosJsonl(output_file)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_processed, f, ensure_ascii=False, indent=2)
+    json_backend.dump(all_processed, output_file)
 
     print(f"[OK] Guardado en: {output_file}")
 
@@ -336,7 +368,9 @@ def main():
     parser.add_argument("--year", type=int, required=True, help="Ano (ej: 2024)")
     parser.add_argument("--month", type=int, help="Mes especifico (1-12)")
     parser.add_argument("--entidad", type=str, help="Filtrar por entidad (ej: 'ELECTRO SUR ESTE')")
-    parser.add_argument("--output", type=str, help="Archivo de salida JSON")
+    parser.add_argument("--output", type=str, help="Archivo de salida JSON/JSONL")
+    parser.add_argument("--formato", choices=["json", "jsonl"], help="Formato de salida (default: segun extension, json)")
+    parser.add_argument("--append", action="store_true", help="Agregar al archivo existente (solo jsonl)")
 
     args = parser.parse_args()
 
@@ -346,7 +380,9 @@ def main():
         year=args.year,
         months=months,
         entidad=args.entidad,
-        output_file=args.output
+        output_file=args.output,
+        formato=args.formato,
+        append=args.append
     )
 
     # Mostrar resumen
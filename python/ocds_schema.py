@@ -0,0 +1,173 @@
+"""
+Decodificacion tipada de records OCDS con msgspec
+
+Los archivos mensuales del bulk traen cada record con su compiledRelease
+completo (planning, sources, releases, etc.), pero los normalizadores solo
+leen tender, buyer, awards, contracts y parties. Aqui se declaran esos
+campos como msgspec.Struct: al decodificar, msgspec salta el resto del
+documento sin crear objetos Python y valida tipos en el mismo paso.
+
+Los structs exponen .get(campo, default) con la misma semantica que un dict
+(campo ausente => default; null => None), asi que process_record,
+_process_record y download_month funcionan igual sobre structs o dicts.
+
+Si msgspec no esta instalado o el archivo no respeta el esquema, se cae a
+json_backend y se devuelven los records como dicts.
+
+Uso:
+    records = cargar_records(cache_file)
+    for record in records:
+        tender = record.get("compiledRelease", {}).get("tender", {})
+"""
+from pathlib import Path
+from typing import Any, List, TypeVar, Union
+
+import json_backend
+
+try:
+    import msgspec
+    from msgspec import UNSET, UnsetType
+except ImportError:
+    msgspec = None
+
+DISPONIBLE = msgspec is not None
+
+
+def _records_de(data: Any) -> list:
+    """Lista de records de un mes: {"records": [...]} o lista directa"""
+    if isinstance(data, dict):
+        return data.get("records", [])
+    return data if isinstance(data, list) else []
+
+
+if DISPONIBLE:
+    T = TypeVar("T")
+    # Ausente (UNSET) se distingue de null (None), igual que en un dict
+    Campo = Union[T, None, UnsetType]
+
+    class _Nodo(msgspec.Struct, omit_defaults=True):
+        """Base: acceso tipo dict para los normalizadores existentes"""
+
+        def get(self, campo: str, default: Any = None) -> Any:
+            valor = getattr(self, campo, UNSET)
+            return default if valor is UNSET else valor
+
+    class Valor(_Nodo):
+        amount: Any = UNSET
+        currency: Campo[str] = UNSET
+
+    class Periodo(_Nodo):
+        startDate: Campo[str] = UNSET
+        endDate: Campo[str] = UNSET
+        durationInDays: Any = UNSET
+
+    class Documento(_Nodo):
+        id: Any = UNSET
+        title: Campo[str] = UNSET
+        documentType: Campo[str] = UNSET
+        format: Campo[str] = UNSET
+        url: Campo[str] = UNSET
+        datePublished: Campo[str] = UNSET
+
+    class Organizacion(_Nodo):
+        id: Any = UNSET
+        name: Campo[str] = UNSET
+
+    class Unidad(_Nodo):
+        name: Campo[str] = UNSET
+
+    class Clasificacion(_Nodo):
+        description: Campo[str] = UNSET
+
+    class Item(_Nodo):
+        description: Campo[str] = UNSET
+        quantity: Any = UNSET
+        unit: Campo[Unidad] = UNSET
+        classification: Campo[Clasificacion] = UNSET
+
+    class Tender(_Nodo):
+        id: Any = UNSET
+        title: Campo[str] = UNSET
+        description: Campo[str] = UNSET
+        procurementMethod: Campo[str] = UNSET
+        procurementMethodDetails: Campo[str] = UNSET
+        mainProcurementCategory: Campo[str] = UNSET
+        value: Campo[Valor] = UNSET
+        datePublished: Campo[str] = UNSET
+        tenderPeriod: Campo[Periodo] = UNSET
+        enquiryPeriod: Campo[Periodo] = UNSET
+        documents: Campo[List[Documento]] = UNSET
+        tenderers: Campo[List[Organizacion]] = UNSET
+        items: Campo[List[Item]] = UNSET
+
+    class Award(_Nodo):
+        date: Campo[str] = UNSET
+        value: Campo[Valor] = UNSET
+        suppliers: Campo[List[Organizacion]] = UNSET
+
+    class Contract(_Nodo):
+        id: Any = UNSET
+        title: Campo[str] = UNSET
+        value: Campo[Valor] = UNSET
+        dateSigned: Campo[str] = UNSET
+        period: Campo[Periodo] = UNSET
+        documents: Campo[List[Documento]] = UNSET
+
+    class Identificador(_Nodo):
+        id: Any = UNSET
+
+    class Direccion(_Nodo):
+        streetAddress: Campo[str] = UNSET
+        department: Campo[str] = UNSET
+        region: Campo[str] = UNSET
+
+    class Contacto(_Nodo):
+        telephone: Campo[str] = UNSET
+
+    class Party(_Nodo):
+        id: Any = UNSET
+        name: Campo[str] = UNSET
+        roles: Campo[List[str]] = UNSET
+        additionalIdentifiers: Campo[List[Identificador]] = UNSET
+        address: Campo[Direccion] = UNSET
+        contactPoint: Campo[Contacto] = UNSET
+
+    class CompiledRelease(_Nodo):
+        ocid: Campo[str] = UNSET
+        tender: Campo[Tender] = UNSET
+        buyer: Campo[Organizacion] = UNSET
+        awards: Campo[List[Award]] = UNSET
+        contracts: Campo[List[Contract]] = UNSET
+        parties: Campo[List[Party]] = UNSET
+
+    class Record(_Nodo):
+        ocid: Campo[str] = UNSET
+        compiledRelease: Campo[CompiledRelease] = UNSET
+
+    class Mes(_Nodo):
+        records: List[Record] = []
+
+    # Archivo del bulk ({"records": [...]}) o cache paginado de la API (lista)
+    _DECODER = msgspec.json.Decoder(Union[Mes, List[Record]])
+
+
+def decodificar_records(contenido: bytes) -> list:
+    """
+    Records de un mes a partir del JSON crudo
+
+    Returns:
+        Lista de records (structs con .get, o dicts si se uso el fallback)
+    """
+    if DISPONIBLE:
+        try:
+            data = _DECODER.decode(contenido)
+            return data.records if isinstance(data, Mes) else data
+        except msgspec.ValidationError as e:
+            print(f"[WARN] Esquema OCDS no coincide ({e}), usando decodificacion generica")
+    return _records_de(json_backend.loads(contenido))
+
+
+def cargar_records(path: Union[str, Path]) -> list:
+    """Records de un archivo mensual (bulk o cache de la API)"""
+    return decodificar_records(Path(path).read_bytes())
+
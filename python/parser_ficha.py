@@ -0,0 +1,281 @@
+"""
+Parser de la ficha de seleccion SEACE en una sola pasada
+
+Los paneles de la ficha (ui-panel) se identifican por su titulo
+(ui-panel-title). Se recorren los titulos una sola vez, se arma el mapa
+titulo -> panel y cada seccion se extrae solo de su panel, en vez de
+volver a barrer el documento por cada seccion.
+
+Backends (SEACE_CONFIG["PARSER_FICHA"] o SEACE_PARSER_FICHA):
+    auto        - selectolax > lxml > bs4 (default)
+    selectolax  - lexbor, selectores CSS (opcional: pip install selectolax)
+    lxml        - lxml.html con XPath precompilados
+    bs4         - BeautifulSoup sobre lxml (referencia)
+
+Los tres entregan el mismo resultado (ver benchmark_parser.py, que ademas
+compara los resultados entre backends).
+
+Uso:
+    secciones = parsear_ficha(html)
+    secciones["cronograma"], secciones["documentos"], ...
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree
+import lxml.html
+
+from config import SEACE_CONFIG, ETAPAS_MAPPING
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+def backends_disponibles() -> List[str]:
+    """Backends instalados, en orden de preferencia"""
+    disponibles = []
+    if LexborHTMLParser is not None:
+        disponibles.append("selectolax")
+    disponibles += ["lxml", "bs4"]
+    return disponibles
+
+
+def _resolver_backend(nombre: str) -> str:
+    if nombre == "auto":
+        return backends_disponibles()[0]
+    if nombre not in backends_disponibles():
+        raise ValueError(f"Parser de ficha no disponible: {nombre} (instalados: {backends_disponibles()})")
+    return nombre
+
+
+BACKEND = _resolver_backend(SEACE_CONFIG["PARSER_FICHA"])
+
+
+def set_backend(nombre: str) -> str:
+    """Cambia el backend en tiempo de ejecucion (benchmarks, pruebas)"""
+    global BACKEND
+    BACKEND = _resolver_backend(nombre)
+    return BACKEND
+
+
+# ============== BACKENDS ==============
+# Cada backend expone las mismas operaciones sobre sus nodos; los
+# extractores de seccion de abajo no dependen de la libreria.
+
+class _BS4:
+    @staticmethod
+    def paneles(html: str) -> List[Tuple[str, Any]]:
+        soup = BeautifulSoup(html, 'lxml')
+        return [
+            (div.get_text(), div.find_parent('div', class_='ui-panel'))
+            for div in soup.find_all('div', class_='ui-panel-title')
+        ]
+
+    @staticmethod
+    def filas(nodo) -> list:
+        return nodo.find_all('tr')
+
+    @staticmethod
+    def celdas(fila, con_th: bool) -> list:
+        return fila.find_all(['td', 'th'] if con_th else 'td')
+
+    @staticmethod
+    def tabla(panel):
+        return panel.find('table')
+
+    @staticmethod
+    def texto(nodo) -> str:
+        return nodo.get_text(strip=True)
+
+    @staticmethod
+    def href(celda) -> Optional[str]:
+        link = celda.find('a')
+        return link.get('href', '') if link else None
+
+
+def _xpath_clase(clase: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {clase} ')"
+
+
+class _LXML:
+    _TITULOS = etree.XPath(f"//div[{_xpath_clase('ui-panel-title')}]")
+    _PANEL = etree.XPath(f"ancestor::div[{_xpath_clase('ui-panel')}][1]")
+    _FILAS = etree.XPath(".//tr")
+    _CELDAS = etree.XPath(".//td")
+    _CELDAS_TH = etree.XPath(".//td | .//th")
+    _TABLA = etree.XPath("(.//table)[1]")
+    _LINK = etree.XPath("(.//a)[1]")
+
+    @classmethod
+    def paneles(cls, html: str) -> List[Tuple[str, Any]]:
+        # En bytes para respetar la declaracion <?xml encoding?> de las paginas JSF
+        if isinstance(html, str):
+            doc = lxml.html.document_fromstring(
+                html.encode('utf-8'), parser=lxml.html.HTMLParser(encoding='utf-8')
+            )
+        else:
+            doc = lxml.html.document_fromstring(html)
+        # get_text de BeautifulSoup no incluye scripts ni estilos
+        etree.strip_elements(doc, 'script', 'style', with_tail=False)
+        resultado = []
+        for div in cls._TITULOS(doc):
+            panel = cls._PANEL(div)
+            resultado.append(("".join(div.itertext()), panel[0] if panel else None))
+        return resultado
+
+    @classmethod
+    def filas(cls, nodo) -> list:
+        return cls._FILAS(nodo)
+
+    @classmethod
+    def celdas(cls, fila, con_th: bool) -> list:
+        return cls._CELDAS_TH(fila) if con_th else cls._CELDAS(fila)
+
+    @classmethod
+    def tabla(cls, panel):
+        tablas = cls._TABLA(panel)
+        return tablas[0] if tablas else None
+
+    @staticmethod
+    def texto(nodo) -> str:
+        return "".join(t.strip() for t in nodo.itertext())
+
+    @classmethod
+    def href(cls, celda) -> Optional[str]:
+        link = cls._LINK(celda)
+        return link[0].get('href', '') if link else None
+
+
+class _Selectolax:
+    @staticmethod
+    def _panel(nodo):
+        nodo = nodo.parent
+        while nodo is not None:
+            if nodo.tag == 'div' and 'ui-panel' in (nodo.attributes.get('class') or '').split():
+                return nodo
+            nodo = nodo.parent
+        return None
+
+    @classmethod
+    def paneles(cls, html: str) -> List[Tuple[str, Any]]:
+        doc = LexborHTMLParser(html)
+        doc.strip_tags(['script', 'style'])
+        return [
+            (div.text(deep=True), cls._panel(div))
+            for div in doc.css('div.ui-panel-title')
+        ]
+
+    @staticmethod
+    def filas(nodo) -> list:
+        return nodo.css('tr')
+
+    @staticmethod
+    def celdas(fila, con_th: bool) -> list:
+        return fila.css('td, th' if con_th else 'td')
+
+    @staticmethod
+    def tabla(panel):
+        return panel.css_first('table')
+
+    @staticmethod
+    def texto(nodo) -> str:
+        return nodo.text(deep=True, separator='', strip=True)
+
+    @staticmethod
+    def href(celda) -> Optional[str]:
+        link = celda.css_first('a')
+        return (link.attributes.get('href') or '') if link else None
+
+
+_BACKENDS = {"bs4": _BS4, "lxml": _LXML, "selectolax": _Selectolax}
+
+
+# ============== SECCIONES ==============
+
+def _pares(b, panel) -> Dict[str, str]:
+    """Filas etiqueta: valor de un panel"""
+    info = {}
+    for row in b.filas(panel):
+        cells = b.celdas(row, True)
+        if len(cells) >= 2:
+            label = b.texto(cells[0]).replace(':', '')
+            value = b.texto(cells[1])
+            if label and value:
+                info[label] = value
+    return info
+
+
+def _cronograma(b, panel) -> List[Dict]:
+    cronograma = []
+    tabla = b.tabla(panel)
+    if tabla is None:
+        return cronograma
+    for row in b.filas(tabla)[1:]:  # Saltar header
+        cells = b.celdas(row, False)
+        if len(cells) >= 3:
+            etapa_raw = b.texto(cells[0])
+            cronograma.append({
+                "etapa": ETAPAS_MAPPING.get(etapa_raw, etapa_raw),
+                "etapa_original": etapa_raw,
+                "fecha_inicio": b.texto(cells[1]),
+                "fecha_fin": b.texto(cells[2])
+            })
+    return cronograma
+
+
+def _documentos(b, panel) -> List[Dict]:
+    documentos = []
+    tabla = b.tabla(panel)
+    if tabla is None:
+        return documentos
+    for row in b.filas(tabla)[1:]:  # Saltar header
+        cells = b.celdas(row, False)
+        if len(cells) >= 5:
+            doc = {
+                "numero": b.texto(cells[0]),
+                "etapa": b.texto(cells[1]),
+                "documento": b.texto(cells[2]),
+                "fecha": b.texto(cells[4])
+            }
+            url = b.href(cells[3])
+            if url is not None:
+                doc["url"] = url
+            documentos.append(doc)
+    return documentos
+
+
+# (clave en datos, texto del titulo del panel, extractor, valor si no hay panel)
+SECCIONES: List[Tuple[str, str, Callable, Callable[[], Any]]] = [
+    ("info_general", "Informacion General", _pares, dict),
+    ("info_entidad", "Informacion general de la Entidad", _pares, dict),
+    ("info_procedimiento", "Informacion general del procedimiento", _pares, dict),
+    ("cronograma", "Cronograma", _cronograma, list),
+    ("documentos", "Lista de Documentos", _documentos, list),
+]
+
+
+def parsear_ficha(html: str, backend: str = None) -> Dict[str, Any]:
+    """
+    Extrae las secciones de la ficha en una pasada
+
+    Args:
+        html: HTML de fichaSeleccion.xhtml
+        backend: bs4, lxml o selectolax (default: BACKEND)
+
+    Returns:
+        Dict con info_general, info_entidad, info_procedimiento, cronograma y documentos
+    """
+    b = _BACKENDS[_resolver_backend(backend) if backend else BACKEND]
+
+    # Un solo recorrido de titulos; el primero que coincide gana, como antes
+    mapa = {}
+    for titulo, panel in b.paneles(html):
+        mapa.setdefault(titulo, panel)
+
+    secciones = {}
+    for clave, buscado, extractor, vacio in SECCIONES:
+        panel = next((p for titulo, p in mapa.items() if buscado in titulo), None)
+        secciones[clave] = extractor(b, panel) if panel is not None else vacio()
+    return secciones
@@ -0,0 +1,153 @@
+"""
+Planificador de enriquecimiento: OCDS local primero, scraper para el resto
+
+La mayor parte de lo que trae una ficha (cronograma, postores, documentos,
+ganador, contrato) ya esta en los archivos mensuales OCDS del cache (tipo
+"mes" de cache_store). Antes de abrir Chrome, se buscan las nomenclaturas
+en esos meses, del mas nuevo al mas antiguo (el compiledRelease mas nuevo
+es el mas completo), y solo van al scraper:
+
+    - las que no aparecen en ningun mes del cache
+    - las que aparecen sin buena pro y se publicaron hace menos de
+      PLANIFICADOR_CONFIG["DIAS_EN_CURSO"] dias (proceso en curso: el mes
+      en cache puede estar desactualizado)
+
+Solo se leen los meses desde la publicacion mas antigua del Excel, y la
+busqueda se corta cuando ya no quedan nomenclaturas pendientes.
+
+Uso:
+    plan = planificar(nomenclaturas, df)
+    plan.ocds       # {nomenclatura: registro OCDS normalizado}
+    plan.scraper    # nomenclaturas que hay que scrapear
+    plan.respaldo   # registro OCDS de las "en curso", por si el scraper falla
+"""
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import PLANIFICADOR_CONFIG
+import ocds_schema
+from cache_store import get_store
+from mapa_fichas import normalizar_nomenclatura
+from ocds_downloader import OCDSDownloader
+
+_CLAVE_MES = re.compile(r"^(\d{4})-(\d{2})_seace_v3$")
+
+
+class PlanEnriquecimiento:
+    """Resultado del planificador: que sale de OCDS y que va al scraper"""
+
+    def __init__(self):
+        self.ocds: Dict[str, Dict] = {}
+        self.scraper: List[str] = []
+        self.respaldo: Dict[str, Dict] = {}
+        self.stats = {
+            "ocds": 0,             # Resueltas con el cache OCDS
+            "no_encontradas": 0,   # Sin record en los meses en cache
+            "en_curso": 0,         # En OCDS pero sin buena pro y recientes
+            "meses_leidos": 0,
+        }
+
+    def resumen(self) -> str:
+        s = self.stats
+        return (f"{s['ocds']} desde OCDS local, {len(self.scraper)} al scraper "
+                f"({s['no_encontradas']} no encontradas, {s['en_curso']} en curso; "
+                f"{s['meses_leidos']} meses leidos)")
+
+
+def _meses_en_cache(desde: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int, Path]]:
+    """(año, mes, ruta) de los meses seace_v3 del cache, del mas nuevo al mas antiguo"""
+    meses = []
+    for entrada in get_store().entradas("mes"):
+        m = _CLAVE_MES.match(entrada["clave"] or "")
+        if not m:
+            continue
+        year, month = int(m.group(1)), int(m.group(2))
+        if desde is None or (year, month) >= desde:
+            meses.append((year, month, entrada["ruta"]))
+    return sorted(meses, reverse=True)
+
+
+def _publicacion_minima(df, nomenclaturas: List[str]) -> Optional[Tuple[int, int]]:
+    """(año, mes) de publicacion mas antiguo entre las nomenclaturas del Excel"""
+    if df is None or not {"nomenclatura", "anio", "mes"} <= set(df.columns):
+        return None
+    fechas = df.loc[df["nomenclatura"].isin(nomenclaturas), ["anio", "mes"]].dropna()
+    if fechas.empty or len(fechas) < df["nomenclatura"].isin(nomenclaturas).sum():
+        return None  # Alguna sin fecha: no se puede acotar
+    anio, mes = min(zip(fechas["anio"].astype(int), fechas["mes"].astype(int)))
+    return anio, mes
+
+
+def _en_curso(registro: Dict, limite: datetime) -> bool:
+    """Sin buena pro y publicado despues del limite (o sin fecha)"""
+    if registro.get("ganador"):
+        return False
+    fecha = (registro.get("fecha_publicacion") or "")[:10]
+    try:
+        return datetime.strptime(fecha, "%Y-%m-%d") >= limite
+    except ValueError:
+        return True
+
+
+def planificar(
+    nomenclaturas: List[str],
+    df=None,
+    dias_en_curso: int = None
+) -> PlanEnriquecimiento:
+    """
+    Resuelve nomenclaturas contra los meses OCDS en cache
+
+    Args:
+        nomenclaturas: Nomenclaturas a enriquecer
+        df: DataFrame de ExcelProcessor (para acotar meses por anio/mes)
+        dias_en_curso: Antiguedad bajo la cual un proceso sin buena pro se
+            scrapea igual (default: PLANIFICADOR_CONFIG["DIAS_EN_CURSO"])
+
+    Returns:
+        PlanEnriquecimiento con plan.ocds, plan.scraper y plan.stats
+    """
+    if dias_en_curso is None:
+        dias_en_curso = PLANIFICADOR_CONFIG["DIAS_EN_CURSO"]
+    limite = datetime.now() - timedelta(days=dias_en_curso)
+
+    plan = PlanEnriquecimiento()
+    pendientes = {normalizar_nomenclatura(n): n for n in nomenclaturas}
+    encontrados: Dict[str, Dict] = {}
+    normalizador = OCDSDownloader()
+
+    for year, month, ruta in _meses_en_cache(_publicacion_minima(df, nomenclaturas)):
+        if not pendientes:
+            break
+        plan.stats["meses_leidos"] += 1
+        for record in ocds_schema.cargar_records(ruta):
+            tender = record.get("compiledRelease", {}).get("tender", {})
+            clave = normalizar_nomenclatura(tender.get("title") or "")
+            nom = pendientes.pop(clave, None)
+            if nom is None:
+                continue
+            registro = normalizador.process_record(record)
+            registro["nomenclatura"] = nom  # Misma clave que el Excel para el merge
+            registro["success"] = True
+            registro["mes_ocds"] = f"{year}-{month:02d}"
+            encontrados[nom] = registro
+            if not pendientes:
+                break
+
+    for nom in nomenclaturas:
+        registro = encontrados.get(nom)
+        if registro is None:
+            plan.stats["no_encontradas"] += 1
+            plan.scraper.append(nom)
+        elif _en_curso(registro, limite):
+            plan.stats["en_curso"] += 1
+            plan.scraper.append(nom)
+            plan.respaldo[nom] = registro
+        else:
+            plan.stats["ocds"] += 1
+            plan.ocds[nom] = registro
+
+    return plan
@@ -3,7 +3,6 @@ Procesa el JSON descargado del Portal OCDS
 Uso: python procesar_json.py "ruta/al/archivo.json"
 """
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
 
@@ -11,6 +10,7 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import OUTPUT_DIR
+import json_backend
 
 
 def procesar_ocds_json(filepath: str) -> dict:
@@ -20,8 +20,7 @@ def procesar_ocds_json(filepath: str) -> dict:
     Returns:
         Diccionario con datos estructurados
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = json_backend.load(filepath)
 
     records = data.get("records", [])
     if not records:
@@ -199,8 +198,7 @@ def main():
 
     # Guardar procesado
     output_file = OUTPUT_DIR / f"{datos['nomenclatura'].replace('/', '-')}_procesado.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(datos, f, ensure_ascii=False, indent=2)
+    json_backend.dump(datos, output_file)
 
     print(f"\n{'='*60}")
     print(f"[OK] Guardado en: {output_file}")
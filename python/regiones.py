@@ -0,0 +1,206 @@
+"""
+Region (departamento) de una entidad a partir de su nombre
+
+El Excel de SEACE no trae el departamento de la entidad. Se deduce del
+nombre con REGIONES (config.py): la primera region, en orden, que tenga
+algun patron contenido en el nombre; si ninguno aparece,
+REGION_CONFIG["DEFAULT"].
+
+ClasificadorRegion compila todos los patrones una sola vez en una
+expresion regular: las alternativas van en orden de prioridad dentro de
+un lookahead, asi findall devuelve tambien las coincidencias solapadas
+(ICA dentro de HUANCAVELICA) y gana la de mayor prioridad, igual que el
+recorrido region por region. Cada nombre distinto se clasifica una sola
+vez (memo compartido por el proceso).
+
+Si la entidad aparece como buyer en los meses OCDS del cache, se prefiere
+el department de su party (address.department). El indice entidad ->
+region se guarda en el cache (tipo "entidades") y solo se actualiza con
+los meses nuevos o re-descargados.
+
+Uso:
+    regiones = detectar_regiones(df["entidad"], departamentos_ocds())
+    python regiones.py indexar
+    python regiones.py "ELECTRO SUR ESTE S.A.A." "MUNICIPALIDAD PROVINCIAL DE ILO"
+"""
+import argparse
+import re
+import sys
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import REGIONES, REGION_CONFIG
+import ocds_schema
+from cache_store import get_store
+
+TIPO_CACHE = "entidades"
+CLAVE_INDICE = "departamentos_seace_v3"
+
+_CLAVE_MES = re.compile(r"^\d{4}-\d{2}_seace_v3$")
+
+
+def normalizar_entidad(nombre: str) -> str:
+    """Clave de entidad: sin tildes, mayusculas y espacios simples"""
+    sin_tildes = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"\s+", " ", sin_tildes.strip()).upper()
+
+
+def region_de_departamento(departamento: Optional[str]) -> Optional[str]:
+    """Region de REGIONES para un department OCDS (con o sin tildes), o None"""
+    if not departamento:
+        return None
+    region = normalizar_entidad(departamento)
+    return region if region in REGIONES else None
+
+
+class ClasificadorRegion:
+    """Patrones de REGIONES compilados una vez, con memo por nombre"""
+
+    def __init__(self, regiones: Dict[str, List[str]] = None, default: str = None):
+        self.default = default or REGION_CONFIG["DEFAULT"]
+        # patron -> (prioridad, region); un patron repetido queda en la primera region
+        self._prioridad: Dict[str, tuple] = {}
+        orden = 0
+        for region, patrones in (regiones or REGIONES).items():
+            for patron in patrones:
+                if patron not in self._prioridad:
+                    self._prioridad[patron] = (orden, region)
+                    orden += 1
+        alternativas = sorted(self._prioridad, key=lambda p: self._prioridad[p][0])
+        self._patron = re.compile("(?=(" + "|".join(map(re.escape, alternativas)) + "))")
+        self._memo: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def region(self, entidad) -> str:
+        """Region de un nombre de entidad (NaN/None -> default)"""
+        if pd.isna(entidad):
+            return self.default
+        nombre = str(entidad).upper()
+        region = self._memo.get(nombre)
+        if region is None:
+            coincidencias = [self._prioridad[p] for p in self._patron.findall(nombre)]
+            region = min(coincidencias)[1] if coincidencias else self.default
+            with self._lock:
+                self._memo[nombre] = region
+        return region
+
+    def clasificar(self, entidades: pd.Series, departamentos: Dict[str, str] = None) -> pd.Series:
+        """
+        Region de cada fila de una columna de entidades
+
+        Args:
+            entidades: Columna entidad del Excel
+            departamentos: Indice normalizar_entidad(nombre) -> region (OCDS);
+                tiene prioridad sobre los patrones del nombre
+
+        Returns:
+            Serie de regiones con el mismo indice
+        """
+        # Una clasificacion por entidad distinta (tambien sobre columnas category)
+        codigos, distintas = pd.factorize(entidades)
+        regiones = []
+        for entidad in distintas:
+            region = departamentos.get(normalizar_entidad(str(entidad))) if departamentos else None
+            regiones.append(region or self.region(entidad))
+        regiones.append(self.default)  # Codigo -1: entidad vacia
+        return pd.Series(np.array(regiones, dtype=object)[codigos], index=entidades.index, name=entidades.name)
+
+    def stats(self) -> Dict[str, int]:
+        return {"patrones": len(self._prioridad), "memo": len(self._memo)}
+
+
+_CLASIFICADOR: Optional[ClasificadorRegion] = None
+
+
+def get_clasificador() -> ClasificadorRegion:
+    """ClasificadorRegion compartido (uno por proceso)"""
+    global _CLASIFICADOR
+    if _CLASIFICADOR is None:
+        _CLASIFICADOR = ClasificadorRegion()
+    return _CLASIFICADOR
+
+
+def detectar_regiones(entidades: pd.Series, departamentos: Dict[str, str] = None) -> pd.Series:
+    """Atajo: get_clasificador().clasificar(...)"""
+    return get_clasificador().clasificar(entidades, departamentos)
+
+
+# ============== INDICE OCDS ==============
+
+def _departamentos_de_mes(ruta: Path) -> Dict[str, str]:
+    """normalizar_entidad(buyer) -> region de los records de un mes"""
+    departamentos = {}
+    for record in ocds_schema.cargar_records(ruta):
+        for party in record.get("compiledRelease", {}).get("parties") or []:
+            if "buyer" not in (party.get("roles") or []):
+                continue
+            region = region_de_departamento((party.get("address") or {}).get("department"))
+            if region and party.get("name"):
+                departamentos[normalizar_entidad(party.get("name"))] = region
+            break
+    return departamentos
+
+
+def departamentos_ocds(actualizar: bool = True) -> Dict[str, str]:
+    """
+    Indice entidad -> region tomado de los buyers de los meses OCDS en cache
+
+    Args:
+        actualizar: Leer los meses del cache que aun no estan en el indice
+            (o cuyo archivo cambio de tamano); False = solo lo ya indexado
+
+    Returns:
+        Dict normalizar_entidad(nombre) -> region
+    """
+    store = get_store()
+    indice = store.leer(TIPO_CACHE, CLAVE_INDICE) or {"meses": {}, "departamentos": {}}
+    if not actualizar:
+        return indice["departamentos"]
+
+    pendientes = [
+        e for e in store.entradas("mes")
+        if _CLAVE_MES.match(e["clave"] or "") and indice["meses"].get(e["clave"]) != e["tamano"]
+    ]
+    if not pendientes:
+        return indice["departamentos"]
+
+    print(f"[CACHE] Indexando departamentos de {len(pendientes)} meses OCDS...")
+    # Del mas antiguo al mas nuevo: si una entidad cambio de departamento, gana el ultimo
+    for entrada in pendientes:
+        try:
+            indice["departamentos"].update(_departamentos_de_mes(entrada["ruta"]))
+        except (OSError, ValueError) as e:
+            print(f"[WARN] {entrada['clave']}: {e}")
+            continue
+        indice["meses"][entrada["clave"]] = entrada["tamano"]
+    store.guardar(TIPO_CACHE, CLAVE_INDICE, indice)
+    print(f"[OK] {len(indice['departamentos']):,} entidades con departamento "
+          f"({len(indice['meses'])} meses indexados)")
+    return indice["departamentos"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Region de entidades SEACE")
+    parser.add_argument("entidades", nargs="*", help="Nombres de entidad a clasificar, o 'indexar'")
+    args = parser.parse_args()
+
+    if args.entidades == ["indexar"]:
+        departamentos_ocds()
+        return
+
+    departamentos = departamentos_ocds(actualizar=False)
+    clasificador = get_clasificador()
+    for entidad in args.entidades:
+        ocds = departamentos.get(normalizar_entidad(entidad))
+        fuente = "OCDS" if ocds else "nombre"
+        print(f"  {ocds or clasificador.region(entidad):<14} ({fuente:<6}) {entidad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Pool de scrapers Selenium en paralelo
+
+N workers, cada uno con su propio SeaceScraper (y su propio Chrome), toman
+nomenclaturas de una cola compartida. Un limite de cortesia global espacia
+el inicio de cada proceso entre TODOS los workers (SEACE_CONFIG
+["REQUEST_DELAY"]), asi el servidor ve el mismo ritmo maximo que con un
+solo navegador pero sin los tiempos muertos de cada ficha.
+
+Si un worker falla (excepcion o Chrome caido) solo se pierde ese proceso:
+el worker cierra su driver, abre uno nuevo y sigue con la cola. Los
+resultados se devuelven en el mismo orden de entrada.
+
+Uso:
+    resultados = PoolScrapers(3).scrape(nomenclaturas)
+
+    # Throughput (fichas/minuto) segun cantidad de workers
+    python scraper_pool.py vigilados.txt --workers 1 2 4 --no-cache
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import SEACE_CONFIG
+from seace_scraper import SeaceScraper
+
+
+class LimiteCortesia:
+    """Intervalo minimo entre inicios de proceso, compartido por todos los hilos"""
+
+    def __init__(self, intervalo: float):
+        self.intervalo = intervalo
+        self._proximo = 0.0
+        self._lock = threading.Lock()
+
+    def esperar(self):
+        """Bloquea hasta el proximo turno libre"""
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._proximo)
+            self._proximo = turno + self.intervalo
+        if turno > ahora:
+            time.sleep(turno - ahora)
+
+
+class PoolScrapers:
+    """N SeaceScraper en paralelo sobre una cola de nomenclaturas"""
+
+    def __init__(
+        self,
+        n_workers: int = 2,
+        use_cache: bool = True,
+        headless: bool = True,
+        intervalo: float = None
+    ):
+        """
+        Args:
+            n_workers: Navegadores en paralelo
+            use_cache: Si usar cache local de fichas
+            headless: Chrome sin ventana
+            intervalo: Segundos minimos entre procesos (global; default REQUEST_DELAY)
+        """
+        self.n_workers = max(1, n_workers)
+        self.use_cache = use_cache
+        self.headless = headless
+        self.limite = LimiteCortesia(
+            SEACE_CONFIG["REQUEST_DELAY"] if intervalo is None else intervalo
+        )
+        self.stats = {}
+        self._latencias: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _acumular_latencias(self, scraper: SeaceScraper):
+        with self._lock:
+            for paso, tiempos in scraper.latencias.items():
+                self._latencias.setdefault(paso, []).extend(tiempos)
+
+    def _nuevo_scraper(self) -> SeaceScraper:
+        return SeaceScraper(use_cache=self.use_cache, headless=self.headless)
+
+    @staticmethod
+    def _driver_vivo(scraper: SeaceScraper) -> bool:
+        if scraper.driver is None:
+            return True  # Aun no iniciado: se crea en el proximo proceso
+        try:
+            scraper.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _worker(
+        self,
+        n: int,
+        cola: "queue.Queue",
+        resultados: List[Optional[Dict]],
+        progreso: Optional[Callable[[Dict], None]]
+    ):
+        scraper = self._nuevo_scraper()
+        hechos = reinicios = 0
+        try:
+            while True:
+                try:
+                    i, nom = cola.get_nowait()
+                except queue.Empty:
+                    break
+
+                self.limite.esperar()
+                try:
+                    datos = scraper.scrape(nom)
+                except Exception as e:
+                    datos = {"nomenclatura": nom, "error": str(e), "success": False}
+
+                # Aislar fallas: si el Chrome de este worker murio, reemplazarlo
+                if not datos.get("success") and not self._driver_vivo(scraper):
+                    print(f"[POOL] worker {n}: driver caido, reiniciando")
+                    self._acumular_latencias(scraper)
+                    try:
+                        scraper.close()
+                    except Exception:
+                        scraper.driver = None
+                    scraper = self._nuevo_scraper()
+                    reinicios += 1
+
+                resultados[i] = datos
+                hechos += 1
+                if progreso:
+                    progreso(datos)
+        finally:
+            self._acumular_latencias(scraper)
+            try:
+                scraper.close()
+            except Exception:
+                pass
+            self.stats["workers"][n] = {"hechos": hechos, "reinicios": reinicios}
+
+    def scrape(
+        self,
+        nomenclaturas: List[str],
+        progreso: Callable[[Dict], None] = None
+    ) -> List[Dict]:
+        """
+        Scrapea las nomenclaturas en paralelo
+
+        Args:
+            nomenclaturas: Lista de nomenclaturas
+            progreso: Callback opcional llamado con cada resultado al terminar
+
+        Returns:
+            Resultados en el mismo orden que nomenclaturas
+        """
+        cola = queue.Queue()
+        for i, nom in enumerate(nomenclaturas):
+            cola.put((i, nom))
+        resultados: List[Optional[Dict]] = [None] * len(nomenclaturas)
+        self.stats = {"workers": {}}
+        self._latencias = {}
+
+        inicio = time.perf_counter()
+        hilos = [
+            threading.Thread(target=self._worker, args=(n, cola, resultados, progreso), name=f"scraper-{n}")
+            for n in range(min(self.n_workers, len(nomenclaturas)))
+        ]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        duracion = time.perf_counter() - inicio
+
+        self.stats.update({
+            "n_workers": len(hilos),
+            "fichas": len(nomenclaturas),
+            "exitosas": sum(1 for r in resultados if r and r.get("success")),
+            "duracion_s": duracion,
+            "fichas_por_minuto": len(nomenclaturas) / duracion * 60 if duracion else 0.0,
+            # Segundos por paso del scraper (buscador, resultados, ficha, postores, ...)
+            "latencias": {
+                paso: {"n": len(t), "promedio": sum(t) / len(t), "max": max(t)}
+                for paso, t in self._latencias.items()
+            },
+        })
+        print(f"[POOL] {len(nomenclaturas)} fichas con {len(hilos)} workers en {duracion:.1f}s "
+              f"({self.stats['fichas_por_minuto']:.1f} fichas/min)")
+        return resultados
+
+
+def medir_throughput(
+    nomenclaturas: List[str],
+    workers: List[int],
+    use_cache: bool = False,
+    headless: bool = True
+) -> List[Dict]:
+    """
+    Scrapea la misma lista con distintas cantidades de workers
+
+    Returns:
+        Un dict de stats por N (n_workers, fichas, exitosas, duracion_s, fichas_por_minuto)
+    """
+    filas = []
+    for n in workers:
+        pool = PoolScrapers(n, use_cache=use_cache, headless=headless)
+        pool.scrape(nomenclaturas)
+        filas.append({k: v for k, v in pool.stats.items() if k not in ("workers", "latencias")})
+        for paso, t in pool.stats["latencias"].items():
+            print(f"  {paso:<18} n={t['n']:<4} promedio {t['promedio']:.2f}s  max {t['max']:.2f}s")
+    return filas
+
+
+def main():
+    from cache_warmer import leer_watchlist
+
+    parser = argparse.ArgumentParser(description="Throughput del pool de scrapers SEACE")
+    parser.add_argument("watchlist", help="Archivo con una nomenclatura por linea")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Valores de N a medir")
+    parser.add_argument("--no-cache", action="store_true", help="Ignorar cache de fichas (medicion real)")
+    parser.add_argument("--visible", action="store_true", help="Mostrar ventanas de Chrome")
+    args = parser.parse_args()
+
+    nomenclaturas = leer_watchlist(args.watchlist)
+    filas = medir_throughput(
+        nomenclaturas, args.workers, use_cache=not args.no_cache, headless=not args.visible
+    )
+
+    print("=" * 60)
+    print(f"THROUGHPUT POOL - {len(nomenclaturas)} fichas")
+    print("=" * 60)
+    print(f"{'WORKERS':>8} {'EXITOSAS':>9} {'DURACION (s)':>13} {'FICHAS/MIN':>11}")
+    for f in filas:
+        print(f"{f['n_workers']:>8} {f['exitosas']:>9} {f['duracion_s']:>13.1f} {f['fichas_por_minuto']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
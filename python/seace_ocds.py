@@ -25,17 +25,19 @@ ESTRUCTURA tender.title (nomenclatura):
 - Ejemplo: AS-SM-35-2024-ELSE-1
 """
 import requests
-import json
 import time
 import zipfile
 from io import BytesIO
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Any, Union, Iterable
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
 from config import OUTPUT_DIR, CACHE_DIR
+import ocds_schema
+from cache_store import clave_mes, get_store, ttl
+from jsonl_io import extension, guardar_registros, resolver_formato
 
 
 class SeaceOCDS:
@@ -211,12 +213,14 @@ class SeaceOCDS:
             Lista de procesos
         """
         # Verificar cache
-        cache_file = CACHE_DIR / f"{year}-{month:02d}_{source}.json"
-
-        if cache_file.exists():
-            print(f"[CACHE] {cache_file.name}")
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        store = get_store()
+        clave = clave_mes(year, month, source)
+        cache_file = store.ruta("mes", clave)
+
+        if store.vigente("mes", clave, ttl("mes")):
+            print(f"[CACHE] {clave}")
+            store.tocar("mes", clave)
+            records = ocds_schema.cargar_records(cache_file)
         else:
             # Descargar
             url = f"{self.BASE_URL}/file/{source}/json/{year}/{month:02d}/"
@@ -233,22 +237,20 @@ class SeaceOCDS:
                         return []
 
                     with zf.open(json_files[0]) as src:
-                        content = src.read().decode('utf-8')
-                        data = json.loads(content)
+                        content = src.read()
+                        records = ocds_schema.decodificar_records(content)
 
                         # Guardar en cache
-                        with open(cache_file, 'w', encoding='utf-8') as f:
-                            f.write(content)
+                        store.guardar_bytes("mes", clave, content)
 
                 size_mb = cache_file.stat().st_size / (1024 * 1024)
-                print(f"[OK] {cache_file.name} ({size_mb:.1f} MB)")
+                print(f"[OK] {clave} ({size_mb:.1f} MB)")
 
             except Exception as e:
                 print(f"[ERROR] Download: {e}")
                 return []
 
         # Procesar records
-        records = data.get("records", [])
         print(f"  Total records: {len(records)}")
 
         results = []
@@ -436,13 +438,27 @@ class SeaceOCDS:
 
     # ==================== EXPORTACION ====================
 
-    def export_json(self, procesos: List[Dict], filename: str = None) -> str:
-        """Exporta procesos a JSON"""
+    def export_json(
+        self,
+        procesos: Iterable[Dict],
+        filename: str = None,
+        formato: str = None,
+        append: bool = False
+    ) -> str:
+        """
+        Exporta procesos a JSON o JSONL
+
+        Args:
+            procesos: Procesos a exportar (en jsonl se escriben de a uno)
+            filename: Nombre del archivo en OUTPUT_DIR
+            formato: "json" o "jsonl" (None = inferir por extension)
+            append: Solo jsonl - agregar al archivo existente
+        """
+        formato = resolver_formato(formato, filename)
         if not filename:
-            filename = f"ocds_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"ocds_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension(formato)}"
         filepath = OUTPUT_DIR / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(procesos, f, ensure_ascii=False, indent=2)
+        guardar_registros(procesos, filepath, formato=formato, append=append)
         print(f"[OK] {filepath}")
         return str(filepath)
 
@@ -518,6 +534,8 @@ def main():
     parser.add_argument('--else', dest='else_mode', action='store_true', help='Buscar ELSE')
     parser.add_argument('--csv', action='store_true', help='Exportar a CSV')
     parser.add_argument('--output', help='Archivo de salida')
+    parser.add_argument('--formato', choices=['json', 'jsonl'], help='Formato de salida JSON (default: segun extension)')
+    parser.add_argument('--append', action='store_true', help='Agregar al archivo existente (solo jsonl)')
 
     args = parser.parse_args()
     client = SeaceOCDS()
@@ -559,7 +577,7 @@ def main():
         if args.csv:
             client.export_csv(procesos, args.output or "seace")
         else:
-            client.export_json(procesos, args.output)
+            client.export_json(procesos, args.output, formato=args.formato, append=args.append)
 
 
 if __name__ == "__main__":
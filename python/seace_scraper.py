@@ -2,8 +2,7 @@
 SEACE Web Scraper - Extrae datos de fichas de seleccion
 """
 import time
-import json
-import hashlib
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Any
@@ -19,17 +18,40 @@ from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import requests
 
-from config import SEACE_CONFIG, CACHE_DIR, ETAPAS_MAPPING
+from config import SEACE_CONFIG
+import json_backend
+from cache_store import get_store, ttl
+from ficha_http import FichaHTTP, FichaNoDisponible
+from mapa_fichas import get_mapa
+from parser_ficha import parsear_ficha
+
+ESPERAS = SEACE_CONFIG["ESPERAS"]
+
+# True cuando no hay requests AJAX pendientes (jQuery y cola de PrimeFaces)
+JS_AJAX_INACTIVO = """
+return document.readyState === 'complete'
+    && (typeof jQuery === 'undefined' || jQuery.active === 0)
+    && (typeof PrimeFaces === 'undefined' || !PrimeFaces.ajax || !PrimeFaces.ajax.Queue
+        || PrimeFaces.ajax.Queue.isEmpty());
+"""
+
+XPATH_LINK_FICHA = "//a[contains(@title, 'Ficha de Seleccion')]"
 
 
 class SeaceScraper:
     """Scraper para el portal SEACE"""
 
+    CACHE_TIPO = "ficha"
+
     def __init__(self, use_cache: bool = True, headless: bool = True):
         self.use_cache = use_cache
+        self.cache = get_store()
         self.headless = headless
         self.driver = None
         self.session = requests.Session()
+        self.mapa = get_mapa()
+        self.http = FichaHTTP(self.session)
+        self.latencias: Dict[str, List[float]] = {}
 
     def _init_driver(self):
         """Inicializa el driver de Selenium"""
@@ -51,33 +73,49 @@ class SeaceScraper:
 
     def _get_cache_path(self, nomenclatura: str) -> Path:
         """Genera path de cache para una nomenclatura"""
-        hash_id = hashlib.md5(nomenclatura.encode()).hexdigest()[:8]
-        return CACHE_DIR / f"{nomenclatura.replace('/', '-')}_{hash_id}.json"
+        return self.cache.ruta(self.CACHE_TIPO, nomenclatura)
 
     def _load_from_cache(self, nomenclatura: str) -> Optional[Dict]:
         """Carga datos desde cache si existe"""
         if not self.use_cache:
             return None
 
-        cache_path = self._get_cache_path(nomenclatura)
-        if cache_path.exists():
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Cache valido por 24 horas
-                cache_time = datetime.fromisoformat(data.get('_cache_time', '2000-01-01'))
-                if (datetime.now() - cache_time).days < 1:
-                    return data
-        return None
+        # Vigencia de fichas (CACHE_CONFIG["TTL_SEGUNDOS"]), verificada con stat
+        return self.cache.leer(self.CACHE_TIPO, nomenclatura, ttl=ttl("ficha"))
 
     def _save_to_cache(self, nomenclatura: str, data: Dict):
         """Guarda datos en cache"""
         if not self.use_cache:
             return
 
-        data['_cache_time'] = datetime.now().isoformat()
-        cache_path = self._get_cache_path(nomenclatura)
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self.cache.guardar(self.CACHE_TIPO, nomenclatura, data)
+
+    # ============== ESPERAS Y TIEMPOS ==============
+
+    @contextmanager
+    def _paso(self, nombre: str):
+        """Mide la duracion de un paso (ver resumen_latencias)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latencias.setdefault(nombre, []).append(time.perf_counter() - inicio)
+
+    def resumen_latencias(self) -> Dict[str, Dict[str, float]]:
+        """Cantidad, promedio y maximo (segundos) por paso"""
+        return {
+            paso: {"n": len(t), "promedio": sum(t) / len(t), "max": max(t)}
+            for paso, t in self.latencias.items()
+        }
+
+    def _esperar_ajax(self, timeout: float = None):
+        """Espera a que la pagina termine de cargar y no queden requests AJAX"""
+        try:
+            WebDriverWait(self.driver, timeout or ESPERAS["AJAX"], poll_frequency=0.1).until(
+                lambda d: d.execute_script(JS_AJAX_INACTIVO)
+            )
+        except TimeoutException:
+            pass  # Se sigue con lo que haya; la condicion propia de cada paso decide
 
     def buscar_proceso(self, nomenclatura: str) -> Optional[str]:
         """
@@ -90,49 +128,63 @@ class SeaceScraper:
 
         try:
             # Ir al buscador
-            self.driver.get(SEACE_CONFIG["BUSCADOR_URL"])
-            time.sleep(2)
+            with self._paso("buscador"):
+                self.driver.get(SEACE_CONFIG["BUSCADOR_URL"])
+                self._esperar_ajax()
 
             # Expandir busqueda avanzada
-            try:
-                btn_avanzada = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Busqueda Avanzada')]"))
+            with self._paso("busqueda_avanzada"):
+                try:
+                    btn_avanzada = WebDriverWait(self.driver, ESPERAS["BUSCADOR"]).until(
+                        EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Busqueda Avanzada')]"))
+                    )
+                    btn_avanzada.click()
+                    self._esperar_ajax()
+                except:
+                    pass  # Ya puede estar expandida
+
+                # Ingresar nomenclatura
+                input_nomenclatura = WebDriverWait(self.driver, ESPERAS["BUSCADOR"]).until(
+                    EC.visibility_of_element_located((By.XPATH, "//input[contains(@id, 'siglaNomenclatura')]"))
                 )
-                btn_avanzada.click()
-                time.sleep(1)
-            except:
-                pass  # Ya puede estar expandida
-
-            # Ingresar nomenclatura
-            input_nomenclatura = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//input[contains(@id, 'siglaNomenclatura')]"))
-            )
             input_nomenclatura.clear()
             input_nomenclatura.send_keys(nomenclatura)
 
-            # Click en buscar
-            btn_buscar = self.driver.find_element(By.XPATH, "//button[contains(@id, 'btnBuscar')]")
-            btn_buscar.click()
-
-            # Esperar resultados
-            time.sleep(3)
+            # Click en buscar y esperar la tabla de resultados (con link o vacia)
+            with self._paso("resultados"):
+                # La tabla vacia inicial no cuenta: debe ser reemplazada por la respuesta
+                vacia_inicial = self.driver.find_elements(By.CSS_SELECTOR, "tr.ui-datatable-empty-message")
+                btn_buscar = self.driver.find_element(By.XPATH, "//button[contains(@id, 'btnBuscar')]")
+                btn_buscar.click()
+                self._esperar_ajax()
+
+                def resultados_listos(d):
+                    if d.find_elements(By.XPATH, XPATH_LINK_FICHA):
+                        return True
+                    if vacia_inicial and not EC.staleness_of(vacia_inicial[0])(d):
+                        return False
+                    return bool(d.find_elements(By.CSS_SELECTOR, "tr.ui-datatable-empty-message"))
+
+                try:
+                    WebDriverWait(self.driver, ESPERAS["RESULTADOS"], poll_frequency=0.1).until(resultados_listos)
+                except TimeoutException:
+                    pass
 
             # Buscar link a ficha de seleccion
-            try:
-                link_ficha = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//a[contains(@title, 'Ficha de Seleccion')]"))
-                )
-                href = link_ficha.get_attribute('href')
-
-                # Extraer ID del href
-                if 'id=' in href:
-                    ficha_id = href.split('id=')[1].split('&')[0]
-                    return ficha_id
-
-            except TimeoutException:
+            links = self.driver.find_elements(By.XPATH, XPATH_LINK_FICHA)
+            if not links:
                 print(f"No se encontro ficha para: {nomenclatura}")
                 return None
 
+            href = links[0].get_attribute('href')
+
+            # Extraer ID del href
+            if 'id=' in href:
+                ficha_id = href.split('id=')[1].split('&')[0]
+                # El UUID no cambia: la proxima vez se salta la busqueda
+                self.mapa.guardar(nomenclatura, ficha_id, "busqueda")
+                return ficha_id
+
         except Exception as e:
             print(f"Error buscando {nomenclatura}: {e}")
             return None
@@ -157,8 +209,6 @@ class SeaceScraper:
                 print(f"[CACHE] {nomenclatura}")
                 return cached
 
-        self._init_driver()
-
         datos = {
             "ficha_id": ficha_id,
             "nomenclatura": nomenclatura,
@@ -174,37 +224,9 @@ class SeaceScraper:
         }
 
         try:
-            # Cargar ficha
-            url = f"{SEACE_CONFIG['FICHA_URL']}?id={ficha_id}&ptoRetorno=LOCAL"
-            self.driver.get(url)
-            time.sleep(3)
-
-            # Esperar que cargue
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "ui-panel"))
-            )
-
-            # Obtener HTML
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'lxml')
-
-            # Extraer informacion general
-            datos["info_general"] = self._extraer_info_general(soup)
-
-            # Extraer informacion de la entidad
-            datos["info_entidad"] = self._extraer_info_entidad(soup)
-
-            # Extraer informacion del procedimiento
-            datos["info_procedimiento"] = self._extraer_info_procedimiento(soup)
-
-            # Extraer cronograma
-            datos["cronograma"] = self._extraer_cronograma(soup)
-
-            # Extraer documentos
-            datos["documentos"] = self._extraer_documentos(soup)
-
-            # Intentar extraer postores (puede requerir click adicional)
-            datos["postores"] = self._extraer_postores()
+            # Primero por HTTP (sin navegador); Selenium solo si no alcanza
+            if not self._extraer_ficha_http(ficha_id, datos):
+                self._extraer_ficha_selenium(ficha_id, datos)
 
             # Guardar en cache
             if nomenclatura:
@@ -218,140 +240,95 @@ class SeaceScraper:
 
         return datos
 
-    def _extraer_info_general(self, soup: BeautifulSoup) -> Dict:
-        """Extrae informacion general del proceso"""
-        info = {}
-
-        # Buscar tabla de informacion general
-        panel = soup.find('div', string=lambda t: t and 'Informacion General' in t)
-        if panel:
-            panel = panel.find_parent('div', class_='ui-panel')
-
-        if not panel:
-            # Buscar de otra forma
-            for div in soup.find_all('div', class_='ui-panel-title'):
-                if 'Informacion General' in div.get_text():
-                    panel = div.find_parent('div', class_='ui-panel')
-                    break
-
-        if panel:
-            rows = panel.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    label = cells[0].get_text(strip=True).replace(':', '')
-                    value = cells[1].get_text(strip=True)
-                    if label and value:
-                        info[label] = value
-
-        return info
-
-    def _extraer_info_entidad(self, soup: BeautifulSoup) -> Dict:
-        """Extrae informacion de la entidad"""
-        info = {}
-
-        for div in soup.find_all('div', class_='ui-panel-title'):
-            if 'Informacion general de la Entidad' in div.get_text():
-                panel = div.find_parent('div', class_='ui-panel')
-                if panel:
-                    rows = panel.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 2:
-                            label = cells[0].get_text(strip=True).replace(':', '')
-                            value = cells[1].get_text(strip=True)
-                            if label and value:
-                                info[label] = value
-                break
+    def _extraer_ficha_http(self, ficha_id: str, datos: Dict[str, Any]) -> bool:
+        """
+        Carga la ficha y sus postores con requests
 
-        return info
-
-    def _extraer_info_procedimiento(self, soup: BeautifulSoup) -> Dict:
-        """Extrae informacion del procedimiento"""
-        info = {}
-
-        for div in soup.find_all('div', class_='ui-panel-title'):
-            if 'Informacion general del procedimiento' in div.get_text():
-                panel = div.find_parent('div', class_='ui-panel')
-                if panel:
-                    rows = panel.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 2:
-                            label = cells[0].get_text(strip=True).replace(':', '')
-                            value = cells[1].get_text(strip=True)
-                            if label and value:
-                                info[label] = value
-                break
+        Returns:
+            True si se extrajo; False si hay que usar Selenium
+        """
+        if not SEACE_CONFIG["FICHA_HTTP"]:
+            return False
 
-        return info
-
-    def _extraer_cronograma(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extrae el cronograma del proceso"""
-        cronograma = []
-
-        # Buscar panel de cronograma
-        for div in soup.find_all('div', class_='ui-panel-title'):
-            if 'Cronograma' in div.get_text():
-                panel = div.find_parent('div', class_='ui-panel')
-                if panel:
-                    tabla = panel.find('table')
-                    if tabla:
-                        rows = tabla.find_all('tr')[1:]  # Saltar header
-                        for row in rows:
-                            cells = row.find_all('td')
-                            if len(cells) >= 3:
-                                etapa_raw = cells[0].get_text(strip=True)
-                                fecha_inicio = cells[1].get_text(strip=True)
-                                fecha_fin = cells[2].get_text(strip=True)
-
-                                # Mapear nombre de etapa
-                                etapa = ETAPAS_MAPPING.get(etapa_raw, etapa_raw)
-
-                                cronograma.append({
-                                    "etapa": etapa,
-                                    "etapa_original": etapa_raw,
-                                    "fecha_inicio": fecha_inicio,
-                                    "fecha_fin": fecha_fin
-                                })
-                break
+        try:
+            with self._paso("ficha_http"):
+                html = self.http.obtener_ficha(ficha_id)
+            secciones = parsear_ficha(html)
+            if not secciones["info_general"]:
+                raise FichaNoDisponible("Ficha sin Informacion General")
+
+            with self._paso("postores_http"):
+                html_ofertas = self.http.postback(html, "Ver Ofertas Presentadas")
+        except (FichaNoDisponible, requests.RequestException) as e:
+            print(f"[HTTP] {ficha_id}: {e}, usando Selenium")
+            return False
+
+        datos.update(secciones)
+        if html_ofertas:
+            datos["postores"] = self._parsear_postores(BeautifulSoup(html_ofertas, 'lxml'))
+        datos["extraccion"] = "http"
+        return True
+
+    def _extraer_ficha_selenium(self, ficha_id: str, datos: Dict[str, Any]):
+        """Carga la ficha en Chrome y extrae sus datos"""
+        self._init_driver()
 
-        return cronograma
-
-    def _extraer_documentos(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extrae la lista de documentos"""
-        documentos = []
-
-        # Buscar tabla de documentos
-        for div in soup.find_all('div', class_='ui-panel-title'):
-            if 'Lista de Documentos' in div.get_text():
-                panel = div.find_parent('div', class_='ui-panel')
-                if panel:
-                    tabla = panel.find('table')
-                    if tabla:
-                        rows = tabla.find_all('tr')[1:]  # Saltar header
-                        for row in rows:
-                            cells = row.find_all('td')
-                            if len(cells) >= 5:
-                                doc = {
-                                    "numero": cells[0].get_text(strip=True),
-                                    "etapa": cells[1].get_text(strip=True),
-                                    "documento": cells[2].get_text(strip=True),
-                                    "fecha": cells[4].get_text(strip=True) if len(cells) > 4 else ""
-                                }
-
-                                # Buscar link de descarga
-                                link = cells[3].find('a') if len(cells) > 3 else None
-                                if link:
-                                    doc["url"] = link.get('href', '')
-
-                                documentos.append(doc)
-                break
+        # Cargar ficha
+        url = f"{SEACE_CONFIG['FICHA_URL']}?id={ficha_id}&ptoRetorno=LOCAL"
+        with self._paso("ficha"):
+            self.driver.get(url)
 
-        return documentos
+            # Esperar que cargue
+            WebDriverWait(self.driver, ESPERAS["PANEL"], poll_frequency=0.1).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "ui-panel"))
+            )
+            self._esperar_ajax()
+
+        # Obtener HTML
+        html = self.driver.page_source
+        self._parsear_ficha(html, datos)
+
+        # Postores: request parcial de "Ver Ofertas Presentadas" sin salir de la ficha
+        datos["postores"] = self._extraer_postores(html)
+        datos["extraccion"] = "selenium"
+
+    def _parsear_ficha(self, html: str, datos: Dict[str, Any]):
+        """Info general, entidad, procedimiento, cronograma y documentos (parser_ficha)"""
+        datos.update(parsear_ficha(html))
+
+    def _sincronizar_cookies(self):
+        """Copia las cookies de Chrome (JSESSIONID) a la sesion de requests"""
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain", ""), path=cookie.get("path", "/")
+            )
+
+    def _extraer_postores(self, html: str) -> List[Dict]:
+        """
+        Postores de la ficha abierta en Chrome
 
-    def _extraer_postores(self) -> List[Dict]:
-        """Extrae la lista de postores (requiere interaccion)"""
+        Replica por HTTP, con las cookies y el ViewState del navegador, el
+        request parcial de PrimeFaces que dispara "Ver Ofertas Presentadas"
+        y lee la tabla del <partial-response>. Chrome no navega, asi que no
+        hay que volver ni recargar la ficha. Si el servidor rechaza el
+        request, se hace el click en el navegador.
+        """
+        try:
+            with self._paso("postores_parcial"):
+                self._sincronizar_cookies()
+                self.http.url_actual = self.driver.current_url
+                html_ofertas = self.http.postback(html, "Ver Ofertas Presentadas")
+        except (FichaNoDisponible, requests.RequestException) as e:
+            print(f"[HTTP] Ofertas por request parcial: {e}, usando click")
+            return self._extraer_postores_click()
+
+        if not html_ofertas:
+            return []  # Sin boton: no hay ofertas publicadas
+        return self._parsear_postores(BeautifulSoup(html_ofertas, 'lxml'))
+
+    def _extraer_postores_click(self) -> List[Dict]:
+        """Extrae la lista de postores con click en el navegador (respaldo)"""
         postores = []
 
         try:
@@ -360,38 +337,89 @@ class SeaceScraper:
                 By.XPATH,
                 "//span[contains(text(), 'Ver Ofertas Presentadas')]"
             )
-            btn_ofertas.click()
-            time.sleep(2)
+            with self._paso("postores"):
+                btn_ofertas.click()
+                self._esperar_ajax()
+                # Navega a la pagina de ofertas o la actualiza por AJAX
+                try:
+                    WebDriverWait(self.driver, ESPERAS["POSTORES"], poll_frequency=0.1).until(
+                        lambda d: d.find_elements(
+                            By.XPATH, "//th[contains(., 'Postor') or contains(., 'RUC')]"
+                        )
+                    )
+                except TimeoutException:
+                    pass
 
             # Extraer datos de ofertas
             html = self.driver.page_source
             soup = BeautifulSoup(html, 'lxml')
 
-            # Buscar tabla de ofertas
-            for tabla in soup.find_all('table'):
-                headers = [th.get_text(strip=True) for th in tabla.find_all('th')]
-                if 'Postor' in str(headers) or 'RUC' in str(headers):
-                    rows = tabla.find_all('tr')[1:]
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            postor = {
-                                "ruc": cells[0].get_text(strip=True) if len(cells) > 0 else "",
-                                "nombre": cells[1].get_text(strip=True) if len(cells) > 1 else "",
-                                "monto": cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                            }
-                            postores.append(postor)
-                    break
+            postores = self._parsear_postores(soup)
 
             # Volver a la ficha
-            self.driver.back()
-            time.sleep(1)
+            with self._paso("volver_ficha"):
+                self.driver.back()
+                self._esperar_ajax()
 
         except Exception as e:
             pass  # Puede que no haya ofertas publicadas
 
         return postores
 
+    @staticmethod
+    def _parsear_postores(soup: BeautifulSoup) -> List[Dict]:
+        """Filas de la tabla de ofertas (cabecera con Postor o RUC)"""
+        postores = []
+
+        # Buscar tabla de ofertas
+        for tabla in soup.find_all('table'):
+            headers = [th.get_text(strip=True) for th in tabla.find_all('th')]
+            if 'Postor' in str(headers) or 'RUC' in str(headers):
+                rows = tabla.find_all('tr')[1:]
+                for row in rows:
+                    cells = row.find_all('td')
+                    if len(cells) >= 2:
+                        postor = {
+                            "ruc": cells[0].get_text(strip=True) if len(cells) > 0 else "",
+                            "nombre": cells[1].get_text(strip=True) if len(cells) > 1 else "",
+                            "monto": cells[2].get_text(strip=True) if len(cells) > 2 else ""
+                        }
+                        postores.append(postor)
+                break
+
+        return postores
+
+    def scrape(self, nomenclatura: str) -> Dict[str, Any]:
+        """
+        Busca la ficha de una nomenclatura y extrae sus datos
+
+        Returns:
+            Datos de la ficha con "success", o un dict de error si no se encontro
+        """
+        # UUID ya conocido (busqueda anterior o importado): directo a la ficha
+        ficha_id = self.mapa.get(nomenclatura)
+        if ficha_id:
+            datos = self.extraer_ficha(ficha_id, nomenclatura)
+            if datos.get("error") is None:
+                datos["success"] = True
+                return datos
+            # El UUID guardado no abrio la ficha: descartarlo y buscar de nuevo
+            print(f"[MAPA] {nomenclatura}: ficha {ficha_id} fallo, buscando de nuevo")
+            self.mapa.olvidar(nomenclatura)
+
+        ficha_id = self.buscar_proceso(nomenclatura)
+
+        if not ficha_id:
+            return {
+                "nomenclatura": nomenclatura,
+                "error": "Proceso no encontrado",
+                "success": False
+            }
+
+        datos = self.extraer_ficha(ficha_id, nomenclatura)
+        datos["success"] = datos.get("error") is None
+        return datos
+
     def close(self):
         """Cierra el driver"""
         if self.driver:
@@ -419,53 +447,32 @@ def scrape_proceso(nomenclatura: str, use_cache: bool = True) -> Dict:
         Diccionario con todos los datos del proceso
     """
     with SeaceScraper(use_cache=use_cache) as scraper:
-        # Buscar ficha
-        ficha_id = scraper.buscar_proceso(nomenclatura)
-
-        if not ficha_id:
-            return {
-                "nomenclatura": nomenclatura,
-                "error": "Proceso no encontrado",
-                "success": False
-            }
-
-        # Extraer datos
-        datos = scraper.extraer_ficha(ficha_id, nomenclatura)
-        datos["success"] = datos.get("error") is None
-
-        return datos
+        return scraper.scrape(nomenclatura)
 
 
-def scrape_multiples(nomenclaturas: List[str], use_cache: bool = True) -> List[Dict]:
+def scrape_multiples(nomenclaturas: List[str], use_cache: bool = True, workers: int = 1) -> List[Dict]:
     """
     Scrapea multiples procesos
 
     Args:
         nomenclaturas: Lista de nomenclaturas
         use_cache: Si usar cache local
+        workers: Navegadores en paralelo (>1 usa scraper_pool.PoolScrapers)
 
     Returns:
-        Lista de diccionarios con datos de cada proceso
+        Lista de diccionarios con datos de cada proceso (mismo orden)
     """
+    if workers > 1:
+        from scraper_pool import PoolScrapers
+        return PoolScrapers(workers, use_cache=use_cache).scrape(nomenclaturas)
+
     resultados = []
 
     with SeaceScraper(use_cache=use_cache) as scraper:
         for i, nom in enumerate(nomenclaturas):
             print(f"\n[{i+1}/{len(nomenclaturas)}] Procesando: {nom}")
 
-            ficha_id = scraper.buscar_proceso(nom)
-
-            if ficha_id:
-                datos = scraper.extraer_ficha(ficha_id, nom)
-                datos["success"] = datos.get("error") is None
-            else:
-                datos = {
-                    "nomenclatura": nom,
-                    "error": "Proceso no encontrado",
-                    "success": False
-                }
-
-            resultados.append(datos)
+            resultados.append(scraper.scrape(nom))
 
             # Rate limiting
             time.sleep(SEACE_CONFIG["REQUEST_DELAY"])
@@ -476,4 +483,4 @@ def scrape_multiples(nomenclaturas: List[str], use_cache: bool = True) -> List[D
 if __name__ == "__main__":
     # Test
     resultado = scrape_proceso("AS-SM-35-2024-ELSE-1")
-    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    print(json_backend.dumps(resultado, pretty=True))
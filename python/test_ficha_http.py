@@ -0,0 +1,163 @@
+"""
+Test de la descarga de fichas por HTTP (ficha_http.py)
+Sirve las fichas guardadas en fixtures/ con un stub local, sin red ni Chrome
+"""
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from config import SEACE_CONFIG
+from seace_scraper import SeaceScraper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+RUTA_FICHA = "/seacebus-uiwd-pub/fichaSeleccion/fichaSeleccion.xhtml"
+VIEWSTATE = "-3851292846557327414:8126543925101874103"
+SESION = "JSESSIONID=f1c4a0e2b7d9"
+
+
+class StubSeace(BaseHTTPRequestHandler):
+    """fichaSeleccion.xhtml: GET de la ficha y postback parcial de ofertas"""
+
+    def _responder(self, status: int, cuerpo: bytes, tipo: str = "text/html; charset=UTF-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Set-Cookie", f"{SESION}; Path=/")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        ficha_id = parse_qs(url.query).get("id", [""])[0]
+        if url.path != RUTA_FICHA:
+            self._responder(404, b"")
+        elif ficha_id == "sin-paneles":
+            # Vista que se arma con JS: sin paneles en el HTML inicial
+            self._responder(200, b"<html><body><div id='app'></div></body></html>")
+        else:
+            self._responder(200, (FIXTURES / "ficha_seleccion.html").read_bytes())
+
+    def do_POST(self):
+        largo = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(largo).decode("utf-8"))
+        parcial = self.headers.get("Faces-Request") == "partial/ajax"
+        if (
+            urlparse(self.path).path == RUTA_FICHA and parcial
+            # El ViewState solo vale en la sesion que abrio la ficha
+            and SESION in (self.headers.get("Cookie") or "")
+            and form.get("javax.faces.ViewState") == [VIEWSTATE]
+            and form.get("javax.faces.source") == ["tbFicha:j_idt1006"]
+            and form.get("javax.faces.partial.render") == ["tbFicha:pnlOfertas"]
+        ):
+            self._responder(200, (FIXTURES / "ofertas_partial.xml").read_bytes(), "text/xml; charset=UTF-8")
+        else:
+            self._responder(500, b"ViewState o parametros invalidos")
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def stub_seace():
+    """Apunta FICHA_URL a un servidor local con las fixtures"""
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), StubSeace)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    original = SEACE_CONFIG["FICHA_URL"]
+    SEACE_CONFIG["FICHA_URL"] = f"http://127.0.0.1:{servidor.server_port}{RUTA_FICHA}"
+    try:
+        yield
+    finally:
+        SEACE_CONFIG["FICHA_URL"] = original
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def test_ficha_http():
+    print("=" * 50)
+    print("TEST: Ficha por HTTP (stub local)")
+    print("=" * 50)
+
+    with stub_seace():
+        scraper = SeaceScraper(use_cache=False)
+        datos = scraper.extraer_ficha("ok", "AS-SM-35-2024-ELSE-1")
+
+    assert datos["error"] is None, datos["error"]
+    assert datos["extraccion"] == "http"
+    assert scraper.driver is None, "No deberia abrir Chrome"
+
+    assert datos["info_general"]["Nomenclatura"] == "AS-SM-35-2024-ELSE-1"
+    assert datos["info_entidad"]["RUC"] == "20116544289"
+    assert datos["info_procedimiento"]["Version SEACE"] == "3"
+    assert [e["etapa"] for e in datos["cronograma"]] == [
+        "CONVOCATORIA", "REGISTRO_PARTICIPANTES",
+        "Presentacion de propuestas(Electronica)", "BUENA_PRO"
+    ]
+    assert len(datos["documentos"]) == 2
+    assert datos["documentos"][0]["url"].endswith("fileCode=a1b2c3")
+    assert datos["postores"] == [
+        {"ruc": "20100130204", "nombre": "TRANSFORMADORES DEL SUR S.A.C.", "monto": "372,500.00"},
+        {"ruc": "20512345678", "nombre": "ELECTRO INDUSTRIAL ANDINA E.I.R.L.", "monto": "380,110.50"},
+    ]
+    print("[OK] Paneles, cronograma, documentos y postores extraidos sin navegador")
+
+
+class DriverFicha:
+    """Chrome con la ficha ya abierta: solo lo que usa _extraer_postores"""
+
+    def __init__(self, url: str):
+        self.current_url = url
+        self.page_source = (FIXTURES / "ficha_seleccion.html").read_text(encoding="utf-8")
+        self.navegaciones = 0
+
+    def get_cookies(self):
+        nombre, valor = SESION.split("=")
+        return [{"name": nombre, "value": valor, "domain": "127.0.0.1", "path": "/"}]
+
+    def back(self):
+        self.navegaciones += 1
+
+    def find_element(self, *args):
+        self.navegaciones += 1
+        raise AssertionError("No deberia hacer click")
+
+
+def test_postores_parcial():
+    print("=" * 50)
+    print("TEST: Postores por request parcial (sin click ni back)")
+    print("=" * 50)
+
+    with stub_seace():
+        scraper = SeaceScraper(use_cache=False)
+        scraper.driver = DriverFicha(f"{SEACE_CONFIG['FICHA_URL']}?id=ok&ptoRetorno=LOCAL")
+        postores = scraper._extraer_postores(scraper.driver.page_source)
+        navegaciones = scraper.driver.navegaciones
+        scraper.driver = None
+
+    assert [p["ruc"] for p in postores] == ["20100130204", "20512345678"]
+    assert navegaciones == 0
+    assert "postores_parcial" in scraper.latencias
+    print("[OK] Ofertas leidas del partial-response con las cookies del navegador")
+
+
+def test_fallback_selenium():
+    print("=" * 50)
+    print("TEST: Ficha sin paneles -> Selenium")
+    print("=" * 50)
+
+    with stub_seace():
+        scraper = SeaceScraper(use_cache=False)
+        datos = {"postores": []}
+        por_http = scraper._extraer_ficha_http("sin-paneles", datos)
+
+    assert por_http is False
+    assert "extraccion" not in datos
+    print("[OK] La ficha sin paneles se deriva a Selenium")
+
+
+if __name__ == "__main__":
+    test_ficha_http()
+    test_postores_parcial()
+    test_fallback_selenium()